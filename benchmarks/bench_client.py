@@ -0,0 +1,207 @@
+"""Benchmark SDK calls end to end against the local stub server
+
+Run from the repository root with ``python -m benchmarks.bench_client``.
+Each scenario starts its own ``StubServer``; latency, error-rate and
+payload-size injection are set per scenario. Every scenario is warmed up
+and then repeated, and the results come from the median repeat, so that
+runs can be compared with ``benchmarks.run --baseline``.
+"""
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from bshengine import BshEngine, BshExecutor, BshResponse, BshSearch
+from bshengine.testing import HttpTransport, StubServer
+
+
+REPEATS = 5
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def timings(passes: List[List[float]]) -> Dict[str, float]:
+    """Per-call times of several passes in microseconds
+
+    ``mean_us`` is the median of the pass means and ``p50_us`` the median
+    of every call, both stable enough to compare between runs; ``p99_us``
+    is reported for information.
+    """
+    durations = [d for durations in passes for d in durations]
+    return {
+        "mean_us": round(statistics.median(sum(p) / len(p) for p in passes) * 1e6, 1),
+        "p50_us": round(statistics.median(durations) * 1e6, 1),
+        "p99_us": round(percentile(durations, 0.99) * 1e6, 1),
+    }
+
+
+def measure(fn: Callable[[], Any], number: int, repeats: int = REPEATS) -> List[List[float]]:
+    """Time ``repeats`` passes of ``number`` calls of ``fn`` after a warm-up pass"""
+    passes = []
+    for _ in range(repeats + 1):
+        durations = []
+        for _ in range(number):
+            start = time.perf_counter()
+            fn()
+            durations.append(time.perf_counter() - start)
+        passes.append(durations)
+    return passes[1:]
+
+
+def median_run(fn: Callable[[], Dict[str, Any]], repeats: int = REPEATS) -> Dict[str, Any]:
+    """Run a scenario once to warm up, then ``repeats`` times; return the run with the median ``seconds``"""
+    fn()
+    runs = sorted((fn() for _ in range(repeats)), key=lambda row: row["seconds"])
+    return runs[len(runs) // 2]
+
+
+def rows(count: int) -> List[Dict[str, Any]]:
+    return [{"name": f"item-{i}", "status": "open" if i % 3 else "closed", "price": i % 100} for i in range(count)]
+
+
+def single_call(number: int = 500) -> Dict[str, Any]:
+    """Per-call time of ``find_by_id``, in process and over HTTP"""
+    canned = {"data": [{"id": 1}], "code": 200, "status": "OK", "timestamp": 0}
+
+    class Canned:
+        ok, status_code, content, text = True, 200, b"", ""
+
+        @staticmethod
+        def json():
+            return canned
+
+    in_process = BshEngine("http://stub", lambda params: Canned()).entity("Orders")
+    with StubServer() as server:
+        server.seed("Orders", rows(1))
+        transport = HttpTransport()
+        over_http = BshEngine(server.url, transport).entity("Orders")
+        result = {"scenario": "single_call", "calls": number}
+        result.update({f"sdk_{k}": v for k, v in timings(measure(lambda: in_process.find_by_id("1"), number)).items()})
+        result.update({f"http_{k}": v for k, v in timings(measure(lambda: over_http.find_by_id("1"), number)).items()})
+        transport.close()
+    return result
+
+
+def scan(count: int = 5000, page_size: int = 200, payload_size: int = 256) -> List[Dict[str, Any]]:
+    """Rows per second reading a whole entity in page and keyset mode"""
+    results = []
+    with StubServer(payload_size=payload_size) as server:
+        server.seed("Orders", rows(count))
+        service = BshEngine(server.url, HttpTransport()).entity("Orders")
+        for mode in ("page", "keyset"):
+
+            def once() -> Dict[str, Any]:
+                start = time.perf_counter()
+                read = sum(1 for _ in service.scan(BshSearch(), page_size=page_size, mode=mode))
+                elapsed = time.perf_counter() - start
+                return {
+                    "scenario": f"scan_{mode}",
+                    "rows": read,
+                    "page_size": page_size,
+                    "payload_size": payload_size,
+                    "seconds": round(elapsed, 4),
+                    "rows_per_second": round(read / elapsed),
+                }
+
+            results.append(median_run(once))
+    return results
+
+
+def bulk_write(count: int = 5000, batch_size: int = 500) -> Dict[str, Any]:
+    """Rows per second written with ``create_many`` batches"""
+    data = rows(count)
+
+    def once() -> Dict[str, Any]:
+        with StubServer() as server:
+            service = BshEngine(server.url, HttpTransport()).entity("Orders")
+            start = time.perf_counter()
+            for offset in range(0, count, batch_size):
+                service.create_many(data[offset:offset + batch_size])
+            elapsed = time.perf_counter() - start
+        return {
+            "scenario": "bulk_write",
+            "rows": count,
+            "batch_size": batch_size,
+            "seconds": round(elapsed, 4),
+            "rows_per_second": round(count / elapsed),
+        }
+
+    return median_run(once)
+
+
+def export(count: int = 5000, payload_size: int = 256, number: int = 3) -> Dict[str, Any]:
+    """Megabytes per second downloaded through ``export``"""
+    with StubServer(payload_size=payload_size) as server:
+        server.seed("Orders", rows(count))
+        service = BshEngine(server.url, HttpTransport()).entity("Orders")
+        sizes: List[int] = []
+
+        def download():
+            service.export(BshSearch(), on_download=lambda blob: sizes.append(len(blob)))
+
+        stats = timings(measure(download, number))
+    return {
+        "scenario": "export",
+        "rows": count,
+        "bytes": sizes[0],
+        **stats,
+        "mb_per_second": round(sizes[0] / stats["mean_us"], 2),
+    }
+
+
+def async_load(
+    requests: int = 1000,
+    concurrency: int = 32,
+    latency: float = 0.005,
+    error_rate: float = 0.01,
+) -> Dict[str, Any]:
+    """Throughput and latency of many searches fanned out with ``amap``"""
+
+    def once() -> Dict[str, Any]:
+        # A fresh seeded server per run injects the same failures every time
+        with StubServer(latency=latency, error_rate=error_rate, seed=1) as server:
+            server.seed("Orders", rows(100))
+            executor = BshExecutor(max_workers=concurrency, concurrency=concurrency)
+            engine = BshEngine(server.url, HttpTransport()).with_executor(executor)
+            service = engine.entity("Orders")
+
+            def call(i: int) -> BshResponse:
+                return service.search(BshSearch())
+
+            start = time.perf_counter()
+            results = asyncio.run(engine.amap(call, range(requests), concurrency=concurrency))
+            elapsed = time.perf_counter() - start
+            executor.shutdown()
+        return {
+            "scenario": "async_load",
+            "requests": requests,
+            "concurrency": concurrency,
+            "injected_latency_ms": latency * 1000,
+            "injected_error_rate": error_rate,
+            "errors": sum(not r.ok for r in results),
+            "seconds": round(elapsed, 4),
+            "requests_per_second": round(requests / elapsed),
+            **timings([[r.duration for r in results]]),
+        }
+
+    return median_run(once)
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    """Run every scenario; ``quick`` uses small sizes for smoke runs"""
+    scale = 10 if quick else 1
+    results = [single_call(500 // scale)]
+    results.extend(scan(5000 // scale))
+    results.append(bulk_write(5000 // scale))
+    results.append(export(5000 // scale))
+    results.append(async_load(1000 // scale))
+    return results
+
+
+if __name__ == "__main__":
+    for row in run():
+        print(json.dumps(row))
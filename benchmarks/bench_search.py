@@ -0,0 +1,66 @@
+"""Benchmark BshSearch.to_dict against compiled search templates
+
+Run from the repository root with ``python -m benchmarks.bench_search``.
+"""
+import json
+import timeit
+from bshengine.types.search import BshSearch, Filter, Pagination, Param, Sort
+
+
+def nested_filters(depth: int, width: int, leaf: int = 0) -> Filter:
+    """Build a filter tree ``depth`` levels deep with ``width`` children per node"""
+    if depth == 0:
+        value = Param("name") if leaf == 0 else f"value-{leaf}"
+        return Filter(field=f"field{leaf}", operator="eq", value=value)
+    return Filter(
+        operator="and" if depth % 2 else "or",
+        filters=[nested_filters(depth - 1, width, leaf * width + i) for i in range(width)],
+    )
+
+
+def make_search(depth: int, width: int) -> BshSearch:
+    return BshSearch(
+        entity="Products",
+        filters=[nested_filters(depth, width), Filter(field="status", operator="in", value=Param("statuses"))],
+        sort=[Sort(field="createdAt", direction=-1)],
+        pagination=Pagination(page=Param("page"), size=50),
+    )
+
+
+def run(number: int = 2000):
+    """Return timings in microseconds per call for several tree shapes"""
+    results = []
+    values = {"name": "widget", "statuses": ["active", "draft"], "page": 3}
+    for depth, width in [(1, 4), (3, 3), (5, 3)]:
+        search = make_search(depth, width)
+        compiled = search.compile()
+
+        def to_dict():
+            # Equivalent work to building a fresh search per call
+            json.dumps(search.to_dict(), default=lambda p: values[p.name])
+
+        def to_dict_only():
+            search.to_dict()
+
+        def bind():
+            compiled.bind(**values)
+
+        def bind_json():
+            compiled.bind_json(**values)
+
+        row = {"depth": depth, "width": width}
+        for name, fn in [
+            ("to_dict_us", to_dict_only),
+            ("to_dict_json_us", to_dict),
+            ("bind_us", bind),
+            ("bind_json_us", bind_json),
+        ]:
+            seconds = min(timeit.repeat(fn, number=number, repeat=5))
+            row[name] = round(seconds / number * 1e6, 2)
+        results.append(row)
+    return results
+
+
+if __name__ == "__main__":
+    for row in run():
+        print(json.dumps(row))
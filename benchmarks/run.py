@@ -0,0 +1,98 @@
+"""Run every benchmark and save the results as JSON
+
+Run from the repository root::
+
+    python -m benchmarks.run --output results/0.0.1.json
+    python -m benchmarks.run --baseline results/0.0.1.json --tolerance 0.2
+
+With ``--baseline``, timings slower or throughputs lower than the baseline
+by more than ``tolerance`` are reported and the exit status is 1. Only
+medians, means and best-of timings are compared; tail percentiles are too
+noisy between runs and are saved for information only.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import bshengine
+from benchmarks import bench_client, bench_search
+
+LOWER_IS_BETTER = ("_us", "seconds")
+HIGHER_IS_BETTER = ("_per_second",)
+NOT_COMPARED = ("p99_us",)
+
+
+def collect(quick: bool = False) -> Dict[str, Any]:
+    return {
+        "sdk_version": bshengine.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": int(time.time()),
+        "results": {
+            "search": bench_search.run(200 if quick else 2000),
+            "client": bench_client.run(quick),
+        },
+    }
+
+
+def _is_metric(key: str) -> bool:
+    return key.endswith(LOWER_IS_BETTER) or key.endswith(HIGHER_IS_BETTER)
+
+
+def _row_key(suite: str, row: Dict[str, Any]) -> Tuple:
+    return (suite,) + tuple(sorted((k, str(v)) for k, v in row.items() if not _is_metric(k)))
+
+
+def regressions(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Describe every metric worse than ``baseline`` by more than ``tolerance``"""
+    previous = {
+        _row_key(suite, row): row for suite, rows in baseline["results"].items() for row in rows
+    }
+    found = []
+    for suite, rows in current["results"].items():
+        for row in rows:
+            before = previous.get(_row_key(suite, row))
+            if before is None:
+                continue
+            for key, value in row.items():
+                old = before.get(key)
+                if not _is_metric(key) or key.endswith(NOT_COMPARED) or not old:
+                    continue
+                change = value / old - 1
+                worse = change > tolerance if key.endswith(LOWER_IS_BETTER) else change < -tolerance
+                if worse:
+                    name = row.get("scenario", suite)
+                    found.append(f"{name} {key}: {old} -> {value} ({change:+.0%})")
+    return found
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--quick", action="store_true", help="small sizes, for smoke runs")
+    args = parser.parse_args(argv)
+
+    results = collect(args.quick)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
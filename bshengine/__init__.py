@@ -2,7 +2,12 @@
 BSH Engine Python SDK
 """
 from .bshengine import BshEngine
-from .client import BshClient
+from .client import BshClient, RetryPolicy, RateLimiter
+from .executor import BshExecutor
+from .loader import DataLoader
+from .estimate import Estimator
+from .observability import MetricsRegistry
+from .jobs import ScanJob, ImportJob
 from .types import (
     BshResponse,
     BshError,
@@ -11,8 +16,12 @@ from .types import (
     Filter,
     GroupBy,
     Aggregate,
+    AggregateResult,
     Sort,
     Pagination,
+    Param,
+    CompiledSearch,
+    ItemResult,
     AuthToken,
     LoginParams,
     AuthTokens,
@@ -23,6 +32,14 @@ __version__ = "0.0.1"
 __all__ = [
     "BshEngine",
     "BshClient",
+    "RetryPolicy",
+    "RateLimiter",
+    "BshExecutor",
+    "DataLoader",
+    "Estimator",
+    "MetricsRegistry",
+    "ScanJob",
+    "ImportJob",
     "BshResponse",
     "BshError",
     "is_ok",
@@ -30,8 +47,12 @@ __all__ = [
     "Filter",
     "GroupBy",
     "Aggregate",
+    "AggregateResult",
     "Sort",
     "Pagination",
+    "Param",
+    "CompiledSearch",
+    "ItemResult",
     "AuthToken",
     "LoginParams",
     "AuthTokens",
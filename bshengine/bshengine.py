@@ -1,8 +1,15 @@
 """Main BSH Engine class"""
-from typing import Optional, List, Callable, Any
+from typing import Optional, List, Callable, Any, Iterable, Union
 from .client import BshClient, BshClientFn, BshAuthFn, BshRefreshTokenFn
 from .types import AuthToken
 from .client.types import BshPostInterceptor, BshPreInterceptor, BshErrorInterceptor
+from .client.compression import CompressionConfig
+from .query.cache import QueryCache
+from .executor import BshExecutor, default_executor
+from .observability.metrics import MetricsRegistry
+from .observability.tracing import Tracer
+from .loader import DataLoader
+from .types import ItemResult
 from .services import (
     EntityService,
     AuthService,
@@ -31,6 +38,11 @@ class BshEngine:
         post_interceptors: Optional[List[BshPostInterceptor]] = None,
         pre_interceptors: Optional[List[BshPreInterceptor]] = None,
         error_interceptors: Optional[List[BshErrorInterceptor]] = None,
+        compression: Optional[Union[str, CompressionConfig]] = None,
+        query_cache: Optional[QueryCache] = None,
+        executor: Optional[BshExecutor] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[Tracer] = None,
     ):
         self.host = host
         self._client_fn = client_fn
@@ -39,6 +51,13 @@ class BshEngine:
         self._post_interceptors: List[BshPostInterceptor] = post_interceptors or []
         self._pre_interceptors: List[BshPreInterceptor] = pre_interceptors or []
         self._error_interceptors: List[BshErrorInterceptor] = error_interceptors or []
+        self._compression: Optional[CompressionConfig] = None
+        self._query_cache = query_cache
+        self._executor = executor
+        self._metrics = metrics
+        self._tracer = tracer
+        if compression:
+            self.with_compression(compression)
 
         # Setup auth function if api_key or jwt_token provided
         if jwt_token and not auth_fn:
@@ -63,6 +82,83 @@ class BshEngine:
         self._refresh_token_fn = refresh_token_fn
         return self
 
+    def with_compression(
+        self,
+        compression: Optional[Union[str, CompressionConfig]],
+    ) -> "BshEngine":
+        """Set body compression (a codec name such as "gzip"/"zstd", or a config)"""
+        if isinstance(compression, str):
+            compression = CompressionConfig(compression)
+        self._compression = compression
+        return self
+
+    def with_query_cache(self, query_cache: Optional[QueryCache]) -> "BshEngine":
+        """Set the cache used by entity searches"""
+        self._query_cache = query_cache
+        return self
+
+    def get_query_cache(self) -> Optional[QueryCache]:
+        """Get the entity search cache"""
+        return self._query_cache
+
+    def with_executor(self, executor: Optional[BshExecutor]) -> "BshEngine":
+        """Set the executor used by map/amap"""
+        self._executor = executor
+        return self
+
+    @property
+    def executor(self) -> BshExecutor:
+        """Get the executor (the shared default one unless set)"""
+        return self._executor or default_executor()
+
+    def map(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        fail_fast: bool = False,
+    ) -> List[ItemResult]:
+        """Call ``fn`` on every item concurrently, see :meth:`BshExecutor.map`"""
+        return self.executor.map(fn, items, concurrency=concurrency, ordered=ordered, fail_fast=fail_fast)
+
+    async def amap(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        fail_fast: bool = False,
+    ) -> List[ItemResult]:
+        """Async version of :meth:`map`; ``fn`` may be a coroutine function"""
+        return await self.executor.amap(
+            fn, items, concurrency=concurrency, ordered=ordered, fail_fast=fail_fast
+        )
+
+    def with_metrics(self, metrics: Optional[MetricsRegistry]) -> "BshEngine":
+        """Set the registry recording per-request metrics"""
+        self._metrics = metrics
+        return self
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]:
+        """Get the metrics registry"""
+        return self._metrics
+
+    def with_tracer(self, tracer: Optional[Tracer]) -> "BshEngine":
+        """Set the tracer creating a span per SDK call"""
+        self._tracer = tracer
+        return self
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        """Get the tracer"""
+        return self._tracer
+
+    def loader(self, key: str = "id", window: float = 0.0) -> DataLoader:
+        """Create a request-scoped loader batching find-by-id lookups"""
+        return DataLoader(self, key=key, window=window)
+
     def post_interceptor(self, interceptor: BshPostInterceptor) -> "BshEngine":
         """Add post-request interceptor"""
         self._post_interceptors.append(interceptor)
@@ -99,16 +195,19 @@ class BshEngine:
             auth_fn=self._auth_fn,
             refresh_token_fn=self._refresh_token_fn,
             bsh_engine=self,
+            compression=self._compression,
+            metrics=self._metrics,
+            tracer=self._tracer,
         )
 
     @property
     def entities(self) -> EntityService:
         """Get entities service"""
-        return EntityService(self._client)
+        return EntityService(self._client, cache=self._query_cache)
 
     def entity(self, entity: str) -> EntityService:
         """Get entity service for specific entity"""
-        return EntityService(self._client, entity)
+        return EntityService(self._client, entity, cache=self._query_cache)
 
     @property
     def core(self) -> dict:
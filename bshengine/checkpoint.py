@@ -0,0 +1,162 @@
+"""Persistent checkpoints for resumable bulk operations"""
+import bisect
+import json
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import sqlite3
+import threading
+import time
+from typing import Optional, Any, Dict, Iterable, Iterator, List, Sequence, Union
+
+
+class Checkpoint(ABC):
+    """Storage for the JSON-serializable state of one resumable run"""
+
+    @abstractmethod
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the saved state, or None if nothing was saved"""
+
+    @abstractmethod
+    def save(self, state: Dict[str, Any]) -> None:
+        """Replace the saved state with ``state``"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Forget the saved state"""
+
+
+class FileCheckpoint(Checkpoint):
+    """Checkpoint kept in a JSON file, replaced atomically on every save"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SqliteCheckpoint(Checkpoint):
+    """Checkpoint kept as a row of a SQLite database shared by several jobs"""
+
+    def __init__(self, path: str, name: str):
+        self.path = path
+        self.name = name
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints "
+                "(name TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        with self._connect() as db:
+            row = db.execute("SELECT state FROM checkpoints WHERE name = ?", (self.name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, state: Dict[str, Any]) -> None:
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO checkpoints (name, state, updated_at) VALUES (?, ?, ?)",
+                (self.name, json.dumps(state), time.time()),
+            )
+
+    def clear(self) -> None:
+        with self._connect() as db:
+            db.execute("DELETE FROM checkpoints WHERE name = ?", (self.name,))
+
+
+def as_checkpoint(checkpoint: Any) -> Optional[Checkpoint]:
+    """Accept a :class:`Checkpoint`, a JSON file path, or None"""
+    if checkpoint is None or isinstance(checkpoint, Checkpoint):
+        return checkpoint
+    return FileCheckpoint(os.fspath(checkpoint))
+
+
+class CompletionLog:
+    """Indexes of completed items of an input processed out of order
+
+    Stored compactly as the count of leading items that are all done plus
+    the runs of done indexes after it, so the state stays small however long
+    the run, even when an item near the start keeps failing. In the state a
+    run is saved as ``[start, end]`` (end excluded), a lone index as an int.
+    """
+
+    def __init__(self, done_below: int = 0, done: Iterable[Union[int, Sequence[int]]] = ()):
+        self.done_below = done_below
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._count = 0
+        self._lock = threading.Lock()
+        for item in done:
+            if isinstance(item, int):
+                self._add(item, item + 1)
+            else:
+                self._add(item[0], item[1])
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, Any]]) -> "CompletionLog":
+        state = state or {}
+        return cls(state.get("done_below", 0), state.get("done", ()))
+
+    def _add(self, start: int, end: int) -> None:
+        start = max(start, self.done_below)
+        if start >= end:
+            return
+        # Merge with every run touching [start, end)
+        i = bisect.bisect_left(self._ends, start)
+        j = bisect.bisect_right(self._starts, end)
+        if i < j:
+            start = min(start, self._starts[i])
+            end = max(end, self._ends[j - 1])
+            self._count -= sum(self._ends[k] - self._starts[k] for k in range(i, j))
+        self._starts[i:j] = [start]
+        self._ends[i:j] = [end]
+        self._count += end - start
+        if self._starts[0] == self.done_below:
+            self.done_below = self._ends.pop(0)
+            self._count -= self.done_below - self._starts.pop(0)
+
+    def mark(self, index: int) -> None:
+        with self._lock:
+            self._add(index, index + 1)
+
+    def __contains__(self, index: int) -> bool:
+        if index < self.done_below:
+            return True
+        i = bisect.bisect_right(self._starts, index)
+        return i > 0 and index < self._ends[i - 1]
+
+    def __len__(self) -> int:
+        return self.done_below + self._count
+
+    def state(self) -> Dict[str, Any]:
+        with self._lock:
+            done = [s if e == s + 1 else [s, e] for s, e in zip(self._starts, self._ends)]
+            return {"done_below": self.done_below, "done": done}
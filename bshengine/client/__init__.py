@@ -1,5 +1,9 @@
 """Client module"""
 from .bsh_client import BshClient, BshClientFn, BshClientFnParams
+from .compression import CompressionConfig
+from .multipart import MultipartEncoder
+from .retry import RetryPolicy
+from .rate_limit import RateLimiter
 from ..types import AuthToken
 from .types import (
     BshAuthFn,
@@ -13,6 +17,10 @@ __all__ = [
     "BshClient",
     "BshClientFn",
     "BshClientFnParams",
+    "CompressionConfig",
+    "MultipartEncoder",
+    "RetryPolicy",
+    "RateLimiter",
     "AuthToken",
     "BshAuthFn",
     "BshRefreshTokenFn",
@@ -3,6 +3,9 @@ import json
 import base64
 from typing import Optional, Any, Dict, Callable, List
 from ..types import BshResponse, BshError, is_ok, AuthToken
+from .compression import CompressionConfig
+from ..observability.metrics import MetricsRegistry, NOOP_TIMER
+from ..observability.tracing import Tracer, NOOP_TRACER
 from .types import (
     BshClientFn,
     BshAuthFn,
@@ -37,12 +40,18 @@ class BshClient:
         auth_fn: Optional[BshAuthFn] = None,
         refresh_token_fn: Optional[BshRefreshTokenFn] = None,
         bsh_engine: Optional[Any] = None,
+        compression: Optional[CompressionConfig] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[Tracer] = None,
     ):
         self.host = host
         self.http_client = http_client
         self.auth_fn = auth_fn
         self.refresh_token_fn = refresh_token_fn
         self.bsh_engine = bsh_engine
+        self.compression = compression
+        self.metrics = metrics
+        self.tracer = tracer or NOOP_TRACER
 
     def _handle_response(
         self,
@@ -74,16 +83,17 @@ class BshClient:
                 raise error
 
         if response_type == "json":
-            try:
-                data = response.json()
-                bsh_response = BshResponse.from_dict(data)
-            except:
-                bsh_response = BshResponse(
-                    data=[response.text],
-                    timestamp=0,
-                    code=response.status_code,
-                    status="ok",
-                )
+            with self.tracer.span("decode"):
+                try:
+                    data = response.json()
+                    bsh_response = BshResponse.from_dict(data)
+                except:
+                    bsh_response = BshResponse(
+                        data=[response.text],
+                        timestamp=0,
+                        code=response.status_code,
+                        status="ok",
+                    )
             
             if params.bsh_options.get("on_success"):
                 params.bsh_options["on_success"](bsh_response)
@@ -93,10 +103,11 @@ class BshClient:
             
             # Apply post interceptors
             if self.bsh_engine and self.bsh_engine.get_post_interceptors():
-                for interceptor in self.bsh_engine.get_post_interceptors():
-                    new_result = interceptor(bsh_response, params)
-                    if new_result:
-                        bsh_response = new_result
+                with self.tracer.span("post_interceptors"):
+                    for interceptor in self.bsh_engine.get_post_interceptors():
+                        new_result = interceptor(bsh_response, params)
+                        if new_result:
+                            bsh_response = new_result
             
             return bsh_response
         
@@ -136,10 +147,11 @@ class BshClient:
             if not refresh_token or not self.bsh_engine:
                 return auth
             
-            refresh_response = self.bsh_engine.auth.refresh_token({
-                "payload": {"refresh": refresh_token},
-                "on_error": lambda e: None,
-            })
+            with self.tracer.span("token_refresh"):
+                refresh_response = self.bsh_engine.auth.refresh_token({
+                    "payload": {"refresh": refresh_token},
+                    "on_error": lambda e: None,
+                })
             
             if refresh_response and refresh_response.data:
                 return AuthToken("JWT", refresh_response.data[0].get("access", auth.token))
@@ -186,134 +198,114 @@ class BshClient:
         
         return params
 
-    def get(self, params: BshClientFnParams) -> Optional[BshResponse]:
-        """Make GET request"""
-        auth_headers = self._get_auth_headers(params)
-        
-        client_params = BshClientFnParams(
-            path=f"{self.host}{params.path}",
-            options={
-                **params.options,
-                "method": "GET",
-                "headers": {
-                    **params.options.get("headers", {}),
-                    **auth_headers,
-                },
-            },
+    def _encode_body(self, params: BshClientFnParams) -> BshClientFnParams:
+        """Prepare the body for the transport
+
+        JSON bodies given as bytes (pre-serialized, e.g. by
+        ``CompiledSearch.bind_json``) are sent as raw JSON. With compression
+        enabled, large JSON bodies are compressed and accepted encodings are
+        advertised.
+        """
+        options = params.options
+        is_json = options.get("request_format", "json") == "json"
+        is_serialized = is_json and isinstance(options.get("body"), (bytes, bytearray))
+        if not self.compression and not is_serialized:
+            return params
+        headers = dict(options.get("headers", {}))
+        if is_serialized:
+            options = {**options, "request_format": "raw"}
+            headers["Content-Type"] = "application/json"
+        if self.compression:
+            headers["Accept-Encoding"] = self.compression.accept_encoding
+            encoded = self.compression.encode_body(options.get("body")) if is_json else None
+            if encoded:
+                body, body_headers = encoded
+                options = {**options, "request_format": "raw", "body": body}
+                headers.update(body_headers)
+        return BshClientFnParams(
+            path=params.path,
+            options={**options, "headers": headers},
             bsh_options=params.bsh_options,
             api=params.api,
         )
-        
-        client_params = self._apply_pre_interceptors(client_params)
-        response = self.http_client(client_params)
-        return self._handle_response(response, client_params, "json")
+
+    def _request(
+        self,
+        method: Optional[str],
+        params: BshClientFnParams,
+        response_type: str = "json",
+    ) -> Optional[Any]:
+        """Send a request through the client pipeline"""
+        tracer = self.tracer
+        timer = self.metrics.start(params.api or "other", method or "GET") if self.metrics else NOOP_TIMER
+        status: Any = "error"
+        client_params = params
+        response = None
+        with tracer.span(params.api or "other") as span:
+            try:
+                with tracer.span("auth"):
+                    auth_headers = self._get_auth_headers(params)
+                timer.mark("auth")
+
+                options = {
+                    **params.options,
+                    "headers": {
+                        **params.options.get("headers", {}),
+                        **auth_headers,
+                    },
+                }
+                if method:
+                    options["method"] = method
+                client_params = BshClientFnParams(
+                    path=f"{self.host}{params.path}",
+                    options=options,
+                    bsh_options=params.bsh_options,
+                    api=params.api,
+                )
+
+                with tracer.span("pre_interceptors"):
+                    client_params = self._apply_pre_interceptors(client_params)
+                client_params = self._encode_body(client_params)
+                timer.mark("serialize")
+                with tracer.span("transport"):
+                    if tracer.enabled:
+                        headers = dict(client_params.options.get("headers", {}))
+                        tracer.inject(headers)
+                        client_params.options = {**client_params.options, "headers": headers}
+                    response = self.http_client(client_params)
+                timer.mark("transport")
+                status = getattr(response, "status_code", "error")
+                decoded = self.compression.decode_response(response) if self.compression else response
+                result = self._handle_response(decoded, client_params, response_type)
+                timer.mark("parse")
+                return result
+            finally:
+                timer.finish(status, client_params.options.get("body"), response)
+                if tracer.enabled:
+                    span.set_attribute("http.method", method or "GET")
+                    span.set_attribute("http.url", client_params.path)
+                    span.set_attribute("http.status_code", status)
+
+    def get(self, params: BshClientFnParams) -> Optional[BshResponse]:
+        """Make GET request"""
+        return self._request("GET", params)
 
     def post(self, params: BshClientFnParams) -> Optional[BshResponse]:
         """Make POST request"""
-        auth_headers = self._get_auth_headers(params)
-        
-        client_params = BshClientFnParams(
-            path=f"{self.host}{params.path}",
-            options={
-                **params.options,
-                "method": "POST",
-                "headers": {
-                    **params.options.get("headers", {}),
-                    **auth_headers,
-                },
-            },
-            bsh_options=params.bsh_options,
-            api=params.api,
-        )
-        
-        client_params = self._apply_pre_interceptors(client_params)
-        response = self.http_client(client_params)
-        return self._handle_response(response, client_params, "json")
+        return self._request("POST", params)
 
     def put(self, params: BshClientFnParams) -> Optional[BshResponse]:
         """Make PUT request"""
-        auth_headers = self._get_auth_headers(params)
-        
-        client_params = BshClientFnParams(
-            path=f"{self.host}{params.path}",
-            options={
-                **params.options,
-                "method": "PUT",
-                "headers": {
-                    **params.options.get("headers", {}),
-                    **auth_headers,
-                },
-            },
-            bsh_options=params.bsh_options,
-            api=params.api,
-        )
-        
-        client_params = self._apply_pre_interceptors(client_params)
-        response = self.http_client(client_params)
-        return self._handle_response(response, client_params, "json")
+        return self._request("PUT", params)
 
     def delete(self, params: BshClientFnParams) -> Optional[BshResponse]:
         """Make DELETE request"""
-        auth_headers = self._get_auth_headers(params)
-        
-        client_params = BshClientFnParams(
-            path=f"{self.host}{params.path}",
-            options={
-                **params.options,
-                "method": "DELETE",
-                "headers": {
-                    **params.options.get("headers", {}),
-                    **auth_headers,
-                },
-            },
-            bsh_options=params.bsh_options,
-            api=params.api,
-        )
-        
-        client_params = self._apply_pre_interceptors(client_params)
-        response = self.http_client(client_params)
-        return self._handle_response(response, client_params, "json")
+        return self._request("DELETE", params)
 
     def patch(self, params: BshClientFnParams) -> Optional[BshResponse]:
         """Make PATCH request"""
-        auth_headers = self._get_auth_headers(params)
-        
-        client_params = BshClientFnParams(
-            path=f"{self.host}{params.path}",
-            options={
-                **params.options,
-                "method": "PATCH",
-                "headers": {
-                    **params.options.get("headers", {}),
-                    **auth_headers,
-                },
-            },
-            bsh_options=params.bsh_options,
-            api=params.api,
-        )
-        
-        client_params = self._apply_pre_interceptors(client_params)
-        response = self.http_client(client_params)
-        return self._handle_response(response, client_params, "json")
+        return self._request("PATCH", params)
 
     def download(self, params: BshClientFnParams) -> Optional[bytes]:
         """Download file as blob"""
-        auth_headers = self._get_auth_headers(params)
-        
-        client_params = BshClientFnParams(
-            path=f"{self.host}{params.path}",
-            options={
-                **params.options,
-                "headers": {
-                    **params.options.get("headers", {}),
-                    **auth_headers,
-                },
-            },
-            bsh_options=params.bsh_options,
-            api=params.api,
-        )
-        
-        client_params = self._apply_pre_interceptors(client_params)
-        response = self.http_client(client_params)
-        return self._handle_response(response, client_params, "blob")
-
+        return self._request(None, params, "blob")
@@ -0,0 +1,205 @@
+"""Request and response body compression"""
+import gzip
+import json
+import zlib
+from abc import ABC, abstractmethod
+from typing import Optional, Any, Dict, Iterator, Mapping, Tuple
+
+DEFAULT_THRESHOLD = 1024
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+
+def zstd_available() -> bool:
+    """Whether the optional ``zstandard`` package can be imported"""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class Codec(ABC):
+    """A content coding usable for Content-Encoding"""
+
+    name = ""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Return ``data`` encoded with this coding"""
+
+    @abstractmethod
+    def decompressor(self) -> Any:
+        """Return an object with ``decompress(chunk)`` and ``flush()``"""
+
+
+class GzipCodec(Codec):
+    """gzip content coding (standard library)"""
+
+    name = "gzip"
+
+    def __init__(self, level: Optional[int] = None):
+        self.level = 6 if level is None else level
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level)
+
+    def decompressor(self) -> Any:
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+
+class _ZstdDecompressor:
+    def __init__(self, zstandard):
+        self._obj = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, chunk: bytes) -> bytes:
+        return self._obj.decompress(chunk)
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class ZstdCodec(Codec):
+    """zstd content coding (requires the ``zstandard`` package)"""
+
+    name = "zstd"
+
+    def __init__(self, level: Optional[int] = None):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd compression requires the 'zstandard' package "
+                "(pip install \"bshengine-sdk[zstd]\")"
+            ) from e
+        self._zstandard = zstandard
+        self._compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompressor(self) -> Any:
+        return _ZstdDecompressor(self._zstandard)
+
+
+def get_codec(name: str, level: Optional[int] = None) -> Codec:
+    """Return the codec registered under ``name``"""
+    if name == "gzip":
+        return GzipCodec(level)
+    if name == "zstd":
+        return ZstdCodec(level)
+    raise ValueError(f"Unsupported compression codec: {name}")
+
+
+class CompressionConfig:
+    """Per-engine body compression settings
+
+    JSON request bodies of at least ``threshold`` bytes are compressed with
+    ``codec`` and sent with a ``Content-Encoding`` header. ``Accept-Encoding``
+    advertises every codec that can be decoded, and encoded responses the
+    transport did not already decode are decompressed transparently.
+    """
+
+    def __init__(
+        self,
+        codec: str = "gzip",
+        threshold: int = DEFAULT_THRESHOLD,
+        level: Optional[int] = None,
+        compress_requests: bool = True,
+    ):
+        self.codec = get_codec(codec, level)
+        self.threshold = threshold
+        self.compress_requests = compress_requests
+        self.decoders: Dict[str, Codec] = {"gzip": GzipCodec()}
+        if zstd_available():
+            self.decoders["zstd"] = ZstdCodec()
+        self.decoders[self.codec.name] = self.codec
+
+    @property
+    def accept_encoding(self) -> str:
+        return ", ".join(sorted(self.decoders, reverse=True))
+
+    def encode_body(self, body: Any) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """Compress a JSON body, or return None if it stays uncompressed
+
+        ``body`` is a JSON-serializable object or already serialized bytes.
+        """
+        if not self.compress_requests or body is None:
+            return None
+        if isinstance(body, (bytes, bytearray)):
+            raw = bytes(body)
+        else:
+            raw = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        if len(raw) < self.threshold:
+            return None
+        return self.codec.compress(raw), {
+            "Content-Type": "application/json",
+            "Content-Encoding": self.codec.name,
+        }
+
+    def decode_response(self, response: Any) -> Any:
+        """Wrap ``response`` so its body is decompressed, if needed"""
+        headers = getattr(response, "headers", None)
+        if not isinstance(headers, Mapping):
+            return response
+        encoding = headers.get("Content-Encoding") or headers.get("content-encoding")
+        codec = self.decoders.get(str(encoding).strip().lower()) if encoding else None
+        if codec is None:
+            return response
+        return DecodedResponse(response, codec)
+
+
+class DecodedResponse:
+    """Response wrapper that decompresses an encoded body on access
+
+    Transports that already decoded the body (``requests`` does for gzip) are
+    detected from the codec's magic bytes and passed through unchanged.
+    """
+
+    def __init__(self, response: Any, codec: Codec):
+        self._response = response
+        self._codec = codec
+        self._content: Optional[bytes] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    def _raw_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        content = self._response.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield decompressed body chunks"""
+        if self._content is not None:
+            yield self._content
+            return
+        chunks = self._raw_chunks(chunk_size)
+        first = next(chunks, b"")
+        magic = _MAGIC.get(self._codec.name, b"")
+        if not first.startswith(magic):
+            yield first
+            yield from chunks
+            return
+        decompressor = self._codec.decompressor()
+        yield decompressor.decompress(first)
+        for chunk in chunks:
+            yield decompressor.decompress(chunk)
+        yield decompressor.flush()
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = b"".join(self.iter_content())
+        return self._content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(getattr(self._response, "encoding", None) or "utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
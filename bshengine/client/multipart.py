@@ -0,0 +1,299 @@
+"""Streaming multipart/form-data encoding for uploads"""
+import os
+import uuid
+from contextlib import contextmanager
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Called with (bytes_sent, total_bytes); total_bytes is None when unknown
+ProgressFn = Callable[[int, Optional[int]], Any]
+
+# A path, a binary file object, bytes-like data, or a (async) iterable of bytes
+UploadSource = Any
+
+
+def _is_path(source: Any) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def _is_bytes_like(source: Any) -> bool:
+    return isinstance(source, (bytes, bytearray, memoryview))
+
+
+def _is_async_iterable(source: Any) -> bool:
+    return hasattr(source, "__aiter__")
+
+
+def _source_size(source: Any) -> Optional[int]:
+    """Return the number of bytes ``source`` will produce, if it can be known"""
+    if _is_path(source):
+        return os.path.getsize(source)
+    if _is_bytes_like(source):
+        return memoryview(source).nbytes
+    if hasattr(source, "read"):
+        try:
+            position = source.tell()
+            return os.fstat(source.fileno()).st_size - position
+        except (AttributeError, OSError, ValueError):
+            pass
+        try:
+            position = source.tell()
+            end = source.seek(0, os.SEEK_END)
+            source.seek(position)
+            return end - position
+        except (AttributeError, OSError, ValueError):
+            return None
+    return None
+
+
+def _source_name(source: Any) -> str:
+    if _is_path(source):
+        return os.path.basename(os.fspath(source))
+    name = getattr(source, "name", None)
+    if isinstance(name, str):
+        return os.path.basename(name)
+    return "file"
+
+
+def _iter_file(f, chunk_size: int) -> Iterator[bytes]:
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_source(source: Any, chunk_size: int) -> Iterator[bytes]:
+    """Yield ``source`` in chunks of at most ``chunk_size`` bytes"""
+    if _is_path(source):
+        with open(source, "rb") as f:
+            yield from _iter_file(f, chunk_size)
+    elif _is_bytes_like(source):
+        view = memoryview(source).cast("B")
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+    elif hasattr(source, "read"):
+        yield from _iter_file(source, chunk_size)
+    elif _is_async_iterable(source):
+        raise TypeError("Async byte iterators can only be consumed with 'async for'")
+    else:
+        for chunk in source:
+            yield from _iter_source(bytes(chunk), chunk_size)
+
+
+async def _aiter_source(source: Any, chunk_size: int) -> AsyncIterator[bytes]:
+    if _is_async_iterable(source):
+        async for chunk in source:
+            for piece in _iter_source(bytes(chunk), chunk_size):
+                yield piece
+    else:
+        for chunk in _iter_source(source, chunk_size):
+            yield chunk
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", "").replace("\n", "")
+
+
+class MultipartEncoder:
+    """Lazily encode form fields and files as a multipart/form-data body
+
+    Files are read in ``chunk_size`` pieces while the body is consumed, so
+    memory use is constant whatever the upload size. A file can be given as a
+    path, a binary file object, bytes/bytearray/memoryview, an iterable of
+    bytes, or an async iterable of bytes (consumed with ``async for``).
+
+    ``files`` maps a field name to a source, or to a ``(filename, source)`` or
+    ``(filename, source, content_type)`` tuple.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        boundary: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_progress: Optional[ProgressFn] = None,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.bytes_read = 0
+        self._parts: List[Tuple[bytes, Any]] = []
+        for name, value in (fields or {}).items():
+            header = self._part_header(name)
+            self._parts.append((header, str(value).encode("utf-8")))
+        for name, value in (files or {}).items():
+            filename, source, content_type = self._unpack_file(value)
+            header = self._part_header(name, filename, content_type)
+            self._parts.append((header, source))
+        self._closing = f"--{self.boundary}--\r\n".encode("ascii")
+        self._length = self._compute_length()
+        self._reader: Optional[Iterator[bytes]] = None
+        self._buffer = b""
+
+    @staticmethod
+    def _unpack_file(value: Any) -> Tuple[str, Any, str]:
+        if isinstance(value, tuple):
+            filename = value[0]
+            source = value[1]
+            content_type = value[2] if len(value) > 2 else None
+        else:
+            filename, source, content_type = None, value, None
+        return (
+            filename or _source_name(source),
+            source,
+            content_type or "application/octet-stream",
+        )
+
+    def _part_header(
+        self,
+        name: str,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> bytes:
+        disposition = f'form-data; name="{_quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{_quote(filename)}"'
+        lines = [f"--{self.boundary}", f"Content-Disposition: {disposition}"]
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    def _compute_length(self) -> Optional[int]:
+        total = len(self._closing)
+        for header, source in self._parts:
+            size = _source_size(source)
+            if size is None:
+                return None
+            total += len(header) + size + 2
+        return total
+
+    @property
+    def content_type(self) -> str:
+        """Value for the Content-Type header"""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    @property
+    def len(self) -> Optional[int]:
+        """Total body size in bytes, or None when a source has unknown size
+
+        Named ``len`` so that ``requests`` picks it up to send a Content-Length
+        (and falls back to chunked transfer when it is None).
+        """
+        return self._length
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Headers describing the encoded body"""
+        headers = {"Content-Type": self.content_type}
+        if self._length is not None:
+            headers["Content-Length"] = str(self._length)
+        return headers
+
+    def _advance(self, chunk: bytes) -> bytes:
+        self.bytes_read += len(chunk)
+        if self.on_progress:
+            self.on_progress(self.bytes_read, self._length)
+        return chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        self.bytes_read = 0
+        for header, source in self._parts:
+            yield self._advance(header)
+            for chunk in _iter_source(source, self.chunk_size):
+                yield self._advance(chunk)
+            yield self._advance(b"\r\n")
+        yield self._advance(self._closing)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        self.bytes_read = 0
+        for header, source in self._parts:
+            yield self._advance(header)
+            async for chunk in _aiter_source(source, self.chunk_size):
+                yield self._advance(chunk)
+            yield self._advance(b"\r\n")
+        yield self._advance(self._closing)
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` bytes of the body (file-like interface)"""
+        if self._reader is None:
+            self._reader = iter(self)
+        if size is None or size < 0:
+            data = self._buffer + b"".join(self._reader)
+            self._buffer = b""
+            return data
+        while len(self._buffer) < size:
+            chunk = next(self._reader, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def is_form_source(source: Any) -> bool:
+    """Whether ``source`` can be sent with the classic ``form`` request format"""
+    return _is_path(source) or _is_bytes_like(source) or hasattr(source, "read")
+
+
+@contextmanager
+def upload_options(
+    field: str,
+    source: UploadSource,
+    data: Optional[Dict[str, Any]] = None,
+    filename: Optional[str] = None,
+    stream: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_progress: Optional[ProgressFn] = None,
+):
+    """Build client options for uploading ``source`` as form field ``field``
+
+    With ``stream`` (or a source that is only an iterator) the body is a
+    :class:`MultipartEncoder` sent with ``request_format="raw"``; otherwise the
+    classic ``form`` format with ``{"files": ..., "data": ...}`` is used.
+    """
+    if stream or not is_form_source(source):
+        encoder = MultipartEncoder(
+            fields=data,
+            files={field: (filename, source)},
+            chunk_size=chunk_size,
+            on_progress=on_progress,
+        )
+        yield {
+            "response_type": "json",
+            "request_format": "raw",
+            "body": encoder,
+            "headers": encoder.headers,
+        }
+        return
+
+    name = filename or _source_name(source)
+    if _is_path(source):
+        with open(source, "rb") as f:
+            body: Dict[str, Any] = {"files": {field: (name, f)}}
+            if data is not None:
+                body["data"] = data
+            yield {"response_type": "json", "request_format": "form", "body": body}
+        return
+
+    content = bytes(source) if isinstance(source, memoryview) else source
+    body = {"files": {field: (name, content)}}
+    if data is not None:
+        body["data"] = data
+    yield {"response_type": "json", "request_format": "form", "body": body}
@@ -0,0 +1,60 @@
+"""Client-side request rate limiting"""
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` calls per second with bursts of ``burst``
+
+    Shared between threads; :meth:`acquire` blocks and :meth:`acquire_async`
+    awaits until a token is available.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take ``tokens`` and return how long to wait before using them"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take ``tokens`` if available without waiting"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Wait until ``tokens`` are available"""
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Await until ``tokens`` are available"""
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
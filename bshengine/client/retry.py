@@ -0,0 +1,80 @@
+"""Retry policy for SDK calls"""
+import asyncio
+import random
+import time
+from typing import Any, Callable, Optional, Tuple, Type
+from ..types import BshError
+
+RETRYABLE_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Retry failed calls with exponential backoff and jitter
+
+    ``BshError`` is retried when its status is in ``retry_statuses``; any other
+    exception is retried when it is an instance of ``retry_on``.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        jitter: float = 0.1,
+        retry_statuses: Tuple[int, ...] = RETRYABLE_STATUSES,
+        retry_on: Tuple[Type[BaseException], ...] = (OSError,),
+        on_retry: Optional[Callable[[BaseException, int], Any]] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.retry_on = retry_on
+        self.on_retry = on_retry
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether ``error`` raised by attempt number ``attempt`` is retried"""
+        if attempt >= self.max_attempts:
+            return False
+        if isinstance(error, BshError):
+            return error.status in self.retry_statuses
+        return isinstance(error, self.retry_on)
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after attempt number ``attempt`` failed"""
+        base = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return base + random.uniform(0, self.jitter * base)
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``fn`` until it succeeds or the policy gives up"""
+        attempt = 1
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as error:
+                if not self.should_retry(error, attempt):
+                    raise
+                if self.on_retry:
+                    self.on_retry(error, attempt)
+                time.sleep(self.delay(attempt))
+                attempt += 1
+
+    async def call_async(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await ``fn`` until it succeeds or the policy gives up"""
+        attempt = 1
+        while True:
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as error:
+                if not self.should_retry(error, attempt):
+                    raise
+                if self.on_retry:
+                    self.on_retry(error, attempt)
+                await asyncio.sleep(self.delay(attempt))
+                attempt += 1
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,184 @@
+"""Approximate counts from sampled pages and distinct-count sketches"""
+import math
+import random
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import replace
+from statistics import NormalDist
+from typing import Optional, Any, Callable, Dict, Tuple
+from .executor import executor_for
+from .query.evaluator import filter_rows
+from .query.normalize import canonical_key
+from .query.sketch import HyperLogLog
+from .types import BshResponse, BshSearch, CountEstimate, Pagination, Sort
+
+SAMPLE_PAGES = 4
+SAMPLE_PAGE_SIZE = 100
+
+
+def count_of(response: Optional[BshResponse]) -> int:
+    """Extract the number from a count response"""
+    if not response or not response.data:
+        return 0
+    first = response.data[0]
+    return int(first.get("count", 0) if isinstance(first, dict) else first)
+
+
+class Estimator:
+    """Cheap approximate counts over an entity (or the user) service
+
+    :meth:`count` reads the unfiltered total, then fetches ``pages`` pages
+    at random offsets and evaluates the search filters on them locally; the
+    matching fraction is extrapolated to the total with a Wilson interval at
+    ``confidence``. Pages are samples of neighbouring rows, so the interval
+    is optimistic when matches cluster by key. :meth:`distinct` scans one
+    column into a :class:`~bshengine.query.HyperLogLog` sketch. Results are
+    cached for ``ttl`` seconds; :meth:`exact` (or ``count(refine=True)`` in
+    the background) replaces an estimate with the server's exact count.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        ttl: float = 60.0,
+        pages: int = SAMPLE_PAGES,
+        page_size: int = SAMPLE_PAGE_SIZE,
+        confidence: float = 0.95,
+        key: str = "id",
+        precision: int = 12,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.service = service
+        self.ttl = ttl
+        self.pages = pages
+        self.page_size = page_size
+        self.confidence = confidence
+        self.key = key
+        self.precision = precision
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.sketches: Dict[str, HyperLogLog] = {}
+        self._cache: Dict[str, Tuple[float, CountEstimate]] = {}
+        self._refining: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, cache_key: str) -> Optional[CountEstimate]:
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is None or entry[0] <= self.clock():
+                return None
+            return entry[1]
+
+    def _store(self, cache_key: str, estimate: CountEstimate) -> CountEstimate:
+        with self._lock:
+            current = self._cache.get(cache_key)
+            # An exact count is never replaced by an estimate while it is fresh
+            if not (current and current[1].exact and not estimate.exact and current[0] > self.clock()):
+                self._cache[cache_key] = (self.clock() + self.ttl, estimate)
+        return estimate
+
+    def _interval(self, matches: int, sampled: int, total: int) -> Tuple[int, int]:
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        p = matches / sampled
+        denominator = 1 + z * z / sampled
+        center = (p + z * z / (2 * sampled)) / denominator
+        half = z * math.sqrt(p * (1 - p) / sampled + z * z / (4 * sampled * sampled)) / denominator
+        half *= math.sqrt((total - sampled) / (total - 1)) if total > 1 else 0.0
+        low = max(matches, math.floor((center - half) * total))
+        high = min(total - (sampled - matches), math.ceil((center + half) * total))
+        return low, high
+
+    def estimate(self, payload: Optional[BshSearch] = None) -> CountEstimate:
+        """Estimate the number of matches of ``payload`` from sampled pages"""
+        search = payload or BshSearch()
+        total = count_of(self.service.count())
+        if not search.filters:
+            return CountEstimate(value=total, low=total, high=total, exact=True, confidence=1.0)
+        page_count = math.ceil(total / self.page_size)
+        chosen = range(1, page_count + 1)
+        if page_count > self.pages:
+            chosen = sorted(self.rng.sample(chosen, self.pages))
+        # Every column is fetched so the filters can be evaluated locally, and
+        # pages are sent as dicts so the samples stay out of the query cache
+        unfiltered = replace(
+            search, fields=None, filters=None, group_by=None, sort=[Sort(field=self.key, direction=1)]
+        )
+        matches = sampled = 0
+        for page in chosen:
+            paged = replace(unfiltered, pagination=Pagination(page=page, size=self.page_size))
+            response = self.service.search(paged.to_dict())
+            rows = response.data if response else []
+            sampled += len(rows)
+            matches += len(filter_rows(rows, search.filters))
+        if sampled == 0:
+            return CountEstimate(value=0, low=0, high=0, exact=True, confidence=1.0)
+        if page_count <= self.pages:
+            # Every page was read: the sample is the whole table
+            return CountEstimate(matches, matches, matches, exact=True, confidence=1.0, sampled=sampled)
+        low, high = self._interval(matches, sampled, total)
+        value = round(matches / sampled * total)
+        return CountEstimate(value=value, low=low, high=high, confidence=self.confidence, sampled=sampled)
+
+    def exact(self, payload: Optional[BshSearch] = None) -> CountEstimate:
+        """Ask the server for the exact count and cache it"""
+        search = payload or BshSearch()
+        response = self.service.count_filtered(search) if search.filters else self.service.count()
+        total = count_of(response)
+        estimate = CountEstimate(value=total, low=total, high=total, exact=True, confidence=1.0)
+        return self._store(canonical_key(search), estimate)
+
+    def count(self, payload: Optional[BshSearch] = None, refine: bool = False) -> CountEstimate:
+        """Return a cached or freshly sampled count
+
+        With ``refine``, an exact count is also started in the background;
+        once it finishes, later calls return it until it expires.
+        """
+        search = payload or BshSearch()
+        cache_key = canonical_key(search)
+        cached = self._cached(cache_key)
+        if cached is None:
+            cached = self._store(cache_key, self.estimate(search))
+        if refine and not cached.exact:
+            self.refine(search)
+        return cached
+
+    def refine(self, payload: Optional[BshSearch] = None) -> "Future[CountEstimate]":
+        """Start an exact count in the background (once per search at a time)"""
+        search = payload or BshSearch()
+        cache_key = canonical_key(search)
+        with self._lock:
+            future = self._refining.get(cache_key)
+            if future is None or future.done():
+                future = executor_for(self.service.client).pool.submit(self.exact, search)
+                self._refining[cache_key] = future
+        return future
+
+    def distinct(self, field: str, payload: Optional[BshSearch] = None) -> CountEstimate:
+        """Estimate the number of distinct ``field`` values among the matches of ``payload``
+
+        Every match is scanned once (fetching only ``field``) into a sketch
+        kept in :attr:`sketches`; the estimate is cached like counts.
+        """
+        search = replace(payload or BshSearch(), fields=[field])
+        cache_key = f"distinct:{field}:{canonical_key(search)}"
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+        sketch = HyperLogLog(self.precision)
+        for row in self.service.scan(search):
+            value = row.get(field)
+            if value is not None:
+                sketch.add(value)
+        self.sketches[cache_key] = sketch
+        value = sketch.count()
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        margin = value * sketch.error * z
+        estimate = CountEstimate(
+            value=value,
+            low=max(0, math.floor(value - margin)),
+            high=math.ceil(value + margin),
+            confidence=self.confidence,
+        )
+        return self._store(cache_key, estimate)
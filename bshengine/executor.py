@@ -0,0 +1,249 @@
+"""Bounded fan-out of independent SDK calls"""
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Optional, Any, AsyncIterator, Callable, Iterable, Iterator, List, Set
+from .client.rate_limit import RateLimiter
+from .client.retry import RetryPolicy
+from .observability.metrics import QUEUED_AT
+from .types import ItemResult
+
+DEFAULT_MAX_WORKERS = 32
+DEFAULT_CONCURRENCY = 8
+
+
+def _timed(call: Callable[[Any], Any], index: int, item: Any, queued_at: Optional[float] = None) -> ItemResult:
+    token = QUEUED_AT.set(queued_at)
+    start = time.perf_counter()
+    try:
+        value = call(item)
+    except Exception as error:
+        return ItemResult(index, item, error=error, duration=time.perf_counter() - start)
+    finally:
+        QUEUED_AT.reset(token)
+    return ItemResult(index, item, value, duration=time.perf_counter() - start)
+
+
+class BshExecutor:
+    """Run a function over many items with bounded concurrency
+
+    Sync calls share one thread pool of ``max_workers`` threads; each
+    :meth:`map` keeps at most ``concurrency`` of its items in flight. Async
+    calls use the same window over tasks, running plain functions in the pool.
+    Every attempt takes a token from ``rate_limiter`` and failed items are
+    retried by ``retry``. Errors are captured per item in
+    :class:`~bshengine.types.ItemResult` unless ``fail_fast`` is set, in which
+    case items not yet started are cancelled and the first error is raised.
+
+    A mapped function must not call :meth:`map` on the same executor: the
+    inner calls would wait for threads held by the outer ones.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.max_workers = max_workers
+        self.concurrency = concurrency
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="bsh-executor")
+        return self._pool
+
+    def _call(
+        self,
+        fn: Callable[[Any], Any],
+        retry: Optional[RetryPolicy],
+        rate_limiter: Optional[RateLimiter],
+    ) -> Callable[[Any], Any]:
+        retry = retry or self.retry
+        limiter = rate_limiter or self.rate_limiter
+
+        def attempt(item: Any) -> Any:
+            if limiter:
+                limiter.acquire()
+            return fn(item)
+
+        if retry:
+            return lambda item: retry.call(attempt, item)
+        return attempt
+
+    def as_completed(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: Optional[int] = None,
+        fail_fast: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> Iterator[ItemResult]:
+        """Yield a result per item as soon as it completes"""
+        call = self._call(fn, retry, rate_limiter)
+        limit = max(1, concurrency or self.concurrency)
+        source = enumerate(items)
+        pending: Set[Future] = set()
+
+        def fill() -> None:
+            for index, item in source:
+                pending.add(self.pool.submit(_timed, call, index, item, time.perf_counter()))
+                if len(pending) >= limit:
+                    return
+
+        try:
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    result = future.result()
+                    if fail_fast and result.error is not None:
+                        raise result.error
+                    yield result
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def map(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        fail_fast: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> List[ItemResult]:
+        """Call ``fn`` on every item; results in input order unless ``ordered=False``"""
+        results = list(self.as_completed(fn, items, concurrency, fail_fast, retry, rate_limiter))
+        if ordered:
+            results.sort(key=lambda r: r.index)
+        return results
+
+    def _acall(
+        self,
+        fn: Callable[[Any], Any],
+        retry: Optional[RetryPolicy],
+        rate_limiter: Optional[RateLimiter],
+    ) -> Callable[[Any], Any]:
+        retry = retry or self.retry
+        limiter = rate_limiter or self.rate_limiter
+        is_async = asyncio.iscoroutinefunction(fn)
+
+        async def attempt(item: Any) -> Any:
+            if limiter:
+                await limiter.acquire_async()
+            if is_async:
+                return await fn(item)
+            return await asyncio.get_running_loop().run_in_executor(self.pool, fn, item)
+
+        if retry:
+            return lambda item: retry.call_async(attempt, item)
+        return attempt
+
+    async def aas_completed(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: Optional[int] = None,
+        fail_fast: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> AsyncIterator[ItemResult]:
+        """Async version of :meth:`as_completed`; ``fn`` may be a coroutine function"""
+        call = self._acall(fn, retry, rate_limiter)
+        limit = max(1, concurrency or self.concurrency)
+        source = enumerate(items)
+        pending: Set[asyncio.Future] = set()
+
+        async def run(index: int, item: Any) -> ItemResult:
+            start = time.perf_counter()
+            try:
+                value = await call(item)
+            except Exception as error:
+                return ItemResult(index, item, error=error, duration=time.perf_counter() - start)
+            return ItemResult(index, item, value, duration=time.perf_counter() - start)
+
+        def fill() -> None:
+            for index, item in source:
+                pending.add(asyncio.ensure_future(run(index, item)))
+                if len(pending) >= limit:
+                    return
+
+        try:
+            fill()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.discard(task)
+                    result = task.result()
+                    if fail_fast and result.error is not None:
+                        raise result.error
+                    yield result
+                fill()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def amap(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: Optional[int] = None,
+        ordered: bool = True,
+        fail_fast: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ) -> List[ItemResult]:
+        """Async version of :meth:`map`"""
+        results = [
+            r async for r in self.aas_completed(fn, items, concurrency, fail_fast, retry, rate_limiter)
+        ]
+        if ordered:
+            results.sort(key=lambda r: r.index)
+        return results
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the thread pool"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "BshExecutor":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.shutdown()
+
+
+_default_executor: Optional[BshExecutor] = None
+_default_lock = threading.Lock()
+
+
+def default_executor() -> BshExecutor:
+    """Process-wide executor used when none is configured"""
+    global _default_executor
+    if _default_executor is None:
+        with _default_lock:
+            if _default_executor is None:
+                _default_executor = BshExecutor()
+    return _default_executor
+
+
+def executor_for(client: Any) -> BshExecutor:
+    """Executor of the engine behind ``client``, or the shared default"""
+    executor = getattr(getattr(client, "bsh_engine", None), "executor", None)
+    return executor if isinstance(executor, BshExecutor) else default_executor()
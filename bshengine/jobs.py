@@ -0,0 +1,186 @@
+"""Resumable long-running scans and imports"""
+import time
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Union
+from .checkpoint import Checkpoint, CompletionLog, as_checkpoint
+from .client.rate_limit import RateLimiter
+from .client.retry import RetryPolicy
+from .executor import executor_for
+from .services.entities import EntityService, IN_CHUNK_SIZE, SCAN_PAGE_SIZE, ScanMode
+from .types import BshSearch, JobReport
+
+
+class Job:
+    """Base for jobs that persist their progress and resume from it
+
+    The state is saved after every ``every`` units of work or ``interval``
+    seconds, whichever comes first, and when the run ends or fails, so a
+    restart only repeats the work done since the last save.
+    """
+
+    def __init__(
+        self,
+        checkpoint: Optional[Union[str, Checkpoint]] = None,
+        every: int = 1,
+        interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.checkpoint = as_checkpoint(checkpoint)
+        self.every = max(1, every)
+        self.interval = interval
+        self.clock = clock
+        self._pending = 0
+        self._saved_at = clock()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the saved state, if any"""
+        return self.checkpoint.load() if self.checkpoint else None
+
+    def reset(self) -> None:
+        """Forget saved progress so the next run starts over"""
+        if self.checkpoint:
+            self.checkpoint.clear()
+
+    def _save(self, state: Dict[str, Any], report: JobReport) -> None:
+        if self.checkpoint:
+            self.checkpoint.save(state)
+            report.checkpoints += 1
+        self._pending = 0
+        self._saved_at = self.clock()
+
+    def _progress(self, state: Callable[[], Dict[str, Any]], report: JobReport) -> None:
+        """Record one unit of work, saving when the interval is reached"""
+        self._pending += 1
+        if self._pending >= self.every or self.clock() - self._saved_at >= self.interval:
+            self._save(state(), report)
+
+
+class ScanJob(Job):
+    """Feed every page of a search to ``handler``, resuming after the last saved page
+
+    Pages are delivered at least once: a page handled after the last save
+    is handed over again when the job resumes. Use ``mode="keyset"`` for
+    large exports so resumed and deep pages stay cheap.
+    """
+
+    def __init__(
+        self,
+        service: EntityService,
+        handler: Callable[[List[Any]], Any],
+        search: Optional[BshSearch] = None,
+        entity: Optional[str] = None,
+        page_size: int = SCAN_PAGE_SIZE,
+        key: str = "id",
+        checkpoint: Optional[Union[str, Checkpoint]] = None,
+        every: int = 1,
+        interval: float = 30.0,
+        mode: ScanMode = "page",
+    ):
+        super().__init__(checkpoint, every, interval)
+        self.service = service
+        self.handler = handler
+        self.search = search
+        self.entity = entity
+        self.page_size = page_size
+        self.key = key
+        self.mode = mode
+
+    def run(self) -> JobReport:
+        start = time.perf_counter()
+        state = self.load() or {}
+        report = JobReport(resumed=bool(state), skipped=state.get("processed", 0))
+        if state.get("completed"):
+            report.completed = True
+            return report
+        progress = {"cursor": state.get("cursor"), "processed": state.get("processed", 0)}
+        try:
+            for rows, cursor in self.service.pages(
+                self.search, self.entity, self.page_size, self.key, progress["cursor"], self.mode
+            ):
+                self.handler(rows)
+                progress["cursor"] = cursor
+                progress["processed"] += len(rows)
+                report.processed += len(rows)
+                self._progress(lambda: dict(progress), report)
+            report.completed = True
+        finally:
+            self._save({**progress, "completed": report.completed}, report)
+            report.elapsed = time.perf_counter() - start
+        return report
+
+
+def _batches(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ImportJob(Job):
+    """Create records in concurrent ``create_many`` batches, skipping acknowledged batches
+
+    ``records`` must yield the same records in the same order on every run
+    for the saved batch positions to stay meaningful. Failed batches are
+    reported and retried by the next run.
+    """
+
+    def __init__(
+        self,
+        service: EntityService,
+        records: Iterable[Any],
+        entity: Optional[str] = None,
+        batch_size: int = IN_CHUNK_SIZE,
+        concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        checkpoint: Optional[Union[str, Checkpoint]] = None,
+        every: int = 10,
+        interval: float = 30.0,
+    ):
+        super().__init__(checkpoint, every, interval)
+        self.service = service
+        self.records = records
+        self.entity = entity
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+
+    def run(self) -> JobReport:
+        start = time.perf_counter()
+        state = self.load()
+        log = CompletionLog.from_state(state)
+        report = JobReport(resumed=state is not None)
+
+        def pending() -> Iterator[Any]:
+            for index, batch in enumerate(_batches(self.records, self.batch_size)):
+                if index in log:
+                    report.skipped += len(batch)
+                else:
+                    yield index, batch
+
+        def create(item: Any) -> Any:
+            return self.service.create_many(item[1], entity=self.entity)
+
+        try:
+            for result in executor_for(self.service.client).as_completed(
+                create,
+                pending(),
+                concurrency=self.concurrency,
+                retry=self.retry,
+                rate_limiter=self.rate_limiter,
+            ):
+                if result.ok:
+                    log.mark(result.item[0])
+                    report.processed += len(result.item[1])
+                    self._progress(log.state, report)
+                else:
+                    report.failed.append(result)
+            report.completed = not report.failed
+        finally:
+            self._save(log.state(), report)
+            report.elapsed = time.perf_counter() - start
+        return report
@@ -0,0 +1,104 @@
+"""Request-scoped batching of find-by-id lookups"""
+import asyncio
+from typing import Optional, Any, Dict, List, Tuple
+from .services.entities import IN_CHUNK_SIZE
+
+
+class DataLoader:
+    """Batch and memoize ``find_by_id`` lookups made within one scope
+
+    Every :meth:`load` made in the same event-loop tick (or within
+    ``window`` seconds of the first one) is collected per entity and sent as
+    one ``find_by_ids`` call, run off the event loop. Each id is fetched
+    at most once per loader; create one loader per request::
+
+        loader = engine.loader()
+        user, team = await asyncio.gather(
+            loader.load("BshUsers", user_id),
+            loader.load("Teams", team_id),
+        )
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        key: str = "id",
+        window: float = 0.0,
+        max_batch: int = IN_CHUNK_SIZE,
+    ):
+        self.engine = engine
+        self.key = key
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self._memo: Dict[Tuple[str, Any], asyncio.Future] = {}
+        self._queues: Dict[str, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.Handle] = {}
+
+    def load(self, entity: str, id: Any) -> "asyncio.Future":
+        """Return a future resolving to the record, or None if it does not exist"""
+        future = self._memo.get((entity, id))
+        if future is not None:
+            return future
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._memo[(entity, id)] = future
+        queue = self._queues.setdefault(entity, [])
+        queue.append((id, future))
+        if len(queue) == 1:
+            if self.window:
+                self._timers[entity] = loop.call_later(self.window, self._dispatch, entity)
+            else:
+                self._timers[entity] = loop.call_soon(self._dispatch, entity)
+        elif len(queue) >= self.max_batch:
+            self._dispatch(entity)
+        return future
+
+    async def load_many(self, entity: str, ids: List[Any]) -> List[Optional[Any]]:
+        """Load several records; missing ones are None"""
+        return list(await asyncio.gather(*(self.load(entity, id) for id in ids)))
+
+    def prime(self, entity: str, record: Any) -> None:
+        """Seed the memo with a record already at hand"""
+        key = (entity, record.get(self.key))
+        if key not in self._memo:
+            future = asyncio.get_event_loop().create_future()
+            future.set_result(record)
+            self._memo[key] = future
+
+    def clear(self, entity: Optional[str] = None, id: Any = None) -> None:
+        """Forget memoized records (all, of one entity, or one id)"""
+        for memo_key in list(self._memo):
+            if entity is None or (memo_key[0] == entity and (id is None or memo_key[1] == id)):
+                del self._memo[memo_key]
+
+    def _dispatch(self, entity: str) -> None:
+        timer = self._timers.pop(entity, None)
+        if timer is not None:
+            # A full batch goes early; its timer must not cut the next batch's window short
+            timer.cancel()
+        queue = self._queues.pop(entity, None)
+        if queue:
+            self.batches += 1
+            asyncio.ensure_future(self._fetch(entity, queue))
+
+    async def _fetch(self, entity: str, queue: List[Tuple[Any, asyncio.Future]]) -> None:
+        # The futures are captured at dispatch: clear() may drop them from the
+        # memo while the batch is in flight, and callers still await them
+        ids = list(dict.fromkeys(id for id, _ in queue))
+        service = self.engine.entity(entity)
+        loop = asyncio.get_event_loop()
+        try:
+            # The loop's default pool: find_by_ids itself fans out on the engine executor
+            response = await loop.run_in_executor(None, lambda: service.find_by_ids(ids, key=self.key))
+        except Exception as error:
+            for id, future in queue:
+                if self._memo.get((entity, id)) is future:
+                    del self._memo[(entity, id)]
+                if not future.done():
+                    future.set_exception(error)
+            return
+        records = {row.get(self.key): row for row in response.data}
+        for id, future in queue:
+            if not future.done():
+                future.set_result(records.get(id))
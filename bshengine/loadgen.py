@@ -0,0 +1,310 @@
+"""Load generator driving a mix of ``EntityService`` calls against BSH Engine
+
+Run ``python -m bshengine.loadgen --help``. With ``--stub`` the load goes to
+a local :class:`~bshengine.testing.StubServer`, for CI smoke tests::
+
+    python -m bshengine.loadgen --host https://engine.example.com --api-key KEY \\
+        --entity Orders --mix search=70,find_by_id=25,create_many=5 --rps 200 --duration 60
+    python -m bshengine.loadgen --stub --requests 200 --max-error-rate 0
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from typing import Optional, Any, Dict, List, Set
+
+from .bshengine import BshEngine
+from .executor import BshExecutor
+from .observability.metrics import HdrHistogram
+from .types.bulk import LoadReport
+from .types.response import BshError
+
+# Operation name -> EntityService api suffix
+OPERATIONS = {
+    "search": "search",
+    "find_by_id": "findById",
+    "create_many": "createMany",
+    "export": "export",
+}
+DEFAULT_MIX = "search=70,find_by_id=20,create_many=8,export=2"
+MAX_IDS = 10000
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse ``search=70,find_by_id=30`` into operation weights"""
+    mix: Dict[str, float] = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}, expected one of: {', '.join(OPERATIONS)}")
+        mix[name] = float(weight) if weight else 1.0
+        if mix[name] < 0:
+            raise ValueError(f"Weight of {name} must not be negative")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one positive weight")
+    return mix
+
+
+class LoadGenerator:
+    """Drive a weighted mix of ``EntityService`` operations on one entity
+
+    Closed loop (default): ``concurrency`` workers each start their next
+    call as soon as the previous one returns. Open loop (``rps``): calls
+    start on a fixed schedule whatever the response times, and latency is
+    measured from the scheduled start, so time spent queued behind a slow
+    server is counted instead of hidden (no coordinated omission).
+
+    The SDK calls are blocking; they run on a ``BshExecutor`` pool of
+    ``concurrency`` threads through ``run_in_executor``. ``search`` sends the
+    ``search`` dict with page 1 of ``page_size`` rows, ``find_by_id`` picks an
+    id seen in earlier responses, ``create_many`` writes ``batch_size`` copies
+    of ``row`` and ``export`` downloads ``search`` as CSV. The run stops after
+    ``requests`` calls or ``duration`` seconds (10 if neither is given).
+    """
+
+    def __init__(
+        self,
+        engine: BshEngine,
+        entity: str,
+        mix: Optional[Dict[str, float]] = None,
+        concurrency: int = 8,
+        rps: Optional[float] = None,
+        duration: Optional[float] = None,
+        requests: Optional[int] = None,
+        page_size: int = 50,
+        batch_size: int = 10,
+        row: Optional[Dict[str, Any]] = None,
+        search: Optional[Dict[str, Any]] = None,
+        id_field: str = "id",
+        seed: Optional[int] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if rps is not None and rps <= 0:
+            raise ValueError("rps must be positive")
+        self.service = engine.entity(entity)
+        self.mix = mix or parse_mix(DEFAULT_MIX)
+        self.apis = {name: f"entities.{entity}.{OPERATIONS[name]}" for name in self.mix}
+        self.concurrency = concurrency
+        self.rps = rps
+        self.duration = 10.0 if duration is None and requests is None else duration
+        self.requests = requests
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.row = row or {"name": "loadgen"}
+        self.search = search or {}
+        self.id_field = id_field
+        self.ids: List[Any] = []
+        self._known: Set[Any] = set()
+        self._random = random.Random(seed)
+        self._sequence = itertools.count()
+        self._issued = 0
+        self._pending: Set[asyncio.Future] = set()
+
+    def _remember(self, response: Any) -> None:
+        if len(self.ids) >= MAX_IDS:
+            return
+        for row in getattr(response, "data", None) or []:
+            id = row.get(self.id_field) if isinstance(row, dict) else None
+            if id is not None and id not in self._known:
+                self._known.add(id)
+                self.ids.append(id)
+
+    def call(self, operation: str) -> Any:
+        """Run one ``operation`` (blocking) and return its response"""
+        service = self.service
+        if operation == "search":
+            response = service.search({**self.search, "pagination": {"page": 1, "size": self.page_size}})
+        elif operation == "find_by_id":
+            if not self.ids:
+                raise ValueError(f"find_by_id needs existing rows with a {self.id_field!r} field")
+            response = service.find_by_id(str(self._random.choice(self.ids)))
+        elif operation == "create_many":
+            response = service.create_many(
+                [{**self.row, "loadgenSeq": next(self._sequence)} for _ in range(self.batch_size)]
+            )
+        else:
+            blobs: List[bytes] = []
+            service.export(self.search, format="csv", on_download=blobs.append)
+            return blobs[0] if blobs else None
+        self._remember(response)
+        return response
+
+    def _choose(self) -> str:
+        names = list(self.mix)
+        return self._random.choices(names, [self.mix[name] for name in names])[0]
+
+    def _more(self, start: float) -> bool:
+        if self.requests is not None and self._issued >= self.requests:
+            return False
+        return self.duration is None or time.perf_counter() - start < self.duration
+
+    async def _measure(self, report: LoadReport, pool: Any, operation: str, started: float) -> None:
+        api = self.apis[operation]
+        try:
+            await asyncio.get_running_loop().run_in_executor(pool, self.call, operation)
+        except Exception as error:
+            reason = str(error.status) if isinstance(error, BshError) else type(error).__name__
+            errors = report.errors.setdefault(api, {})
+            errors[reason] = errors.get(reason, 0) + 1
+        finally:
+            report.latencies[api].record(time.perf_counter() - started)
+
+    async def _closed_loop(self, report: LoadReport, pool: Any, start: float) -> None:
+        async def worker() -> None:
+            while self._more(start):
+                self._issued += 1
+                await self._measure(report, pool, self._choose(), time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def _open_loop(self, report: LoadReport, pool: Any, start: float) -> None:
+        # Only calls still in flight are kept, so long runs do not hold every task
+        pending = self._pending = set()
+        while self._more(start):
+            scheduled = start + self._issued / self.rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._issued += 1
+            task = asyncio.ensure_future(self._measure(report, pool, self._choose(), scheduled))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await asyncio.gather(*pending)
+
+    async def arun(self) -> LoadReport:
+        """Run the load test on the running event loop"""
+        report = LoadReport(latencies={api: HdrHistogram() for api in self.apis.values()})
+        with BshExecutor(max_workers=self.concurrency, concurrency=self.concurrency) as executor:
+            loop = asyncio.get_running_loop()
+            if "find_by_id" in self.mix and not self.ids:
+                # Warm up the id pool with one search; its errors abort the run
+                await loop.run_in_executor(executor.pool, self.call, "search")
+                if not self.ids:
+                    raise ValueError(f"find_by_id needs existing rows with a {self.id_field!r} field")
+            self._issued = 0
+            start = time.perf_counter()
+            if self.rps:
+                await self._open_loop(report, executor.pool, start)
+            else:
+                await self._closed_loop(report, executor.pool, start)
+            report.elapsed = time.perf_counter() - start
+        return report
+
+    def run(self) -> LoadReport:
+        """Run the load test in a new event loop"""
+        return asyncio.run(self.arun())
+
+
+def format_report(report: LoadReport) -> str:
+    """Render ``report`` as a plain-text table"""
+    summary = report.summary()
+    columns = ["api", "requests", "rps", "p50 ms", "p90 ms", "p99 ms", "p99.9 ms", "errors"]
+    lines = []
+    for api, stats in summary["apis"].items():
+        latency = stats["latency_ms"]
+        errors = ", ".join(f"{reason}: {count}" for reason, count in sorted(stats["errors"].items())) or "-"
+        lines.append([
+            api, str(stats["requests"]), f"{stats['per_second']:g}",
+            *(f"{latency[p]:g}" if latency else "-" for p in ("p50", "p90", "p99", "p99.9")),
+            errors,
+        ])
+    widths = [max(len(row[i]) for row in [columns] + lines) for i in range(len(columns))]
+    table = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in [columns] + lines]
+    table.append(
+        f"total: {summary['requests']} requests in {summary['elapsed']}s "
+        f"({summary['per_second']:g}/s), {summary['failed']} failed"
+    )
+    return "\n".join(table)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m bshengine.loadgen",
+        description="Capacity-test BSH Engine with a mix of entity operations",
+    )
+    target = parser.add_argument_group("target")
+    target.add_argument("--host", help="BSH Engine base URL")
+    target.add_argument("--api-key", help="API key")
+    target.add_argument("--token", help="JWT access token")
+    target.add_argument("--entity", default="LoadTest", help="entity to load (default: LoadTest)")
+    target.add_argument("--stub", action="store_true", help="start a local stub server and target it")
+    target.add_argument("--stub-rows", type=int, default=1000, help="rows seeded in the stub entity")
+    target.add_argument("--stub-latency", type=float, default=0.0, help="stub latency per request, seconds")
+    target.add_argument("--stub-error-rate", type=float, default=0.0, help="fraction of stub requests failing")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default: {DEFAULT_MIX})")
+    load.add_argument("--concurrency", type=int, default=8, help="workers, or max calls in flight with --rps")
+    load.add_argument("--rps", type=float, help="open loop at this many requests per second")
+    load.add_argument("--duration", type=float, help="seconds to run (default: 10 unless --requests)")
+    load.add_argument("--requests", type=int, help="number of calls to make")
+    load.add_argument("--page-size", type=int, default=50, help="rows per search")
+    load.add_argument("--batch-size", type=int, default=10, help="rows per create_many")
+    load.add_argument("--row", type=json.loads, help="JSON row template for create_many")
+    load.add_argument("--search", type=json.loads, help="JSON search body for search and export")
+    load.add_argument("--seed", type=int, help="random seed for the operation mix")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--json", action="store_true", help="print the summary as JSON")
+    output.add_argument("--output", help="also write the JSON summary to this file")
+    output.add_argument("--max-error-rate", type=float, help="exit with status 1 above this error rate")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not args.stub and not args.host:
+        parser.error("--host is required unless --stub is given")
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    from .testing import HttpTransport, StubServer
+    server = None
+    host = args.host
+    if args.stub:
+        server = StubServer(latency=args.stub_latency, error_rate=args.stub_error_rate, seed=args.seed).start()
+        server.seed(args.entity, [{"name": f"row-{i}", "value": i} for i in range(args.stub_rows)])
+        host = server.url
+    try:
+        engine = BshEngine(host, HttpTransport(), api_key=args.api_key, jwt_token=args.token)
+        report = LoadGenerator(
+            engine,
+            args.entity,
+            mix=mix,
+            concurrency=args.concurrency,
+            rps=args.rps,
+            duration=args.duration,
+            requests=args.requests,
+            page_size=args.page_size,
+            batch_size=args.batch_size,
+            row=args.row,
+            search=args.search,
+            seed=args.seed,
+        ).run()
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if server is not None:
+            server.stop()
+
+    summary = report.summary()
+    print(json.dumps(summary, indent=2) if args.json else format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    if args.max_error_rate is not None and report.error_rate > args.max_error_rate:
+        print(f"Error rate {report.error_rate:.2%} is above {args.max_error_rate:.2%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Metrics and tracing for SDK requests"""
+from .metrics import (
+    Histogram,
+    HdrHistogram,
+    MetricsExporter,
+    MetricsRegistry,
+    StatsdExporter,
+)
+from .tracing import (
+    Span,
+    Tracer,
+    InMemoryTracer,
+    OpenTelemetryTracer,
+    NOOP_TRACER,
+)
+
+__all__ = [
+    "Histogram",
+    "HdrHistogram",
+    "MetricsExporter",
+    "MetricsRegistry",
+    "StatsdExporter",
+    "Span",
+    "Tracer",
+    "InMemoryTracer",
+    "OpenTelemetryTracer",
+    "NOOP_TRACER",
+]
@@ -0,0 +1,375 @@
+"""Per-request metrics with in-process, Prometheus and StatsD exporters"""
+import contextvars
+import json
+import math
+import re
+import socket
+import threading
+import time
+from bisect import bisect_left
+from typing import Optional, Any, Dict, Iterable, List, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PHASES = ("queue", "auth", "serialize", "transport", "parse")
+
+# perf_counter() at which the current unit of work was handed to an executor
+QUEUED_AT = contextvars.ContextVar("bsh_queued_at", default=None)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    """Bucketed distribution of observed values"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class HdrHistogram:
+    """Log-linear histogram keeping ``significant_digits`` of precision, in the manner of HdrHistogram
+
+    Values are recorded in seconds and stored as integer multiples of
+    ``unit`` (microseconds by default) in buckets whose width is at most
+    ``10 ** -significant_digits`` of their value, so percentiles are accurate
+    to that relative error over any range while memory stays small.
+    """
+
+    def __init__(self, significant_digits: int = 2, unit: float = 1e-6):
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        self.unit = unit
+        self._magnitude = math.ceil(math.log2(10 ** significant_digits))
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _key(self, value: int) -> Tuple[int, int]:
+        shift = max(0, value.bit_length() - self._magnitude - 1)
+        return shift, value >> shift
+
+    def record(self, seconds: float, count: int = 1) -> None:
+        key = self._key(max(0, int(seconds / self.unit)))
+        self._counts[key] = self._counts.get(key, 0) + count
+        self.count += count
+        self.sum += seconds * count
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def merge(self, other: "HdrHistogram") -> "HdrHistogram":
+        """Add the values of ``other``, which must use the same unit and precision"""
+        if (other.unit, other._magnitude) != (self.unit, self._magnitude):
+            raise ValueError("Cannot merge histograms with different unit or precision")
+        for key, count in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+        return self
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Highest value, in seconds, equivalent to the ``p``-th percentile (0-100)"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for shift, sub in sorted(self._counts):
+            seen += self._counts[(shift, sub)]
+            if seen >= rank:
+                return min(self.max, (((sub + 1) << shift) - 1) * self.unit)
+        return self.max
+
+
+class MetricsExporter:
+    """Receives every recorded value; subclasses push them elsewhere"""
+
+    def counter(self, name: str, labels: Labels, value: float) -> None:
+        pass
+
+    def gauge(self, name: str, labels: Labels, value: float) -> None:
+        pass
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        pass
+
+
+_STATSD_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class StatsdExporter(MetricsExporter):
+    """Send metrics as StatsD datagrams over UDP, fire and forget
+
+    Label values are appended to the metric name (``bsh.requests.entities.X.search.200``)
+    unless ``tags`` is set, in which case they are sent as DogStatsD tags.
+    Durations are sent as timers in milliseconds.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8125, prefix: str = "bsh", tags: bool = False):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.tags = tags
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+    def _name(self, name: str, labels: Labels) -> str:
+        name = name[4:] if name.startswith("bsh_") else name
+        name = f"{self.prefix}.{name}" if self.prefix else name
+        if self.tags:
+            return name
+        return ".".join([name] + [_STATSD_UNSAFE.sub("_", v) for _, v in labels])
+
+    def _send(self, name: str, labels: Labels, value: Any, kind: str) -> None:
+        line = f"{self._name(name, labels)}:{value}|{kind}"
+        if self.tags and labels:
+            line += "|#" + ",".join(f"{k}:{v}" for k, v in labels)
+        try:
+            self.socket.sendto(line.encode("utf-8"), self.address)
+        except OSError:
+            pass
+
+    def counter(self, name: str, labels: Labels, value: float) -> None:
+        self._send(name, labels, value, "c")
+
+    def gauge(self, name: str, labels: Labels, value: float) -> None:
+        self._send(name, labels, value, "g")
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        if name.endswith("_seconds"):
+            self._send(name, labels, round(value * 1000, 3), "ms")
+        else:
+            self._send(name, labels, value, "h")
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in labels]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class MetricsRegistry:
+    """In-process store of SDK metrics, optionally forwarded to exporters
+
+    Set it on the engine (``BshEngine(metrics=MetricsRegistry())``) and every
+    request records, per ``api`` name: ``bsh_requests_total`` by method and
+    status, ``bsh_request_duration_seconds`` by phase (queue: waiting in a
+    ``BshExecutor`` including rate limiting, auth, serialize, transport,
+    parse, and total), request and response sizes and
+    ``bsh_requests_in_flight``. Query cache lookups and retries (pass
+    :meth:`on_retry` to a ``RetryPolicy``) are counted too. Request sizes of
+    dict bodies serialized by the transport are only measured with
+    ``measure_json_bodies``, which serializes them a second time.
+    """
+
+    def __init__(
+        self,
+        exporters: Iterable[MetricsExporter] = (),
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+        measure_json_bodies: bool = False,
+    ):
+        self.exporters = list(exporters)
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.measure_json_bodies = measure_json_bodies
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        for exporter in self.exporters:
+            exporter.counter(name, key[1], value)
+
+    def add(self, name: str, delta: float, **labels: Any) -> None:
+        """Move a gauge by ``delta``"""
+        key = (name, _labels(labels))
+        with self._lock:
+            value = self._gauges[key] = self._gauges.get(key, 0) + delta
+        for exporter in self.exporters:
+            exporter.gauge(name, key[1], value)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                buckets = self.latency_buckets if name.endswith("_seconds") else self.size_buckets
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+        for exporter in self.exporters:
+            exporter.observe(name, key[1], value)
+
+    def counter(self, name: str, **labels: Any) -> float:
+        return self._counters.get((name, _labels(labels)), 0)
+
+    def gauge(self, name: str, **labels: Any) -> float:
+        return self._gauges.get((name, _labels(labels)), 0)
+
+    def histogram(self, name: str, **labels: Any) -> Optional[Histogram]:
+        return self._histograms.get((name, _labels(labels)))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def start(self, api: str, method: str) -> "RequestTimer":
+        """Begin timing one request"""
+        return RequestTimer(self, api, method)
+
+    def cache(self, api: str, hit: bool) -> None:
+        """Count a query cache lookup"""
+        self.inc("bsh_cache_hits_total" if hit else "bsh_cache_misses_total", api=api)
+
+    def on_retry(self, error: BaseException, attempt: int) -> None:
+        """``RetryPolicy.on_retry`` callback counting retries by status or error type"""
+        self.inc("bsh_retries_total", reason=getattr(error, "status", None) or type(error).__name__)
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Current values as plain data"""
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(self._counters.items())
+                ],
+                "gauges": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(self._gauges.items())],
+                "histograms": [
+                    {"name": n, "labels": dict(l), "count": h.count, "sum": h.sum,
+                     "p50": h.quantile(0.5), "p99": h.quantile(0.99)}
+                    for (n, l), h in sorted(self._histograms.items(), key=lambda item: item[0])
+                ],
+            }
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            for kind, values in (("counter", self._counters), ("gauge", self._gauges)):
+                typed = set()
+                for (name, labels), value in sorted(values.items()):
+                    if name not in typed:
+                        lines.append(f"# TYPE {name} {kind}")
+                        typed.add(name)
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            typed = set()
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:g}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def body_size(body: Any, measure_json: bool = False) -> Optional[int]:
+    """Size in bytes of a request body, if known without serializing it (unless ``measure_json``)"""
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if measure_json and isinstance(body, (dict, list)):
+        return len(json.dumps(body, default=str).encode("utf-8"))
+    return None
+
+
+class RequestTimer:
+    """Phase timings of one request
+
+    :meth:`mark` records the time since the previous mark as ``phase``; a
+    phase interrupted by an error is only part of the total.
+    """
+
+    __slots__ = ("registry", "api", "method", "start", "last")
+
+    def __init__(self, registry: MetricsRegistry, api: str, method: str):
+        self.registry = registry
+        self.api = api
+        self.method = method
+        self.start = self.last = time.perf_counter()
+        queued_at = QUEUED_AT.get()
+        if queued_at is not None:
+            # Only the first request of a queued unit of work waited in the queue
+            QUEUED_AT.set(None)
+            registry.observe("bsh_request_duration_seconds", self.start - queued_at, api=api, phase="queue")
+        registry.add("bsh_requests_in_flight", 1, api=api)
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.registry.observe("bsh_request_duration_seconds", now - self.last, api=self.api, phase=phase)
+        self.last = now
+
+    def finish(self, status: Any, body: Any = None, response: Any = None) -> None:
+        registry, api = self.registry, self.api
+        total = time.perf_counter() - self.start
+        registry.observe("bsh_request_duration_seconds", total, api=api, phase="total")
+        registry.inc("bsh_requests_total", api=api, method=self.method, status=status)
+        registry.add("bsh_requests_in_flight", -1, api=api)
+        sent = body_size(body, registry.measure_json_bodies)
+        if sent is not None:
+            registry.observe("bsh_request_size_bytes", sent, api=api)
+        content = getattr(response, "content", None)
+        if isinstance(content, (bytes, bytearray)):
+            registry.observe("bsh_response_size_bytes", len(content), api=api)
+
+
+class _NoopTimer:
+    """Stand-in timer used when metrics are disabled"""
+
+    __slots__ = ()
+
+    def mark(self, phase: str) -> None:
+        pass
+
+    def finish(self, status: Any, body: Any = None, response: Any = None) -> None:
+        pass
+
+
+NOOP_TIMER = _NoopTimer()
@@ -0,0 +1,172 @@
+"""Tracing spans around SDK calls, with W3C trace-context propagation"""
+import contextvars
+import os
+import time
+from collections import deque
+from typing import Optional, Any, Deque, Dict, List
+
+TRACEPARENT = "traceparent"
+
+
+class Span:
+    """A timed operation; usable as a context manager"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, error: BaseException) -> None:
+        pass
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+class Tracer:
+    """Creates spans; this base class is the disabled tracer
+
+    Every method returns preallocated objects and does nothing, so a
+    disabled tracer allocates nothing per call.
+    """
+
+    enabled = False
+
+    def span(self, name: str) -> Span:
+        """Start a child of the current span"""
+        return NOOP_SPAN
+
+    def inject(self, headers: Dict[str, str]) -> None:
+        """Add trace-context headers for the current span to ``headers``"""
+
+    def on_retry(self, error: BaseException, attempt: int) -> None:
+        """``RetryPolicy.on_retry`` callback recording a ``retry`` span"""
+        if not self.enabled:
+            return
+        with self.span("retry") as span:
+            span.set_attribute("retry.attempt", attempt)
+            span.record_exception(error)
+
+
+NOOP_SPAN = Span()
+NOOP_TRACER = Tracer()
+
+
+class SpanRecord(Span):
+    """Span kept in memory by :class:`InMemoryTracer`"""
+
+    def __init__(self, tracer: "InMemoryTracer", name: str, parent: Optional["SpanRecord"]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes: Dict[str, Any] = {}
+        self.error: Optional[BaseException] = None
+        self.start = self.end = 0.0
+        self._token: Any = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, error: BaseException) -> None:
+        self.error = error
+
+    def __enter__(self) -> "SpanRecord":
+        self.start = time.perf_counter()
+        self._token = _CURRENT.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.end = time.perf_counter()
+        if exc is not None:
+            self.error = exc
+        _CURRENT.reset(self._token)
+        self.tracer.spans.append(self)
+
+
+_CURRENT = contextvars.ContextVar("bsh_current_span", default=None)
+
+
+class InMemoryTracer(Tracer):
+    """Tracer keeping the last ``max_spans`` finished spans in :attr:`spans`
+
+    Useful in tests and to inspect slow calls without an OpenTelemetry
+    setup; spans propagate as W3C ``traceparent`` headers.
+    """
+
+    enabled = True
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans: Deque[SpanRecord] = deque(maxlen=max_spans)
+
+    def span(self, name: str) -> SpanRecord:
+        return SpanRecord(self, name, _CURRENT.get())
+
+    def inject(self, headers: Dict[str, str]) -> None:
+        current = _CURRENT.get()
+        if current is not None:
+            headers[TRACEPARENT] = current.traceparent
+
+    def find(self, name: str) -> List[SpanRecord]:
+        return [span for span in self.spans if span.name == name]
+
+    def children(self, parent: SpanRecord) -> List[SpanRecord]:
+        return [span for span in self.spans if span.parent_id == parent.span_id]
+
+
+class _OtelSpan(Span):
+    """Adapter making an OpenTelemetry span the current span while open"""
+
+    def __init__(self, manager: Any):
+        self._manager = manager
+        self._span: Any = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._span.set_attribute(key, value)
+
+    def record_exception(self, error: BaseException) -> None:
+        self._span.record_exception(error)
+
+    def __enter__(self) -> "_OtelSpan":
+        self._span = self._manager.__enter__()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self._manager.__exit__(exc_type, exc, tb)
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer reporting spans through the OpenTelemetry API
+
+    Uses ``tracer`` or the global tracer provider, and the globally
+    configured propagator (W3C trace context by default) for headers.
+    """
+
+    enabled = True
+
+    def __init__(self, tracer: Any = None, name: str = "bshengine"):
+        try:
+            from opentelemetry import propagate, trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry tracing requires the 'opentelemetry-api' package "
+                "(pip install \"bshengine-sdk[otel]\")"
+            ) from e
+        self._propagate = propagate
+        self._tracer = tracer or trace.get_tracer(name)
+
+    def span(self, name: str) -> Span:
+        return _OtelSpan(self._tracer.start_as_current_span(name))
+
+    def inject(self, headers: Dict[str, str]) -> None:
+        self._propagate.inject(headers)
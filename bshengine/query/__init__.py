@@ -0,0 +1,46 @@
+"""Query building and normalization"""
+from .aggregate import AggregateMerger, partial_group_by
+from .builder import F, QueryBuilder
+from .cache import QueryCache
+from .evaluator import (
+    FIRST_PAGE,
+    ColumnStore,
+    compile_filter,
+    compile_filters,
+    evaluate,
+    filter_rows,
+)
+from .index import HashIndex, SortedIndex, IndexedCollection
+from .sketch import HyperLogLog
+from .normalize import (
+    TRUE,
+    canonical_key,
+    filter_key,
+    normalize_filter,
+    normalize_filters,
+    normalize_search,
+)
+
+__all__ = [
+    "FIRST_PAGE",
+    "QueryCache",
+    "ColumnStore",
+    "compile_filter",
+    "compile_filters",
+    "evaluate",
+    "filter_rows",
+    "AggregateMerger",
+    "partial_group_by",
+    "HashIndex",
+    "SortedIndex",
+    "IndexedCollection",
+    "HyperLogLog",
+    "F",
+    "QueryBuilder",
+    "TRUE",
+    "canonical_key",
+    "filter_key",
+    "normalize_filter",
+    "normalize_filters",
+    "normalize_search",
+]
@@ -0,0 +1,98 @@
+"""Merging of partial aggregation results"""
+from typing import Optional, Any, Dict, Iterable, List, Tuple
+from ..types import Aggregate, AggregateResult, GroupBy
+from .evaluator import aggregate_alias
+
+Row = Dict[str, Any]
+
+
+def _name(agg: Aggregate) -> str:
+    return agg.alias or aggregate_alias(agg.function or "", agg.field)
+
+
+def partial_group_by(group_by: GroupBy) -> GroupBy:
+    """Rewrite ``group_by`` into aggregates whose partial results can be merged
+
+    SUM, COUNT, MIN and MAX are kept; AVG is replaced by the SUM and COUNT of
+    its field, so the average can be computed once every partial is merged.
+    """
+    partials: List[Aggregate] = []
+    for agg in group_by.aggregate or []:
+        name = _name(agg)
+        function = (agg.function or "").upper()
+        if function == "AVG":
+            partials.append(Aggregate(function="SUM", field=agg.field, alias=f"{name}__sum"))
+            partials.append(Aggregate(function="COUNT", field=agg.field, alias=f"{name}__count"))
+        elif function in ("SUM", "COUNT", "MIN", "MAX"):
+            partials.append(Aggregate(function=function, field=agg.field, alias=name))
+        else:
+            raise ValueError(f"Unsupported aggregate function: {agg.function}")
+    return GroupBy(fields=list(group_by.fields or []), aggregate=partials)
+
+
+def _add(a: Any, b: Any) -> Any:
+    if a is None:
+        return b
+    return a if b is None else a + b
+
+
+def _pick(a: Any, b: Any, smallest: bool) -> Any:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b) if smallest else max(a, b)
+
+
+class AggregateMerger:
+    """Combine partial results of :func:`partial_group_by` aggregations by group"""
+
+    def __init__(self, group_by: GroupBy):
+        self.fields = list(group_by.fields or [])
+        self.aggregates = list(group_by.aggregate or [])
+        self.partials = partial_group_by(group_by).aggregate or []
+        self._groups: Dict[Tuple[Any, ...], Row] = {}
+
+    def _key(self, row: Row) -> Tuple[Any, ...]:
+        key = tuple(row.get(field) for field in self.fields)
+        try:
+            hash(key)
+        except TypeError:
+            key = tuple(repr(k) for k in key)
+        return key
+
+    def add(self, rows: Iterable[Row]) -> "AggregateMerger":
+        """Merge one batch of partial rows (a page or a partition)"""
+        for row in rows:
+            key = self._key(row)
+            group = self._groups.get(key)
+            if group is None:
+                self._groups[key] = dict(row)
+                continue
+            for agg in self.partials:
+                name = agg.alias
+                if agg.function in ("SUM", "COUNT"):
+                    group[name] = _add(group.get(name), row.get(name))
+                else:
+                    group[name] = _pick(group.get(name), row.get(name), agg.function == "MIN")
+        return self
+
+    def result(self) -> AggregateResult:
+        """Final values as columns: group fields first, then aggregates in order"""
+        groups = list(self._groups.values())
+        if not self.fields and not groups:
+            groups = [{}]
+        columns: Dict[str, List[Any]] = {field: [g.get(field) for g in groups] for field in self.fields}
+        for agg in self.aggregates:
+            name = _name(agg)
+            if (agg.function or "").upper() == "AVG":
+                columns[name] = [_average(g.get(f"{name}__sum"), g.get(f"{name}__count")) for g in groups]
+            elif (agg.function or "").upper() == "COUNT":
+                columns[name] = [g.get(name) or 0 for g in groups]
+            else:
+                columns[name] = [g.get(name) for g in groups]
+        return AggregateResult(columns=columns)
+
+
+def _average(total: Optional[Any], count: Optional[Any]) -> Optional[float]:
+    return total / count if total is not None and count else None
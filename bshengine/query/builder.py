@@ -0,0 +1,238 @@
+"""Fluent builder for BshSearch queries"""
+from typing import Optional, Any, List, Union
+from ..types.search import (
+    BshSearch,
+    Filter,
+    GroupBy,
+    Aggregate,
+    Sort,
+    Pagination,
+    ComparisonOperator,
+)
+from .normalize import normalize_search
+
+
+class F:
+    """Shortcuts for building :class:`Filter` trees
+
+    ``F.eq("status", "open")``, ``F.or_(F.lt("age", 18), F.gt("age", 65))``.
+    """
+
+    @staticmethod
+    def where(
+        field: str,
+        operator: ComparisonOperator,
+        value: Any = None,
+        type: Optional[str] = None,
+    ) -> Filter:
+        return Filter(operator=operator, field=field, value=value, type=type)
+
+    @staticmethod
+    def eq(field: str, value: Any) -> Filter:
+        return Filter(operator="eq", field=field, value=value)
+
+    @staticmethod
+    def ne(field: str, value: Any) -> Filter:
+        return Filter(operator="ne", field=field, value=value)
+
+    @staticmethod
+    def gt(field: str, value: Any) -> Filter:
+        return Filter(operator="gt", field=field, value=value)
+
+    @staticmethod
+    def gte(field: str, value: Any) -> Filter:
+        return Filter(operator="gte", field=field, value=value)
+
+    @staticmethod
+    def lt(field: str, value: Any) -> Filter:
+        return Filter(operator="lt", field=field, value=value)
+
+    @staticmethod
+    def lte(field: str, value: Any) -> Filter:
+        return Filter(operator="lte", field=field, value=value)
+
+    @staticmethod
+    def between(field: str, low: Any, high: Any) -> Filter:
+        return Filter(operator="between", field=field, value=[low, high])
+
+    @staticmethod
+    def in_(field: str, values: List[Any]) -> Filter:
+        return Filter(operator="in", field=field, value=list(values))
+
+    @staticmethod
+    def nin(field: str, values: List[Any]) -> Filter:
+        return Filter(operator="nin", field=field, value=list(values))
+
+    @staticmethod
+    def like(field: str, pattern: str) -> Filter:
+        return Filter(operator="like", field=field, value=pattern)
+
+    @staticmethod
+    def ilike(field: str, pattern: str) -> Filter:
+        return Filter(operator="ilike", field=field, value=pattern)
+
+    @staticmethod
+    def contains(field: str, value: str) -> Filter:
+        return Filter(operator="contains", field=field, value=value)
+
+    @staticmethod
+    def starts(field: str, prefix: str) -> Filter:
+        return Filter(operator="starts", field=field, value=prefix)
+
+    @staticmethod
+    def is_null(field: str) -> Filter:
+        return Filter(operator="isnull", field=field)
+
+    @staticmethod
+    def not_null(field: str) -> Filter:
+        return Filter(operator="notnull", field=field)
+
+    @staticmethod
+    def and_(*filters: Filter) -> Filter:
+        return Filter(operator="and", filters=list(filters))
+
+    @staticmethod
+    def or_(*filters: Filter) -> Filter:
+        return Filter(operator="or", filters=list(filters))
+
+
+class QueryBuilder:
+    """Fluent builder producing a normalized :class:`BshSearch`
+
+    Every ``where``/shortcut call adds a predicate combined with AND::
+
+        search = (
+            QueryBuilder("Orders")
+            .eq("status", "open")
+            .gte("total", 100)
+            .lte("total", 500)
+            .any(F.eq("channel", "web"), F.eq("channel", "app"))
+            .sort("createdAt", -1)
+            .page(1, 50)
+            .build()
+        )
+    """
+
+    def __init__(self, entity: Optional[str] = None):
+        self._entity = entity
+        self._alias: Optional[str] = None
+        self._fields: Optional[Union[str, List[str]]] = None
+        self._filters: List[Filter] = []
+        self._group_by: Optional[GroupBy] = None
+        self._sort: List[Sort] = []
+        self._pagination: Optional[Pagination] = None
+        self._from: Optional[BshSearch] = None
+
+    def alias(self, alias: str) -> "QueryBuilder":
+        self._alias = alias
+        return self
+
+    def select(self, *fields: str) -> "QueryBuilder":
+        self._fields = list(fields)
+        return self
+
+    def from_(self, search: Union[BshSearch, "QueryBuilder"]) -> "QueryBuilder":
+        self._from = search.build() if isinstance(search, QueryBuilder) else search
+        return self
+
+    def filter(self, *filters: Filter) -> "QueryBuilder":
+        """Add raw filters"""
+        self._filters.extend(filters)
+        return self
+
+    def where(
+        self,
+        field: str,
+        operator: ComparisonOperator,
+        value: Any = None,
+        type: Optional[str] = None,
+    ) -> "QueryBuilder":
+        return self.filter(F.where(field, operator, value, type))
+
+    def eq(self, field: str, value: Any) -> "QueryBuilder":
+        return self.filter(F.eq(field, value))
+
+    def ne(self, field: str, value: Any) -> "QueryBuilder":
+        return self.filter(F.ne(field, value))
+
+    def gt(self, field: str, value: Any) -> "QueryBuilder":
+        return self.filter(F.gt(field, value))
+
+    def gte(self, field: str, value: Any) -> "QueryBuilder":
+        return self.filter(F.gte(field, value))
+
+    def lt(self, field: str, value: Any) -> "QueryBuilder":
+        return self.filter(F.lt(field, value))
+
+    def lte(self, field: str, value: Any) -> "QueryBuilder":
+        return self.filter(F.lte(field, value))
+
+    def between(self, field: str, low: Any, high: Any) -> "QueryBuilder":
+        return self.filter(F.between(field, low, high))
+
+    def in_(self, field: str, values: List[Any]) -> "QueryBuilder":
+        return self.filter(F.in_(field, values))
+
+    def nin(self, field: str, values: List[Any]) -> "QueryBuilder":
+        return self.filter(F.nin(field, values))
+
+    def like(self, field: str, pattern: str) -> "QueryBuilder":
+        return self.filter(F.like(field, pattern))
+
+    def ilike(self, field: str, pattern: str) -> "QueryBuilder":
+        return self.filter(F.ilike(field, pattern))
+
+    def contains(self, field: str, value: str) -> "QueryBuilder":
+        return self.filter(F.contains(field, value))
+
+    def starts(self, field: str, prefix: str) -> "QueryBuilder":
+        return self.filter(F.starts(field, prefix))
+
+    def is_null(self, field: str) -> "QueryBuilder":
+        return self.filter(F.is_null(field))
+
+    def not_null(self, field: str) -> "QueryBuilder":
+        return self.filter(F.not_null(field))
+
+    def any(self, *filters: Filter) -> "QueryBuilder":
+        """Add an OR group"""
+        return self.filter(F.or_(*filters))
+
+    def all(self, *filters: Filter) -> "QueryBuilder":
+        """Add an AND group"""
+        return self.filter(F.and_(*filters))
+
+    def sort(self, field: str, direction: int = 1) -> "QueryBuilder":
+        self._sort.append(Sort(field=field, direction=direction))
+        return self
+
+    def page(self, page: int, size: int) -> "QueryBuilder":
+        self._pagination = Pagination(page=page, size=size)
+        return self
+
+    def group_by(self, *fields: str) -> "QueryBuilder":
+        aggregate = self._group_by.aggregate if self._group_by else None
+        self._group_by = GroupBy(fields=list(fields), aggregate=aggregate)
+        return self
+
+    def aggregate(self, function: str, field: str, alias: Optional[str] = None) -> "QueryBuilder":
+        if self._group_by is None:
+            self._group_by = GroupBy()
+        self._group_by.aggregate = (self._group_by.aggregate or []) + [
+            Aggregate(function=function.upper(), field=field, alias=alias)
+        ]
+        return self
+
+    def build(self, normalize: bool = True) -> BshSearch:
+        """Build the search, normalizing its filter tree unless told otherwise"""
+        search = BshSearch(
+            entity=self._entity,
+            alias=self._alias,
+            fields=self._fields,
+            filters=list(self._filters) or None,
+            group_by=self._group_by,
+            sort=list(self._sort) or None,
+            pagination=self._pagination,
+            from_=self._from,
+        )
+        return normalize_search(search) if normalize else search
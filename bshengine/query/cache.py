@@ -0,0 +1,217 @@
+"""Semantic cache for entity search results"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Optional, Any, Callable, Dict, Iterable, List, Set, Tuple, Union
+from ..types import BshResponse, BshSearch, is_ok
+from .evaluator import FIRST_PAGE, evaluate
+from .normalize import canonical_key, filter_key, normalize_search
+
+
+@dataclass
+class _Entry:
+    entity: str
+    search: BshSearch
+    response: BshResponse
+    expires_at: float
+    complete: bool
+
+
+def _fields(fields: Optional[Union[str, List[str]]]) -> Optional[Set[str]]:
+    """Projected field names, or None when every field is returned"""
+    if not fields:
+        return None
+    names = {f.strip() for f in fields.split(",")} if isinstance(fields, str) else set(fields)
+    return None if "*" in names else names
+
+
+def _filter_fields(filters: Any) -> Set[str]:
+    names: Set[str] = set()
+    for f in filters or []:
+        if f.field:
+            names.add(f.field)
+        names |= _filter_fields(f.filters)
+    return names
+
+
+def _needed_fields(search: BshSearch) -> Optional[Set[str]]:
+    """Fields a search reads, or None if it returns every field"""
+    projected = _fields(search.fields)
+    if projected is None and search.group_by is None:
+        return None
+    names = set(projected or ())
+    names |= _filter_fields(search.filters)
+    names |= {s.field for s in search.sort or [] if s.field}
+    if search.group_by:
+        names |= set(search.group_by.fields or [])
+        names |= {a.field for a in search.group_by.aggregate or [] if a.field and a.field != "*"}
+    return names
+
+
+def _copy(response: BshResponse) -> BshResponse:
+    return replace(response, data=list(response.data))
+
+
+class QueryCache:
+    """Cache of search responses keyed by the canonical form of the search
+
+    Besides exact hits, a search is answered locally when a cached *complete*
+    result (a first page holding the reported total, or shorter than its
+    size) for the same entity has a subset of its filters: the cached rows are re-filtered,
+    grouped, sorted and paginated with the local evaluator. Entries expire
+    after ``ttl`` seconds (overridable per entity) and all entries of an
+    entity are dropped by :meth:`invalidate`, which ``EntityService`` calls
+    after every write.
+
+    Single records fetched by key (``EntityService.find_by_ids``) are kept
+    separately by :meth:`put_records` under the same TTL and invalidation.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        max_entries: int = 1024,
+        ttl_by_entity: Optional[Dict[str, float]] = None,
+        subsumption: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.ttl_by_entity = dict(ttl_by_entity or {})
+        self.subsumption = subsumption
+        self.clock = clock
+        self.hits = 0
+        self.subsumed = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._complete: Dict[str, Dict[str, _Entry]] = {}
+        self._records: Dict[Tuple[str, str], Dict[Any, Tuple[Dict[str, Any], float]]] = {}
+        self._lock = threading.RLock()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry and entry.complete:
+            self._complete.get(entry.entity, {}).pop(key, None)
+
+    def get(self, entity: str, search: BshSearch) -> Optional[BshResponse]:
+        """Return a cached or locally derived response, or None on a miss"""
+        key = canonical_key(search, entity)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(entry.response)
+            if entry:
+                self._remove(key)
+            if self.subsumption:
+                derived = self._derive(entity, search, now)
+                if derived is not None:
+                    self.subsumed += 1
+                    return derived
+            self.misses += 1
+        return None
+
+    def _derive(self, entity: str, search: BshSearch, now: float) -> Optional[BshResponse]:
+        if search.from_ is not None:
+            return None
+        normalized = normalize_search(search)
+        wanted = {filter_key(f) for f in normalized.filters or []}
+        needed = _needed_fields(normalized)
+        for key, entry in list(self._complete.get(entity, {}).items()):
+            if entry.expires_at <= now:
+                self._remove(key)
+                continue
+            cached_fields = _fields(entry.search.fields)
+            if cached_fields is not None and (needed is None or not needed <= cached_fields):
+                continue
+            if not {filter_key(f) for f in entry.search.filters or []} <= wanted:
+                continue
+            rows = evaluate(normalized, entry.response.data)
+            return replace(entry.response, data=rows, pagination=None)
+        return None
+
+    @staticmethod
+    def _is_complete(search: BshSearch, response: BshResponse) -> bool:
+        """Whether ``response`` holds every row matching ``search``
+
+        Decided from the response: its pagination total when the server
+        reports one, otherwise an explicit first page shorter than its size.
+        An unpaginated search is not assumed complete, since the server may
+        apply a default page size.
+        """
+        if search.group_by is not None or search.from_ is not None:
+            return False
+        pagination = search.pagination
+        page = pagination.page if pagination and pagination.page is not None else FIRST_PAGE
+        if page != FIRST_PAGE:
+            return False
+        total = (response.pagination or {}).get("total")
+        if isinstance(total, int):
+            return len(response.data) >= total
+        return bool(pagination and pagination.size) and len(response.data) < pagination.size
+
+    def put(self, entity: str, search: BshSearch, response: Optional[BshResponse]) -> None:
+        """Store a successful response for ``search``"""
+        if response is None or not is_ok(response):
+            return
+        key = canonical_key(search, entity)
+        normalized = normalize_search(search)
+        complete = self._is_complete(normalized, response)
+        ttl = self.ttl_by_entity.get(entity, self.ttl)
+        entry = _Entry(entity, normalized, _copy(response), self.clock() + ttl, complete)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            if complete:
+                self._complete.setdefault(entity, {})[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def get_records(self, entity: str, key: str, ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Return the cached records of ``entity`` among ``ids``, by id"""
+        now = self.clock()
+        found: Dict[Any, Dict[str, Any]] = {}
+        with self._lock:
+            records = self._records.get((entity, key), {})
+            for id in ids:
+                cached = records.get(id)
+                if cached is None:
+                    continue
+                if cached[1] <= now:
+                    del records[id]
+                    continue
+                found[id] = cached[0]
+            self.hits += len(found)
+        return found
+
+    def put_records(self, entity: str, key: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Store records of ``entity`` by their ``key`` field"""
+        expires_at = self.clock() + self.ttl_by_entity.get(entity, self.ttl)
+        with self._lock:
+            records = self._records.setdefault((entity, key), {})
+            for row in rows:
+                id = row.get(key)
+                if id is not None:
+                    records[id] = (row, expires_at)
+            while len(records) > self.max_entries:
+                del records[next(iter(records))]
+
+    def invalidate(self, entity: Optional[str] = None) -> None:
+        """Drop cached results of ``entity``, or of every entity"""
+        with self._lock:
+            if entity is None:
+                self._entries.clear()
+                self._complete.clear()
+                self._records.clear()
+                return
+            for records_key in [k for k in self._records if k[0] == entity]:
+                del self._records[records_key]
+            for key in [k for k, e in self._entries.items() if e.entity == entity]:
+                self._remove(key)
+            self._complete.pop(entity, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
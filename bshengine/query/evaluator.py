@@ -0,0 +1,397 @@
+"""Local evaluation of BshSearch queries over in-memory records"""
+import re
+from datetime import date, datetime
+from functools import cmp_to_key
+from typing import Optional, Any, Callable, Dict, Iterable, List, Sequence, Tuple, Union
+from ..types.search import BshSearch, Filter, GroupBy, Sort, Pagination
+
+FIRST_PAGE = 1
+
+Row = Dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+_MISSING = object()
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def get_field(row: Row, field: str) -> Any:
+    """Read ``field`` from ``row``, following dots into nested dicts"""
+    value = row.get(field, _MISSING)
+    if value is not _MISSING:
+        return value
+    if "." not in field:
+        return None
+    value = row
+    for part in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _parse_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        text = value[:-1] + "+00:00" if value.endswith("Z") else value
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            return value
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+def _coercer(type_: Optional[str]) -> Callable[[Any], Any]:
+    kind = (type_ or "").lower()
+    if kind in ("number", "numeric", "int", "integer", "long", "float", "double", "decimal"):
+        def to_number(value: Any) -> Any:
+            try:
+                return float(value) if value is not None else None
+            except (TypeError, ValueError):
+                return value
+        return to_number
+    if kind in ("date", "datetime", "timestamp"):
+        return _parse_datetime
+    return lambda value: value
+
+
+def _like_regex(pattern: str, ignore_case: bool) -> "re.Pattern":
+    parts = []
+    for char in str(pattern):
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts) + r"\Z", re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+
+
+def _safe(compare: Callable[[Any], bool]) -> Callable[[Any], bool]:
+    """SQL semantics: NULL or incomparable values never match"""
+    def check(value: Any) -> bool:
+        if value is None:
+            return False
+        try:
+            return bool(compare(value))
+        except TypeError:
+            return False
+    return check
+
+
+def value_predicate(operator: str, value: Any, type_: Optional[str] = None) -> Callable[[Any], bool]:
+    """Return a test for a single field value under a comparison operator"""
+    op = operator.lower()
+    coerce = _coercer(type_)
+    if op == "isnull":
+        return lambda v: v is None
+    if op == "notnull":
+        return lambda v: v is not None
+    if op in ("in", "nin"):
+        values = [coerce(v) for v in (value if isinstance(value, (list, tuple, set)) else [value])]
+        try:
+            lookup: Any = set(values)
+        except TypeError:
+            lookup = values
+        if op == "in":
+            return _safe(lambda v: coerce(v) in lookup)
+        return _safe(lambda v: coerce(v) not in lookup)
+    if op == "between":
+        low, high = (coerce(v) for v in value)
+        return _safe(lambda v: low <= coerce(v) <= high)
+    if op in ("like", "ilike"):
+        regex = _like_regex(value, op == "ilike")
+        return _safe(lambda v: regex.match(str(v)) is not None)
+    if op in ("contains", "icontains", "starts", "istarts"):
+        needle = str(value)
+        if op.startswith("i"):
+            needle = needle.lower()
+            if op == "icontains":
+                return _safe(lambda v: needle in str(v).lower())
+            return _safe(lambda v: str(v).lower().startswith(needle))
+        if op == "contains":
+            return _safe(lambda v: needle in str(v))
+        return _safe(lambda v: str(v).startswith(needle))
+
+    target = coerce(value)
+    if op == "eq":
+        return _safe(lambda v: coerce(v) == target)
+    if op == "ne":
+        return _safe(lambda v: coerce(v) != target)
+    if op == "gt":
+        return _safe(lambda v: coerce(v) > target)
+    if op == "gte":
+        return _safe(lambda v: coerce(v) >= target)
+    if op == "lt":
+        return _safe(lambda v: coerce(v) < target)
+    if op == "lte":
+        return _safe(lambda v: coerce(v) <= target)
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def compile_filter(f: Filter) -> Predicate:
+    """Compile a filter tree into a row predicate"""
+    op = (f.operator or "").lower()
+    if op in ("and", "or") or (f.filters and not f.field):
+        children = [compile_filter(sub) for sub in f.filters or []]
+        if op == "or" and children:
+            return lambda row: any(child(row) for child in children)
+        return lambda row: all(child(row) for child in children)
+    test = value_predicate(op or "eq", f.value, f.type)
+    field = f.field
+    return lambda row: test(get_field(row, field))
+
+
+def compile_filters(filters: Optional[List[Filter]]) -> Predicate:
+    """Compile a top-level filter list (combined with AND)"""
+    return compile_filter(Filter(operator="and", filters=list(filters or [])))
+
+
+def _compare_nullable(a: Any, b: Any) -> int:
+    if a is None and b is None:
+        return 0
+    if a is None:
+        return 1
+    if b is None:
+        return -1
+    try:
+        return (a > b) - (a < b)
+    except TypeError:
+        return (str(a) > str(b)) - (str(a) < str(b))
+
+
+def sort_rows(rows: List[Row], sort: Optional[List[Sort]]) -> List[Row]:
+    """Stable multi-key sort; NULLs last ascending and first descending"""
+    if not sort:
+        return list(rows)
+    keys = [(s.field, -1 if s.direction == -1 else 1) for s in sort]
+
+    def compare(a: Row, b: Row) -> int:
+        for field, direction in keys:
+            result = _compare_nullable(get_field(a, field), get_field(b, field))
+            if result:
+                return result * direction
+        return 0
+
+    return sorted(rows, key=cmp_to_key(compare))
+
+
+def paginate(rows: List[Row], pagination: Optional[Pagination]) -> List[Row]:
+    """Return the requested page (pages start at :data:`FIRST_PAGE`)"""
+    if not pagination or not pagination.size:
+        return rows
+    page = pagination.page if pagination.page is not None else FIRST_PAGE
+    start = max(0, page - FIRST_PAGE) * pagination.size
+    return rows[start:start + pagination.size]
+
+
+def project(rows: List[Row], fields: Optional[Union[str, List[str]]]) -> List[Row]:
+    """Keep only ``fields`` of each row"""
+    if not fields:
+        return rows
+    names = [f.strip() for f in fields.split(",")] if isinstance(fields, str) else list(fields)
+    if "*" in names:
+        return rows
+    return [{name: get_field(row, name) for name in names} for row in rows]
+
+
+def aggregate_alias(function: str, field: Optional[str]) -> str:
+    """Default output column for an aggregate without alias"""
+    return f"{function.lower()}_{field or 'all'}"
+
+
+def _aggregate(function: str, values: List[Any], row_count: int, field: Optional[str]) -> Any:
+    fn = function.upper()
+    if fn == "COUNT":
+        return row_count if not field or field == "*" else len(values)
+    if not values:
+        return None
+    if fn == "SUM":
+        return sum(values)
+    if fn == "AVG":
+        return sum(values) / len(values)
+    if fn == "MIN":
+        return min(values)
+    if fn == "MAX":
+        return max(values)
+    raise ValueError(f"Unsupported aggregate function: {function}")
+
+
+def group_rows(rows: List[Row], group_by: GroupBy) -> List[Row]:
+    """Group rows and compute aggregates (NULL values are ignored)"""
+    fields = group_by.fields or []
+    groups: Dict[Tuple[Any, ...], List[Row]] = {}
+    for row in rows:
+        key = tuple(get_field(row, field) for field in fields)
+        try:
+            groups.setdefault(key, []).append(row)
+        except TypeError:
+            groups.setdefault(tuple(repr(k) for k in key), []).append(row)
+    if not fields and not groups:
+        groups[()] = []
+
+    result = []
+    for key, members in groups.items():
+        out = {field: get_field(members[0], field) if members else None for field in fields}
+        for agg in group_by.aggregate or []:
+            values = [get_field(r, agg.field) for r in members] if agg.field and agg.field != "*" else []
+            values = [v for v in values if v is not None]
+            name = agg.alias or aggregate_alias(agg.function, agg.field)
+            out[name] = _aggregate(agg.function, values, len(members), agg.field)
+        result.append(out)
+    return result
+
+
+class ColumnStore:
+    """Columnar copy of a record list for vectorized filtering
+
+    Columns are built lazily per field. With NumPy installed, numeric columns
+    are stored as float arrays and comparison filters on them are evaluated
+    as array operations; other filters fall back to per-value predicates.
+    """
+
+    def __init__(self, rows: Iterable[Row]):
+        self.rows: List[Row] = list(rows)
+        self._columns: Dict[str, Any] = {}
+        self._np = _numpy()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, field: str) -> List[Any]:
+        values = self._columns.get(field)
+        if values is None:
+            values = [get_field(row, field) for row in self.rows]
+            self._columns[field] = values
+        return values
+
+    def _numeric(self, field: str) -> Any:
+        """Return (float array, null mask) when ``field`` is purely numeric"""
+        key = f"\0numeric:{field}"
+        if key not in self._columns:
+            np = self._np
+            values = self.column(field)
+            numeric = all(
+                v is None or (isinstance(v, (int, float)) and not isinstance(v, bool)) for v in values
+            )
+            if numeric:
+                nulls = np.array([v is None for v in values], dtype=bool)
+                array = np.array([float("nan") if v is None else v for v in values], dtype=float)
+                self._columns[key] = (array, nulls)
+            else:
+                self._columns[key] = None
+        return self._columns[key]
+
+    def _vector_mask(self, f: Filter) -> Any:
+        np = self._np
+        op = (f.operator or "eq").lower()
+        if np is None or not f.field or f.type:
+            return None
+        numeric = self._numeric(f.field)
+        if numeric is None:
+            return None
+        array, nulls = numeric
+        if op == "isnull":
+            return nulls.copy()
+        if op == "notnull":
+            return ~nulls
+        value = f.value
+        try:
+            if op in ("in", "nin"):
+                values = value if isinstance(value, (list, tuple, set)) else [value]
+                if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                    return None
+                mask = np.isin(array, np.array(list(values), dtype=float))
+                return mask & ~nulls if op == "in" else ~mask & ~nulls
+            if op == "between":
+                low, high = value
+                return (array >= low) & (array <= high) & ~nulls
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return None
+            if op == "eq":
+                return (array == value) & ~nulls
+            if op == "ne":
+                return (array != value) & ~nulls
+            if op == "gt":
+                return array > value
+            if op == "gte":
+                return array >= value
+            if op == "lt":
+                return array < value
+            if op == "lte":
+                return array <= value
+        except TypeError:
+            return None
+        return None
+
+    def mask(self, f: Filter) -> List[bool]:
+        """Return a boolean mask (array or list) of rows matching ``f``"""
+        np = self._np
+        op = (f.operator or "").lower()
+        if op in ("and", "or") or (f.filters and not f.field):
+            masks = [self.mask(sub) for sub in f.filters or []]
+            if not masks:
+                return np.ones(len(self.rows), dtype=bool) if np else [True] * len(self.rows)
+            if np:
+                combined = np.array(masks[0], dtype=bool)
+                for m in masks[1:]:
+                    combined = combined | m if op == "or" else combined & m
+                return combined
+            if op == "or":
+                return [any(values) for values in zip(*masks)]
+            return [all(values) for values in zip(*masks)]
+        vector = self._vector_mask(f)
+        if vector is not None:
+            return vector
+        test = value_predicate(op or "eq", f.value, f.type)
+        result = [test(v) for v in self.column(f.field)]
+        return np.array(result, dtype=bool) if np else result
+
+    def filter(self, filters: Optional[List[Filter]]) -> List[Row]:
+        """Rows matching a top-level filter list"""
+        if not filters:
+            return list(self.rows)
+        mask = self.mask(Filter(operator="and", filters=list(filters)))
+        return [row for row, keep in zip(self.rows, mask) if keep]
+
+
+def filter_rows(rows: Union[Sequence[Row], ColumnStore], filters: Optional[List[Filter]]) -> List[Row]:
+    """Rows matching a top-level filter list
+
+    A :class:`ColumnStore` filters column-wise and an
+    :class:`~bshengine.query.index.IndexedCollection` narrows the rows
+    through its indexes first.
+    """
+    from .index import IndexedCollection
+    if isinstance(rows, (ColumnStore, IndexedCollection)):
+        return rows.filter(filters)
+    if not filters:
+        return list(rows)
+    predicate = compile_filters(filters)
+    return [row for row in rows if predicate(row)]
+
+
+def evaluate(search: BshSearch, rows: Union[Sequence[Row], ColumnStore]) -> List[Row]:
+    """Evaluate ``search`` locally: from, filters, group by, sort, pagination, fields
+
+    Semantics follow SQL: NULL never matches a comparison, ``like`` uses
+    ``%``/``_`` wildcards, ``between`` is inclusive, COUNT(field) skips NULLs
+    and other aggregates ignore them, and sorting puts NULLs last ascending.
+    """
+    if search.from_ is not None:
+        rows = evaluate(search.from_, rows)
+    result = filter_rows(rows, search.filters)
+    if search.group_by is not None:
+        result = group_rows(result, search.group_by)
+    result = sort_rows(result, search.sort)
+    result = paginate(result, search.pagination)
+    if search.group_by is None:
+        result = project(result, search.fields)
+    return result
@@ -0,0 +1,269 @@
+"""Secondary indexes over in-memory entity collections"""
+from bisect import bisect_left, bisect_right
+from itertools import count
+from typing import Optional, Any, Dict, Iterable, Iterator, List, Set
+from ..types.search import Filter
+from .evaluator import Row, compile_filters, get_field
+
+_RANGE_OPERATORS = ("gt", "gte", "lt", "lte", "between")
+
+
+class HashIndex:
+    """Equality index: field value -> keys of the rows holding it
+
+    Rows whose value is unhashable are kept aside and returned as
+    candidates for every lookup.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self._keys: Dict[Any, Set[Any]] = {}
+        self._unhashable: Set[Any] = set()
+
+    def add(self, key: Any, row: Row) -> None:
+        value = get_field(row, self.field)
+        try:
+            self._keys.setdefault(value, set()).add(key)
+        except TypeError:
+            self._unhashable.add(key)
+
+    def remove(self, key: Any, row: Row) -> None:
+        value = get_field(row, self.field)
+        try:
+            keys = self._keys.get(value)
+        except TypeError:
+            self._unhashable.discard(key)
+            return
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[value]
+
+    def lookup(self, values: Iterable[Any]) -> Optional[Set[Any]]:
+        """Keys of rows equal to any of ``values``, or None if not answerable"""
+        result = set(self._unhashable)
+        try:
+            for value in values:
+                result |= self._keys.get(value, set())
+        except TypeError:
+            return None
+        return result
+
+
+class SortedIndex:
+    """Ordered index for range and prefix lookups
+
+    NULLs are not indexed since they never match a comparison. If the
+    field holds values that cannot be ordered together the index disables
+    itself and lookups fall back to a scan.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.usable = True
+        self._values: List[Any] = []
+        self._keys: List[Any] = []
+
+    def add(self, key: Any, row: Row) -> None:
+        value = get_field(row, self.field)
+        if value is None or not self.usable:
+            return
+        try:
+            i = bisect_right(self._values, value)
+        except TypeError:
+            self.usable = False
+            return
+        self._values.insert(i, value)
+        self._keys.insert(i, key)
+
+    def remove(self, key: Any, row: Row) -> None:
+        value = get_field(row, self.field)
+        if value is None or not self.usable:
+            return
+        start = bisect_left(self._values, value)
+        end = bisect_right(self._values, value)
+        for i in range(start, end):
+            if self._keys[i] == key:
+                del self._values[i]
+                del self._keys[i]
+                return
+
+    def range(
+        self,
+        low: Any = None,
+        high: Any = None,
+        include_low: bool = True,
+        include_high: bool = True,
+    ) -> Optional[Set[Any]]:
+        """Keys of rows between ``low`` and ``high``, or None if not answerable"""
+        if not self.usable:
+            return None
+        try:
+            start = 0
+            if low is not None:
+                start = (bisect_left if include_low else bisect_right)(self._values, low)
+            end = len(self._values)
+            if high is not None:
+                end = (bisect_right if include_high else bisect_left)(self._values, high)
+        except TypeError:
+            return None
+        return set(self._keys[start:end])
+
+    def prefix(self, prefix: str) -> Optional[Set[Any]]:
+        """Keys of rows whose string value starts with ``prefix``"""
+        if not self.usable:
+            return None
+        try:
+            start = bisect_left(self._values, prefix)
+        except TypeError:
+            return None
+        result = set()
+        for i in range(start, len(self._values)):
+            value = self._values[i]
+            if not isinstance(value, str) or not value.startswith(prefix):
+                break
+            result.add(self._keys[i])
+        return result
+
+
+class IndexedCollection:
+    """Keyed record collection with secondary indexes
+
+    ``key`` names the field identifying a record; without it records get
+    sequential keys. Indexes are maintained on every :meth:`upsert` and
+    :meth:`remove`, and :func:`evaluate` narrows filters through them
+    before applying the full predicate to the remaining candidates.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Row] = (),
+        key: Optional[str] = None,
+        hash_indexes: Iterable[str] = (),
+        sorted_indexes: Iterable[str] = (),
+    ):
+        self.key = key
+        self._rows: Dict[Any, Row] = {}
+        self._order: Dict[Any, int] = {}
+        self._sequence = count()
+        self.hash_indexes: Dict[str, HashIndex] = {}
+        self.sorted_indexes: Dict[str, SortedIndex] = {}
+        for field in hash_indexes:
+            self.add_hash_index(field)
+        for field in sorted_indexes:
+            self.add_sorted_index(field)
+        for row in rows:
+            self.upsert(row)
+
+    def _indexes(self) -> List[Any]:
+        return list(self.hash_indexes.values()) + list(self.sorted_indexes.values())
+
+    def add_hash_index(self, field: str) -> HashIndex:
+        index = self.hash_indexes.get(field)
+        if index is None:
+            index = self.hash_indexes[field] = HashIndex(field)
+            for key, row in self._rows.items():
+                index.add(key, row)
+        return index
+
+    def add_sorted_index(self, field: str) -> SortedIndex:
+        index = self.sorted_indexes.get(field)
+        if index is None:
+            index = self.sorted_indexes[field] = SortedIndex(field)
+            for key, row in self._rows.items():
+                index.add(key, row)
+        return index
+
+    def upsert(self, row: Row) -> Any:
+        """Insert or replace a record; return its key"""
+        key = row.get(self.key) if self.key else next(self._sequence)
+        current = self._rows.get(key)
+        if current is not None:
+            for index in self._indexes():
+                index.remove(key, current)
+        else:
+            self._order[key] = next(self._sequence) if self.key else key
+        self._rows[key] = row
+        for index in self._indexes():
+            index.add(key, row)
+        return key
+
+    def remove(self, key: Any) -> Optional[Row]:
+        """Remove and return the record with ``key``"""
+        row = self._rows.pop(key, None)
+        if row is not None:
+            del self._order[key]
+            for index in self._indexes():
+                index.remove(key, row)
+        return row
+
+    def get(self, key: Any) -> Optional[Row]:
+        return self._rows.get(key)
+
+    @property
+    def rows(self) -> List[Row]:
+        return list(self._rows.values())
+
+    def keys(self) -> List[Any]:
+        return list(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Row]:
+        return iter(list(self._rows.values()))
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._rows
+
+    def find(self, field: str, value: Any) -> List[Row]:
+        """Records whose ``field`` equals ``value``"""
+        return self.filter([Filter(operator="eq", field=field, value=value)])
+
+    def _lookup(self, f: Filter) -> Optional[Set[Any]]:
+        """Candidate keys for one predicate, or None if no index applies"""
+        op = (f.operator or "").lower()
+        if not f.field or f.type or f.filters:
+            return None
+        hash_index = self.hash_indexes.get(f.field)
+        sorted_index = self.sorted_indexes.get(f.field)
+        if hash_index and op in ("eq", "in"):
+            values = f.value if op == "in" and isinstance(f.value, (list, tuple, set)) else [f.value]
+            return hash_index.lookup(values)
+        if sorted_index is None:
+            return None
+        if op == "eq":
+            return sorted_index.range(f.value, f.value)
+        if op == "between" and isinstance(f.value, (list, tuple)) and len(f.value) == 2:
+            return sorted_index.range(f.value[0], f.value[1])
+        if op in _RANGE_OPERATORS and f.value is not None:
+            if op.startswith("g"):
+                return sorted_index.range(low=f.value, include_low=op == "gte")
+            return sorted_index.range(high=f.value, include_high=op == "lte")
+        if op == "starts" and isinstance(f.value, str):
+            return sorted_index.prefix(f.value)
+        return None
+
+    def candidates(self, filters: Optional[List[Filter]]) -> Optional[List[Row]]:
+        """Rows that may match a top-level filter list, or None for a full scan"""
+        keys: Optional[Set[Any]] = None
+        for f in filters or []:
+            found = self._lookup(f)
+            if found is None:
+                continue
+            keys = found if keys is None else keys & found
+            if not keys:
+                return []
+        if keys is None:
+            return None
+        return [self._rows[k] for k in sorted(keys, key=self._order.__getitem__)]
+
+    def filter(self, filters: Optional[List[Filter]]) -> List[Row]:
+        """Rows matching a top-level filter list, in insertion order"""
+        rows = self.candidates(filters)
+        if rows is None:
+            rows = self.rows
+        if not filters:
+            return rows
+        predicate = compile_filters(filters)
+        return [row for row in rows if predicate(row)]
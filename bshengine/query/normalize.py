@@ -0,0 +1,228 @@
+"""Filter tree normalization and simplification"""
+import json
+from typing import Optional, Any, Dict, List, Tuple
+from ..types.search import BshSearch, Filter
+
+LOGICAL_OPERATORS = ("and", "or")
+_LOWER_BOUNDS = ("gt", "gte")
+_UPPER_BOUNDS = ("lt", "lte")
+
+
+class _Always:
+    """Marker for a filter that matches every row"""
+
+    def __repr__(self) -> str:
+        return "TRUE"
+
+
+TRUE = _Always()
+
+
+def _op(f: Filter) -> str:
+    return (f.operator or "").lower()
+
+
+def filter_key(f: Filter) -> str:
+    """Stable string identifying a (normalized) filter"""
+    return json.dumps(BshSearch()._filter_to_dict(f), sort_keys=True, default=repr)
+
+
+def _dedupe(values: List[Any]) -> List[Any]:
+    seen = set()
+    result = []
+    for value in values:
+        key = json.dumps(value, sort_keys=True, default=repr)
+        if key not in seen:
+            seen.add(key)
+            result.append(value)
+    try:
+        return sorted(result)
+    except TypeError:
+        return result
+
+
+def _normalize_predicate(f: Filter) -> Any:
+    op = _op(f)
+    if op in ("in", "nin"):
+        values = f.value if isinstance(f.value, (list, tuple, set)) else [f.value]
+        values = _dedupe(list(values))
+        if op == "nin" and not values:
+            return TRUE
+        if len(values) == 1:
+            return Filter(operator="eq" if op == "in" else "ne", field=f.field, value=values[0], type=f.type)
+        return Filter(operator=op, field=f.field, value=values, type=f.type)
+    if op == "between" and isinstance(f.value, (list, tuple)) and len(f.value) == 2:
+        low, high = f.value
+        if low is None and high is None:
+            return TRUE
+        if low is None:
+            return Filter(operator="lte", field=f.field, value=high, type=f.type)
+        if high is None:
+            return Filter(operator="gte", field=f.field, value=low, type=f.type)
+        if low == high:
+            return Filter(operator="eq", field=f.field, value=low, type=f.type)
+        return Filter(operator="between", field=f.field, value=[low, high], type=f.type)
+    return Filter(operator=op or None, field=f.field, value=f.value, type=f.type)
+
+
+def _tighter(current: Optional[Tuple[str, Any]], op: str, value: Any, lower: bool) -> Tuple[str, Any]:
+    """Keep the more restrictive of two bounds on the same side"""
+    if current is None:
+        return op, value
+    current_op, current_value = current
+    if value == current_value:
+        strict = "gt" if lower else "lt"
+        return (strict, value) if strict in (op, current_op) else (op, value)
+    if lower:
+        return (op, value) if value > current_value else current
+    return (op, value) if value < current_value else current
+
+
+def _merge_ranges(filters: List[Filter]) -> List[Filter]:
+    """Combine range predicates on the same field of an AND group"""
+    bounds: Dict[Tuple[str, Optional[str]], List[Filter]] = {}
+    others: List[Filter] = []
+    for f in filters:
+        op = _op(f)
+        if f.field and (op in _LOWER_BOUNDS + _UPPER_BOUNDS or op == "between"):
+            bounds.setdefault((f.field, f.type), []).append(f)
+        else:
+            others.append(f)
+
+    merged: List[Filter] = []
+    for (field, type_), group in bounds.items():
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        lower: Optional[Tuple[str, Any]] = None
+        upper: Optional[Tuple[str, Any]] = None
+        try:
+            for f in group:
+                op = _op(f)
+                if op == "between":
+                    lower = _tighter(lower, "gte", f.value[0], True)
+                    upper = _tighter(upper, "lte", f.value[1], False)
+                elif op in _LOWER_BOUNDS:
+                    lower = _tighter(lower, op, f.value, True)
+                else:
+                    upper = _tighter(upper, op, f.value, False)
+        except (TypeError, IndexError):
+            merged.extend(group)
+            continue
+        if lower and upper and lower[0] == "gte" and upper[0] == "lte":
+            merged.append(_normalize_predicate(
+                Filter(operator="between", field=field, value=[lower[1], upper[1]], type=type_)
+            ))
+            continue
+        for bound in (lower, upper):
+            if bound:
+                merged.append(Filter(operator=bound[0], field=field, value=bound[1], type=type_))
+    return others + merged
+
+
+def _merge_equalities(filters: List[Filter]) -> List[Filter]:
+    """Fold ``eq``/``in`` predicates on the same field of an OR group into one ``in``"""
+    groups: Dict[Tuple[str, Optional[str]], List[Filter]] = {}
+    others: List[Filter] = []
+    for f in filters:
+        if f.field and _op(f) in ("eq", "in"):
+            groups.setdefault((f.field, f.type), []).append(f)
+        else:
+            others.append(f)
+    merged = []
+    for (field, type_), group in groups.items():
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        values: List[Any] = []
+        for f in group:
+            values.extend(f.value if _op(f) == "in" else [f.value])
+        merged.append(_normalize_predicate(Filter(operator="in", field=field, value=values, type=type_)))
+    return others + merged
+
+
+def _has_null_tautology(filters: List[Filter]) -> bool:
+    null_fields = {f.field for f in filters if _op(f) == "isnull"}
+    return any(_op(f) == "notnull" and f.field in null_fields for f in filters)
+
+
+def _simplify_group(op: str, children: List[Any]) -> Any:
+    flat: List[Filter] = []
+    for child in children:
+        if child is TRUE:
+            if op == "or":
+                return TRUE
+            continue
+        if _op(child) == op:
+            flat.extend(child.filters or [])
+        else:
+            flat.append(child)
+
+    if op == "and":
+        flat = _merge_ranges(flat)
+    else:
+        flat = _merge_equalities(flat)
+        if _has_null_tautology(flat):
+            return TRUE
+
+    unique: Dict[str, Filter] = {}
+    for f in flat:
+        unique.setdefault(filter_key(f), f)
+    flat = [unique[key] for key in sorted(unique)]
+
+    if not flat:
+        return TRUE
+    if len(flat) == 1:
+        return flat[0]
+    return Filter(operator=op, filters=flat)
+
+
+def normalize_filter(f: Filter) -> Any:
+    """Return a simplified copy of ``f``, or :data:`TRUE` if it matches everything"""
+    op = _op(f)
+    if op in LOGICAL_OPERATORS:
+        return _simplify_group(op, [normalize_filter(sub) for sub in f.filters or []])
+    if f.filters and not f.field:
+        # Group without an operator: the server combines its children with AND
+        return _simplify_group("and", [normalize_filter(sub) for sub in f.filters])
+    return _normalize_predicate(f)
+
+
+def normalize_filters(filters: Optional[List[Filter]]) -> List[Filter]:
+    """Normalize a top-level filter list (combined with AND)
+
+    Associative AND/OR groups are flattened, duplicate predicates removed,
+    range predicates on the same field merged (into ``between`` when both
+    bounds are inclusive), ``in`` values deduplicated and sorted, single-value
+    ``in``/``nin`` turned into ``eq``/``ne``, ``eq``/``in`` alternatives on the
+    same field folded into one ``in``, and tautologies dropped. Children are
+    sorted so equivalent trees normalize to the same result.
+    """
+    result = _simplify_group("and", [normalize_filter(f) for f in filters or []])
+    if result is TRUE:
+        return []
+    if _op(result) == "and":
+        return list(result.filters)
+    return [result]
+
+
+def normalize_search(search: BshSearch) -> BshSearch:
+    """Return a copy of ``search`` with normalized filters"""
+    return BshSearch(
+        entity=search.entity,
+        alias=search.alias,
+        fields=search.fields,
+        filters=normalize_filters(search.filters) or None,
+        group_by=search.group_by,
+        sort=search.sort,
+        pagination=search.pagination,
+        from_=normalize_search(search.from_) if search.from_ else None,
+    )
+
+
+def canonical_key(search: BshSearch, entity: Optional[str] = None) -> str:
+    """Stable cache key for ``search``; equivalent searches share a key"""
+    data = normalize_search(search).to_dict()
+    if entity:
+        data["entity"] = entity
+    return json.dumps(data, sort_keys=True, default=repr)
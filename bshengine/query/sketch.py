@@ -0,0 +1,65 @@
+"""Probabilistic sketches for distinct counts"""
+import hashlib
+import math
+from typing import Any, Iterable
+
+_HASH_BITS = 64
+
+
+def _hash(value: Any) -> int:
+    digest = hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """Distinct-count sketch using ``2 ** precision`` one-byte registers
+
+    The relative standard error is about ``1.04 / sqrt(2 ** precision)``
+    (1.6% at the default precision of 12, for 4 KiB of memory). Sketches of
+    the same precision can be merged, e.g. one per scanned partition.
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    @property
+    def error(self) -> float:
+        """Relative standard error of :meth:`count`"""
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value: Any) -> None:
+        h = _hash(value)
+        index = h >> (_HASH_BITS - self.precision)
+        rest = h & ((1 << (_HASH_BITS - self.precision)) - 1)
+        rank = _HASH_BITS - self.precision - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[Any]) -> "HyperLogLog":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold ``other`` into this sketch"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        m = self.m
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
@@ -8,6 +8,11 @@ from .mailing import MailingService
 from .utils import BshUtilsService
 from .caching import CachingService
 from .api_key import ApiKeyService
+from .bulk_upload import BulkUploader, UploadManifest
+from .image_processing import ImagePreprocessor, PreprocessedImage, preprocess_image
+from .replica import EntityReplica, ReplicaManager
+from .user_sync import UserSync
+from .change_feed import ChangeFeed
 
 __all__ = [
     "EntityService",
@@ -19,5 +24,14 @@ __all__ = [
     "BshUtilsService",
     "CachingService",
     "ApiKeyService",
+    "BulkUploader",
+    "UploadManifest",
+    "ImagePreprocessor",
+    "PreprocessedImage",
+    "preprocess_image",
+    "EntityReplica",
+    "ReplicaManager",
+    "UserSync",
+    "ChangeFeed",
 ]
 
@@ -0,0 +1,234 @@
+"""Concurrent bulk uploads with content-hash deduplication"""
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Tuple
+from ..client.retry import RetryPolicy
+from ..types import BshResponse
+from ..types.bulk import UploadResult, BulkUploadReport
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Called with a list of content hashes, returns {hash: asset data} for known ones
+HashLookupFn = Callable[[List[str]], Dict[str, Any]]
+
+
+def hash_file(path: str, algorithm: str = "sha256", chunk_size: int = HASH_CHUNK_SIZE) -> Tuple[str, int]:
+    """Hash a file in fixed-size chunks, returning (hex digest, size)"""
+    digest = hashlib.new(algorithm)
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class UploadManifest:
+    """Local record of uploaded assets keyed by namespace and content hash
+
+    File hashes are cached by path, size and modification time, so files that
+    did not change since the last run are not read again.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None, algorithm: str = "sha256"):
+        self.path = path
+        self.algorithm = algorithm
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.assets: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("algorithm", algorithm) == algorithm:
+                self.files = data.get("files", {})
+                self.assets = data.get("assets", {})
+
+    @staticmethod
+    def _asset_key(namespace: Optional[str], digest: str) -> str:
+        return f"{namespace or ''}:{digest}"
+
+    def file_hash(self, path: str) -> Tuple[str, int]:
+        """Return (digest, size) for ``path``, reusing the cached hash if unchanged"""
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            cached = self.files.get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["hash"], cached["size"]
+        digest, size = hash_file(path, self.algorithm)
+        with self._lock:
+            self.files[key] = {"size": size, "mtime_ns": stat.st_mtime_ns, "hash": digest}
+        return digest, size
+
+    def get(self, namespace: Optional[str], digest: str) -> Optional[Any]:
+        """Return recorded asset data for a hash, or None"""
+        with self._lock:
+            return self.assets.get(self._asset_key(namespace, digest))
+
+    def __contains__(self, item: Tuple[Optional[str], str]) -> bool:
+        with self._lock:
+            return self._asset_key(*item) in self.assets
+
+    def record(self, namespace: Optional[str], digest: str, data: Any) -> None:
+        """Record that the content with ``digest`` is uploaded in ``namespace``"""
+        with self._lock:
+            self.assets[self._asset_key(namespace, digest)] = data
+
+    def save(self) -> None:
+        """Atomically write the manifest to its path"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "version": self.VERSION,
+                "algorithm": self.algorithm,
+                "files": dict(self.files),
+                "assets": dict(self.assets),
+            }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+def _windows(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    window: List[Any] = []
+    for item in items:
+        window.append(item)
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+class BulkUploader:
+    """Upload many files concurrently, skipping content that is already known
+
+    Input is consumed in windows of ``batch_size`` paths: each window is hashed
+    in parallel, checked against the manifest and the optional remote
+    ``lookup``, then the remaining files are uploaded with ``concurrency``
+    workers, each retried according to ``retry``. ``prepare``, when given,
+    turns a path into the source passed to ``upload_fn`` once per file,
+    outside the retries, so a file it cannot read fails without retrying.
+
+    New files are read twice, once to hash and once to upload: the hash
+    decides whether the upload happens at all, so it cannot be computed
+    while streaming. Unchanged files are not read again on later runs, as
+    the manifest caches their hash by size and modification time.
+    """
+
+    def __init__(
+        self,
+        upload_fn: Callable[[Any], Optional[BshResponse]],
+        namespace: Optional[str] = None,
+        concurrency: int = 8,
+        retry: Optional[RetryPolicy] = None,
+        manifest: Optional[UploadManifest] = None,
+        lookup: Optional[HashLookupFn] = None,
+        batch_size: int = 256,
+        on_result: Optional[Callable[[UploadResult], Any]] = None,
+        prepare: Optional[Callable[[str], Any]] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.upload_fn = upload_fn
+        self.namespace = namespace
+        self.concurrency = concurrency
+        self.retry = retry or RetryPolicy()
+        self.manifest = manifest or UploadManifest()
+        self.lookup = lookup
+        self.batch_size = batch_size
+        self.on_result = on_result
+        self.prepare = prepare
+
+    def _hash(self, path: str) -> UploadResult:
+        try:
+            digest, size = self.manifest.file_hash(path)
+            return UploadResult(source=path, status="skipped", hash=digest, size=size)
+        except Exception as error:
+            return UploadResult(source=path, status="failed", error=error)
+
+    def _upload(self, result: UploadResult) -> UploadResult:
+        started = time.perf_counter()
+        attempts = []
+
+        def attempt():
+            attempts.append(1)
+            return self.upload_fn(source)
+
+        try:
+            source = self.prepare(result.source) if self.prepare else result.source
+            response = self.retry.call(attempt)
+            data = response.data[0] if response and response.data else None
+            self.manifest.record(self.namespace, result.hash, data)
+            result.status = "uploaded"
+            result.data = data
+        except Exception as error:
+            result.status = "failed"
+            result.error = error
+        result.attempts = len(attempts)
+        result.duration = time.perf_counter() - started
+        return result
+
+    def _resolve_known(self, pending: List[UploadResult]) -> List[UploadResult]:
+        """Mark results known locally or remotely as skipped, return the rest"""
+        unknown = []
+        for result in pending:
+            if (self.namespace, result.hash) in self.manifest:
+                result.data = self.manifest.get(self.namespace, result.hash)
+            else:
+                unknown.append(result)
+        if self.lookup and unknown:
+            known = self.lookup(sorted({r.hash for r in unknown}))
+            still_unknown = []
+            for result in unknown:
+                if result.hash in known:
+                    result.data = known[result.hash]
+                    self.manifest.record(self.namespace, result.hash, result.data)
+                else:
+                    still_unknown.append(result)
+            unknown = still_unknown
+        return unknown
+
+    def run(self, paths: Iterable[str]) -> BulkUploadReport:
+        """Upload ``paths`` and return a report with per-file results"""
+        report = BulkUploadReport()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for window in _windows(paths, self.batch_size):
+                results = list(pool.map(self._hash, window))
+                hashed = [r for r in results if r.status != "failed"]
+                to_upload = self._resolve_known(hashed)
+
+                # Identical content within a window is uploaded once
+                first_by_hash: Dict[str, UploadResult] = {}
+                duplicates: List[UploadResult] = []
+                for result in to_upload:
+                    if result.hash in first_by_hash:
+                        duplicates.append(result)
+                    else:
+                        first_by_hash[result.hash] = result
+                list(pool.map(self._upload, first_by_hash.values()))
+                for result in duplicates:
+                    first = first_by_hash[result.hash]
+                    result.status = "skipped" if first.status == "uploaded" else "failed"
+                    result.data = first.data
+                    result.error = first.error
+
+                self.manifest.save()
+                for result in results:
+                    report.results.append(result)
+                    if self.on_result:
+                        self.on_result(result)
+        report.elapsed = time.perf_counter() - started
+        return report
@@ -0,0 +1,190 @@
+"""Change feeds polling entities for inserted and updated records"""
+import logging
+import threading
+from typing import Optional, Any, Callable, Dict, Iterable, List, Union
+from ..checkpoint import Checkpoint, as_checkpoint
+from ..executor import executor_for
+from ..types import BshSearch, Filter, Sort
+from .entities import SCAN_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+FEED_SOURCES = ("BshEventLogs", "BshTriggerInstances")
+
+FeedHandler = Callable[[str, List[Dict[str, Any]]], Any]
+
+
+class FeedCursor:
+    """High-water mark of one entity's feed
+
+    Rows are fetched with ``updated_field >= watermark`` and the keys of the
+    rows already delivered at exactly the watermark are remembered, so rows
+    sharing the watermark timestamp are neither lost nor delivered twice.
+    """
+
+    def __init__(self, watermark: Any = None, seen: Iterable[Any] = ()):
+        self.watermark = watermark
+        self.seen = set(seen)
+
+    def filters(self, updated_field: str) -> List[Filter]:
+        if self.watermark is None:
+            return []
+        return [Filter(field=updated_field, operator="gte", value=self.watermark)]
+
+    def new_rows(self, rows: List[Dict[str, Any]], updated_field: str, key: str) -> List[Dict[str, Any]]:
+        """Drop rows already delivered at the watermark"""
+        return [
+            row for row in rows
+            if not (row.get(updated_field) == self.watermark and row.get(key) in self.seen)
+        ]
+
+    def advance(self, rows: List[Dict[str, Any]], updated_field: str, key: str) -> None:
+        for row in rows:
+            updated = row.get(updated_field)
+            if updated is None:
+                continue
+            if self.watermark is None or updated > self.watermark:
+                self.watermark = updated
+                self.seen = set()
+            if updated == self.watermark:
+                self.seen.add(row.get(key))
+
+    def state(self) -> Dict[str, Any]:
+        return {"watermark": self.watermark, "seen": sorted(self.seen, key=str)}
+
+    @classmethod
+    def from_state(cls, state: Optional[Dict[str, Any]]) -> "FeedCursor":
+        state = state or {}
+        return cls(state.get("watermark"), state.get("seen", ()))
+
+
+class ChangeFeed:
+    """Poll entities for records inserted or updated since the last poll
+
+    Each poll fetches only rows at or after every entity's watermark (see
+    :class:`FeedCursor`), in keyset pages ordered by ``updated_field`` and
+    ``key``, and hands each page to the handlers. Entities are polled
+    concurrently on the client's executor; pages of one entity are handled
+    in order and its watermark only moves past a page once every handler
+    accepted it, so delivery is at least once. The background poll interval
+    halves while changes keep arriving, down to ``min_interval``, and backs
+    off by ``backoff`` when nothing changed, up to ``max_interval``. With
+    ``checkpoint`` the watermarks are saved after every poll and restored on
+    creation. ``since`` skips older rows on the first poll. Poll errors go to
+    ``on_error``; without it :meth:`poll` raises them and the background
+    thread logs them.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        entities: Iterable[str] = FEED_SOURCES,
+        updated_field: str = "updatedAt",
+        key: str = "id",
+        updated_fields: Optional[Dict[str, str]] = None,
+        keys: Optional[Dict[str, str]] = None,
+        page_size: int = SCAN_PAGE_SIZE,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        backoff: float = 2.0,
+        since: Any = None,
+        checkpoint: Optional[Union[str, Checkpoint]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.engine = engine
+        self.entities = list(entities)
+        self.updated_fields = {e: (updated_fields or {}).get(e, updated_field) for e in self.entities}
+        self.keys = {e: (keys or {}).get(e, key) for e in self.entities}
+        self.page_size = page_size
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.on_error = on_error
+        self.checkpoint = as_checkpoint(checkpoint)
+        state = (self.checkpoint.load() if self.checkpoint else None) or {}
+        self.services = {e: self.engine.entity(e).uncached() for e in self.entities}
+        self.cursors: Dict[str, FeedCursor] = {
+            e: FeedCursor.from_state(state[e]) if e in state else FeedCursor(since) for e in self.entities
+        }
+        self._handlers: Dict[Optional[str], List[FeedHandler]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def on(self, entity: Optional[str] = None) -> Callable[[FeedHandler], FeedHandler]:
+        """Register a handler for ``entity`` (every entity when omitted); usable as a decorator"""
+        def register(handler: FeedHandler) -> FeedHandler:
+            self._handlers.setdefault(entity, []).append(handler)
+            return handler
+        return register
+
+    def _poll_entity(self, entity: str) -> int:
+        updated_field, key = self.updated_fields[entity], self.keys[entity]
+        cursor = self.cursors[entity]
+        search = BshSearch(
+            filters=cursor.filters(updated_field),
+            sort=[Sort(field=updated_field, direction=1), Sort(field=key, direction=1)],
+        )
+        handlers = self._handlers.get(entity, []) + self._handlers.get(None, [])
+        delivered = 0
+        for page in self.services[entity].pages(search, page_size=self.page_size, key=key, mode="keyset"):
+            rows = cursor.new_rows(page[0], updated_field, key)
+            if rows:
+                for handler in handlers:
+                    handler(entity, rows)
+                delivered += len(rows)
+            cursor.advance(rows, updated_field, key)
+        return delivered
+
+    def poll(self) -> Dict[str, int]:
+        """Fetch and deliver changes of every entity once; returns rows delivered per entity"""
+        counts: Dict[str, int] = {}
+        errors: List[BaseException] = []
+        if not self.entities:
+            return counts
+        executor = executor_for(self.services[self.entities[0]].client)
+        for result in executor.map(self._poll_entity, self.entities):
+            counts[result.item] = result.value or 0
+            if not result.ok:
+                errors.append(result.error)
+        if self.checkpoint:
+            self.checkpoint.save({e: c.state() for e, c in self.cursors.items()})
+        if sum(counts.values()):
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        for error in errors:
+            if not self.on_error:
+                raise error
+            self.on_error(error)
+        return counts
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                # Raised by poll without on_error, or by on_error itself
+                logger.exception("Change feed poll failed")
+            self._stop.wait(self.interval)
+
+    def start(self) -> "ChangeFeed":
+        """Start polling in a background thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="bsh-change-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop polling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ChangeFeed":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -1,17 +1,156 @@
 """Entity service for CRUD operations"""
-from typing import Optional, Any, Dict, List
+import json
+import time
+from dataclasses import replace
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Literal, Tuple, Union
 from ..client import BshClient, BshClientFnParams
-from ..types import BshResponse, BshSearch
+from ..client.rate_limit import RateLimiter
+from ..client.retry import RetryPolicy
+from ..types import AggregateResult, BshResponse, BshSearch, Filter, Pagination, Sort, BulkDeleteReport
+from ..query.aggregate import AggregateMerger, partial_group_by
+from ..query.cache import QueryCache
+from ..query.evaluator import FIRST_PAGE
+from ..executor import executor_for
+
+IN_CHUNK_SIZE = 500
+IN_CHUNK_BYTES = 32 * 1024
+SCAN_PAGE_SIZE = 500
+
+ScanMode = Literal["page", "keyset"]
+
+
+def keyset_filter(sort: List[Sort], values: List[Any]) -> Filter:
+    """Filter selecting rows that come after ``values`` in ``sort`` order"""
+    branches = []
+    for i, s in enumerate(sort):
+        terms = [Filter(field=prev.field, operator="eq", value=v) for prev, v in zip(sort[:i], values)]
+        terms.append(Filter(field=s.field, operator="lt" if s.direction == -1 else "gt", value=values[i]))
+        branches.append(terms[0] if len(terms) == 1 else Filter(operator="and", filters=terms))
+    return branches[0] if len(branches) == 1 else Filter(operator="or", filters=branches)
+
+
+def iter_page_batches(
+    search: Callable[[Any], Optional[BshResponse]],
+    payload: Optional[BshSearch] = None,
+    page_size: int = SCAN_PAGE_SIZE,
+    key: str = "id",
+    cursor: Any = None,
+    mode: ScanMode = "page",
+) -> Iterator[Tuple[List[Any], Any]]:
+    """Yield ``(rows, cursor)`` for each page returned by ``search`` for ``payload``
+
+    In ``"page"`` mode ``cursor`` is the number of the next page. In
+    ``"keyset"`` mode it is the sort values of the last row seen, and each
+    page asks for the rows after it with ``gt``/``lt`` filters instead of a
+    page number, so deep pages cost the same as the first and concurrent
+    writes cannot shift rows between pages; ``key`` is appended to the sort
+    as a tie-breaker and the sort fields must not be null. Passing a cursor
+    back resumes the scan there. Without a sort the pages are ordered by
+    ``key`` so they are stable. Pages are sent as dicts, which keeps them
+    out of the query cache.
+    """
+    if mode not in ("page", "keyset"):
+        raise ValueError(f"Unknown scan mode {mode!r}")
+    base = payload or BshSearch()
+    sort = base.sort or [Sort(field=key, direction=1)]
+    if mode == "page":
+        page = cursor if cursor is not None else FIRST_PAGE
+        while True:
+            paged = replace(base, sort=sort, pagination=Pagination(page=page, size=page_size))
+            response = search(paged.to_dict())
+            data = response.data if response else []
+            page += 1
+            if data:
+                yield data, page
+            if len(data) < page_size:
+                return
+
+    if all(s.field != key for s in sort):
+        sort = [*sort, Sort(field=key, direction=1)]
+    fields = base.fields
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",")]
+    if fields:
+        fields = fields + [s.field for s in sort if s.field not in fields]
+    values = cursor
+    while True:
+        filters = list(base.filters or [])
+        if values is not None:
+            filters.append(keyset_filter(sort, values))
+        paged = replace(
+            base, fields=fields, filters=filters, sort=sort, pagination=Pagination(page=FIRST_PAGE, size=page_size)
+        )
+        response = search(paged.to_dict())
+        data = response.data if response else []
+        if data:
+            values = [data[-1].get(s.field) for s in sort]
+            yield data, values
+        if len(data) < page_size:
+            return
+
+
+def iter_pages(
+    search: Callable[[Any], Optional[BshResponse]],
+    payload: Optional[BshSearch] = None,
+    page_size: int = SCAN_PAGE_SIZE,
+    key: str = "id",
+    mode: ScanMode = "page",
+) -> Iterator[Any]:
+    """Yield every row returned by ``search`` for ``payload``, page by page"""
+    for rows, _ in iter_page_batches(search, payload, page_size, key, mode=mode):
+        yield from rows
+
+
+def chunk_ids(
+    ids: List[Any],
+    max_count: int = IN_CHUNK_SIZE,
+    max_bytes: int = IN_CHUNK_BYTES,
+) -> Iterator[List[Any]]:
+    """Split ids into lists small enough for one ``in`` filter"""
+    chunk: List[Any] = []
+    size = 0
+    for id in ids:
+        id_size = len(json.dumps(id, default=str)) + 1
+        if chunk and (len(chunk) >= max_count or size + id_size > max_bytes):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(id)
+        size += id_size
+    if chunk:
+        yield chunk
 
 
 class EntityService:
     """Service for entity operations"""
 
-    def __init__(self, client: BshClient, entity: Optional[str] = None):
+    def __init__(
+        self,
+        client: BshClient,
+        entity: Optional[str] = None,
+        cache: Optional[QueryCache] = None,
+    ):
         self.client = client
         self.entity = entity
+        self.cache = cache
         self.base_endpoint = "/api/entities"
 
+    def uncached(self) -> "EntityService":
+        """Return this service without its query cache
+
+        For readers that must see the server's current data, such as polling
+        replicas and change feeds. Writes made through the returned service do
+        not invalidate the cache, so use it for reads only.
+        """
+        if self.cache is None:
+            return self
+        return EntityService(self.client, self.entity)
+
+    def _written(self, entity_name: str, response: Any) -> Any:
+        """Drop cached search results of an entity after a write"""
+        if self.cache is not None:
+            self.cache.invalidate(entity_name)
+        return response
+
     def find_by_id(
         self,
         id: str,
@@ -34,6 +173,134 @@ class EntityService:
             )
         )
 
+    def find_by_ids(
+        self,
+        ids: Iterable[Any],
+        entity: Optional[str] = None,
+        key: str = "id",
+        chunk_size: int = IN_CHUNK_SIZE,
+        chunk_bytes: int = IN_CHUNK_BYTES,
+        concurrency: Optional[int] = None,
+    ) -> BshResponse:
+        """Get many entities by ID with as few ``in`` searches as possible
+
+        Ids are deduplicated and split into chunks of at most ``chunk_size``
+        ids and ``chunk_bytes`` of JSON, searched concurrently on the engine
+        executor. ``data`` follows the order of ``ids`` and ``meta["missing"]``
+        lists ids that were not found. With a query cache, only ids missing
+        from it are requested.
+        """
+        entity_name = entity or self.entity
+        wanted = list(dict.fromkeys(ids))
+        found: Dict[Any, Any] = {}
+        if self.cache is not None:
+            found.update(self.cache.get_records(entity_name, key, wanted))
+        pending = [id for id in wanted if id not in found]
+
+        def fetch(chunk: List[Any]) -> List[Any]:
+            search = BshSearch(
+                filters=[Filter(field=key, operator="in", value=chunk)],
+                pagination=Pagination(page=FIRST_PAGE, size=len(chunk)),
+            )
+            # A dict payload keeps chunk searches out of the query cache
+            response = self.search(search.to_dict(), entity=entity_name)
+            return response.data if response else []
+
+        executor = executor_for(self.client)
+        fetched: List[Any] = []
+        chunks = list(chunk_ids(pending, chunk_size, chunk_bytes))
+        if len(chunks) == 1:
+            fetched.extend(fetch(chunks[0]))
+        elif chunks:
+            for result in executor.map(fetch, chunks, concurrency=concurrency, fail_fast=True):
+                fetched.extend(result.value)
+        if self.cache is not None:
+            self.cache.put_records(entity_name, key, fetched)
+        for row in fetched:
+            found.setdefault(row.get(key), row)
+
+        return BshResponse(
+            data=[found[id] for id in wanted if id in found],
+            timestamp=int(time.time() * 1000),
+            code=200,
+            status="OK",
+            meta={"missing": [id for id in wanted if id not in found]},
+            api=f"entities.{entity_name}.findByIds",
+        )
+
+    def scan(
+        self,
+        payload: Optional[BshSearch] = None,
+        entity: Optional[str] = None,
+        page_size: int = SCAN_PAGE_SIZE,
+        key: str = "id",
+        mode: ScanMode = "page",
+    ) -> Iterator[Any]:
+        """Iterate over every entity matching ``payload``, one page at a time
+
+        ``mode="keyset"`` seeks past the last row seen instead of using page
+        numbers, which keeps deep scans fast and stable under writes.
+        """
+        entity_name = entity or self.entity
+        return iter_pages(lambda search: self.search(search, entity=entity_name), payload, page_size, key, mode)
+
+    def pages(
+        self,
+        payload: Optional[BshSearch] = None,
+        entity: Optional[str] = None,
+        page_size: int = SCAN_PAGE_SIZE,
+        key: str = "id",
+        cursor: Any = None,
+        mode: ScanMode = "page",
+    ) -> Iterator[Tuple[List[Any], Any]]:
+        """Iterate over ``(rows, cursor)`` pages; a saved cursor resumes the scan"""
+        entity_name = entity or self.entity
+        return iter_page_batches(
+            lambda search: self.search(search, entity=entity_name), payload, page_size, key, cursor, mode
+        )
+
+    def aggregate(
+        self,
+        payload: BshSearch,
+        entity: Optional[str] = None,
+        partitions: Optional[Iterable[Union[Filter, List[Filter]]]] = None,
+        page_size: int = SCAN_PAGE_SIZE,
+        concurrency: Optional[int] = None,
+    ) -> AggregateResult:
+        """Run the ``group_by`` aggregation of ``payload`` on the server and merge the partials
+
+        Only grouped rows are fetched: AVG is pushed down as SUM and COUNT so
+        results of several pages or ``partitions`` (extra filters, queried
+        concurrently, e.g. one per shard or date range) combine exactly on
+        the client. The result holds one column per group field and aggregate.
+        """
+        group_by = payload.group_by
+        if group_by is None or not group_by.aggregate:
+            raise ValueError("aggregate needs a search with group_by aggregates")
+        entity_name = entity or self.entity
+        merger = AggregateMerger(group_by)
+        base = replace(payload, fields=None, group_by=partial_group_by(group_by), pagination=None)
+        grouped = bool(group_by.fields)
+        if grouped:
+            base = replace(base, sort=[Sort(field=f, direction=1) for f in group_by.fields])
+        searches = [base] if partitions is None else [
+            replace(base, filters=list(base.filters or []) + (p if isinstance(p, list) else [p]))
+            for p in partitions
+        ]
+
+        def fetch(search: BshSearch) -> List[Any]:
+            if not grouped:
+                response = self.search(search, entity=entity_name)
+                return response.data if response else []
+            return list(iter_pages(lambda s: self.search(s, entity=entity_name), search, page_size))
+
+        if len(searches) == 1:
+            merger.add(fetch(searches[0]))
+        else:
+            for result in executor_for(self.client).map(fetch, searches, concurrency=concurrency, fail_fast=True):
+                merger.add(result.value)
+        return merger.result()
+
     def create(
         self,
         payload: Any,
@@ -43,7 +310,7 @@ class EntityService:
     ) -> Optional[BshResponse]:
         """Create a new entity"""
         entity_name = entity or self.entity
-        return self.client.post(
+        response = self.client.post(
             BshClientFnParams(
                 path=f"{self.base_endpoint}/{entity_name}",
                 options={
@@ -56,6 +323,7 @@ class EntityService:
                 api=f"entities.{entity_name}.create",
             )
         )
+        return self._written(entity_name, response)
 
     def create_many(
         self,
@@ -66,7 +334,7 @@ class EntityService:
     ) -> Optional[BshResponse]:
         """Create multiple entities in batch"""
         entity_name = entity or self.entity
-        return self.client.post(
+        response = self.client.post(
             BshClientFnParams(
                 path=f"{self.base_endpoint}/{entity_name}/batch",
                 options={
@@ -79,6 +347,7 @@ class EntityService:
                 api=f"entities.{entity_name}.createMany",
             )
         )
+        return self._written(entity_name, response)
 
     def update(
         self,
@@ -89,7 +358,7 @@ class EntityService:
     ) -> Optional[BshResponse]:
         """Update an existing entity"""
         entity_name = entity or self.entity
-        return self.client.put(
+        response = self.client.put(
             BshClientFnParams(
                 path=f"{self.base_endpoint}/{entity_name}",
                 options={
@@ -102,6 +371,7 @@ class EntityService:
                 api=f"entities.{entity_name}.update",
             )
         )
+        return self._written(entity_name, response)
 
     def update_many(
         self,
@@ -112,7 +382,7 @@ class EntityService:
     ) -> Optional[BshResponse]:
         """Update multiple entities in batch"""
         entity_name = entity or self.entity
-        return self.client.put(
+        response = self.client.put(
             BshClientFnParams(
                 path=f"{self.base_endpoint}/{entity_name}/batch",
                 options={
@@ -125,6 +395,7 @@ class EntityService:
                 api=f"entities.{entity_name}.updateMany",
             )
         )
+        return self._written(entity_name, response)
 
     def search(
         self,
@@ -133,10 +404,32 @@ class EntityService:
         on_success: Optional[Any] = None,
         on_error: Optional[Any] = None,
     ) -> Optional[BshResponse]:
-        """Search for entities"""
+        """Search for entities
+
+        With a query cache, ``BshSearch`` payloads are answered from cached
+        results when possible and successful responses are cached.
+        """
         entity_name = entity or self.entity
+        cache = self.cache if isinstance(payload, BshSearch) else None
+        if cache is not None:
+            cached = cache.get(entity_name, payload)
+            metrics = getattr(self.client, "metrics", None)
+            if metrics is not None:
+                metrics.cache(f"entities.{entity_name}.search", cached is not None)
+            if cached is not None:
+                if on_success:
+                    on_success(cached)
+                    return None
+                return cached
+            if on_success:
+                user_on_success = on_success
+
+                def on_success(response: BshResponse) -> None:
+                    cache.put(entity_name, payload, response)
+                    user_on_success(response)
+
         search_dict = payload.to_dict() if hasattr(payload, "to_dict") else payload
-        return self.client.post(
+        response = self.client.post(
             BshClientFnParams(
                 path=f"{self.base_endpoint}/{entity_name}/search",
                 options={
@@ -149,6 +442,9 @@ class EntityService:
                 api=f"entities.{entity_name}.search",
             )
         )
+        if cache is not None:
+            cache.put(entity_name, payload, response)
+        return response
 
     def delete(
         self,
@@ -160,7 +456,7 @@ class EntityService:
         """Delete entities by search criteria"""
         entity_name = entity or self.entity
         search_dict = payload.to_dict() if hasattr(payload, "to_dict") else payload
-        return self.client.post(
+        response = self.client.post(
             BshClientFnParams(
                 path=f"{self.base_endpoint}/{entity_name}/delete",
                 options={
@@ -173,6 +469,49 @@ class EntityService:
                 api=f"entities.{entity_name}.delete",
             )
         )
+        return self._written(entity_name, response)
+
+    def delete_many(
+        self,
+        target: Union[Iterable[Any], BshSearch],
+        entity: Optional[str] = None,
+        key: str = "id",
+        chunk_size: int = IN_CHUNK_SIZE,
+        concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        on_progress: Optional[Callable[[int, int], Any]] = None,
+    ) -> BulkDeleteReport:
+        """Delete many entities with concurrent chunked ``in`` deletes
+
+        ``target`` is a list of ids or a ``BshSearch``; for a search, the
+        matching ids are collected first so deleting cannot shift the pages
+        being read. ``on_progress(done, total)`` is called after each chunk
+        and failed chunks are reported rather than raised.
+        """
+        entity_name = entity or self.entity
+        start = time.perf_counter()
+        if isinstance(target, BshSearch):
+            ids = [row.get(key) for row in self.scan(replace(target, fields=[key]), entity_name, key=key)]
+        else:
+            ids = list(dict.fromkeys(target))
+        report = BulkDeleteReport(total=len(ids))
+
+        def delete_chunk(chunk: List[Any]) -> Optional[BshResponse]:
+            return self.delete(BshSearch(filters=[Filter(field=key, operator="in", value=chunk)]), entity_name)
+
+        done = 0
+        chunks = chunk_ids(ids, chunk_size)
+        for result in executor_for(self.client).as_completed(
+            delete_chunk, chunks, concurrency=concurrency, retry=retry, rate_limiter=rate_limiter
+        ):
+            report.results.append(result)
+            done += len(result.item)
+            if on_progress:
+                on_progress(done, report.total)
+        report.results.sort(key=lambda r: r.index)
+        report.elapsed = time.perf_counter() - start
+        return report
 
     def delete_by_id(
         self,
@@ -183,7 +522,7 @@ class EntityService:
     ) -> Optional[BshResponse]:
         """Delete a single entity by ID"""
         entity_name = entity or self.entity
-        return self.client.delete(
+        response = self.client.delete(
             BshClientFnParams(
                 path=f"{self.base_endpoint}/{entity_name}/{id}",
                 options={
@@ -195,6 +534,7 @@ class EntityService:
                 api=f"entities.{entity_name}.deleteById",
             )
         )
+        return self._written(entity_name, response)
 
     def columns(
         self,
@@ -1,7 +1,19 @@
 """Image service"""
-from typing import Optional, Any
+import json
+from typing import Optional, Any, Dict, Iterable, List, Union
 from ..client import BshClient, BshClientFnParams
-from ..types import BshResponse
+from ..client.multipart import (
+    DEFAULT_CHUNK_SIZE,
+    ProgressFn,
+    UploadSource,
+    upload_options,
+)
+from ..client.retry import RetryPolicy
+from ..types import BshResponse, BshSearch, Filter
+from ..types.bulk import BulkUploadReport
+from .bulk_upload import BulkUploader, UploadManifest
+from .entities import EntityService
+from .image_processing import ImagePreprocessor
 
 
 class ImageService:
@@ -13,36 +25,114 @@ class ImageService:
 
     def upload(
         self,
-        file_path: str,
+        file_path: UploadSource,
         namespace: Optional[str] = None,
         asset_id: Optional[str] = None,
         options: Optional[dict] = None,
         on_success: Optional[Any] = None,
         on_error: Optional[Any] = None,
+        filename: Optional[str] = None,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_progress: Optional[ProgressFn] = None,
     ) -> Optional[BshResponse]:
-        """Upload image"""
-        import os
-        with open(file_path, "rb") as f:
-            files = {"file": (os.path.basename(file_path), f)}
-            data = {}
-            if namespace:
-                data["namespace"] = namespace
-            if asset_id:
-                data["assetId"] = asset_id
-            if options:
-                import json
-                data["options"] = json.dumps(options)
-            
+        """Upload image
+
+        ``file_path`` may also be a file object, bytes/memoryview, or a
+        (async) iterable of bytes. With ``stream=True`` the body is sent as a
+        chunked multipart stream (``request_format="raw"``).
+        """
+        data = {}
+        if namespace:
+            data["namespace"] = namespace
+        if asset_id:
+            data["assetId"] = asset_id
+        if options:
+            data["options"] = json.dumps(options)
+
+        with upload_options(
+            "file",
+            file_path,
+            data=data,
+            filename=filename,
+            stream=stream,
+            chunk_size=chunk_size,
+            on_progress=on_progress,
+        ) as request_options:
             return self.client.post(
                 BshClientFnParams(
                     path=f"{self.base_endpoint}/upload",
-                    options={
-                        "response_type": "json",
-                        "request_format": "form",
-                        "body": {"files": files, "data": data},
-                    },
+                    options=request_options,
                     bsh_options={"on_success": on_success, "on_error": on_error},
                     api="image.upload",
                 )
             )
 
+    def upload_many(
+        self,
+        paths: Iterable[str],
+        namespace: Optional[str] = None,
+        options: Optional[dict] = None,
+        concurrency: int = 8,
+        manifest: Optional[Union[str, UploadManifest]] = None,
+        hash_field: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,
+        stream: bool = False,
+        batch_size: int = 256,
+        on_result: Optional[Any] = None,
+        preprocess: Union[bool, ImagePreprocessor] = False,
+    ) -> BulkUploadReport:
+        """Upload many images concurrently, skipping content already uploaded
+
+        Files are hashed in chunks and skipped when their hash is recorded in
+        ``manifest`` (an ``UploadManifest`` or a JSON file path, saved after
+        each batch), or, when ``hash_field`` is given, found on that field of
+        ``BshFiles``. Re-running an unchanged batch only stats the files.
+
+        With ``preprocess`` (``True`` or an ``ImagePreprocessor``), files that
+        need uploading are first resized and recompressed in a process pool
+        according to ``options``, once per file and outside the upload retries.
+        Deduplication uses the original file hash.
+        """
+        if not isinstance(manifest, UploadManifest):
+            manifest = UploadManifest(manifest)
+        preprocessor = preprocess if isinstance(preprocess, ImagePreprocessor) else None
+        if preprocess is True:
+            preprocessor = ImagePreprocessor(options)
+
+        def upload(source: Any) -> Optional[BshResponse]:
+            if preprocessor is None:
+                return self.upload(source, namespace=namespace, options=options, stream=stream)
+            return self.upload(
+                source.data,
+                namespace=namespace,
+                options=options,
+                filename=source.filename,
+                stream=stream,
+            )
+
+        lookup = None
+        if hash_field:
+            def lookup(hashes: List[str]) -> Dict[str, Any]:
+                response = EntityService(self.client, "BshFiles").search(
+                    BshSearch(filters=[Filter(field=hash_field, operator="in", value=hashes)])
+                )
+                rows = response.data if response else []
+                return {row[hash_field]: row for row in rows if row.get(hash_field)}
+
+        uploader = BulkUploader(
+            upload,
+            namespace=namespace,
+            concurrency=concurrency,
+            retry=retry,
+            manifest=manifest,
+            lookup=lookup,
+            batch_size=batch_size,
+            on_result=on_result,
+            prepare=preprocessor.process if preprocessor else None,
+        )
+        try:
+            return uploader.run(paths)
+        finally:
+            if preprocess is True:
+                preprocessor.close()
@@ -0,0 +1,136 @@
+"""Client-side image preprocessing before upload"""
+import io
+import os
+import threading
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Any, Dict
+from ..types import UploadOptions
+
+DEFAULT_QUALITY = 85
+
+_FORMAT_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif"}
+_FORMAT_ALIASES = {"JPG": "JPEG"}
+
+
+def pillow_available() -> bool:
+    """Whether Pillow can be imported"""
+    try:
+        import PIL.Image  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class PreprocessedImage:
+    """Image bytes ready to upload"""
+    filename: str
+    data: bytes
+    original_size: int
+    resized: bool = False
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+def preprocess_image(path: str, options: Optional[UploadOptions] = None) -> PreprocessedImage:
+    """Resize and recompress an image according to upload ``options``
+
+    Uses the ``width``/``height`` bounds (aspect ratio kept, never upscaled),
+    ``quality`` and ``format`` keys of the options. The original bytes are
+    returned when Pillow is missing or recompressing would not make the file
+    smaller. Defined at module level so it can run in a process pool.
+    """
+    options = options or {}
+    with open(path, "rb") as f:
+        original = f.read()
+    filename = os.path.basename(path)
+    if not pillow_available():
+        return PreprocessedImage(filename, original, len(original))
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(original)) as image:
+        source_format = image.format or "PNG"
+        target_format = str(options.get("format") or source_format).upper()
+        target_format = _FORMAT_ALIASES.get(target_format, target_format)
+        width = options.get("width")
+        height = options.get("height")
+        resized = False
+        if width or height:
+            bounds = (int(width or image.width), int(height or image.height))
+            if image.width > bounds[0] or image.height > bounds[1]:
+                image.thumbnail(bounds, Image.LANCZOS)
+                resized = True
+        if target_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        save_kwargs: Dict[str, Any] = {"optimize": True}
+        if target_format in ("JPEG", "WEBP"):
+            save_kwargs["quality"] = int(options.get("quality") or DEFAULT_QUALITY)
+        output = io.BytesIO()
+        image.save(output, format=target_format, **save_kwargs)
+
+    data = output.getvalue()
+    if not resized and target_format == source_format and len(data) >= len(original):
+        return PreprocessedImage(filename, original, len(original))
+    if target_format != source_format:
+        stem = os.path.splitext(filename)[0]
+        filename = f"{stem}.{_FORMAT_EXTENSIONS.get(target_format, target_format.lower())}"
+    return PreprocessedImage(filename, data, len(original), resized)
+
+
+class ImagePreprocessor:
+    """Run :func:`preprocess_image` in a process pool
+
+    The pool is created on first use with ``max_workers`` processes (CPU count
+    by default); ``max_workers=0`` processes images in the calling thread. Pass
+    an ``executor`` to share an existing pool. Without Pillow installed,
+    images are uploaded unchanged and a warning is emitted once.
+    """
+
+    def __init__(
+        self,
+        options: Optional[UploadOptions] = None,
+        max_workers: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        self.options = options or {}
+        self.max_workers = max_workers
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._lock = threading.Lock()
+        if not pillow_available():
+            warnings.warn(
+                "Pillow is not installed; images will be uploaded without preprocessing",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def process(self, path: str) -> PreprocessedImage:
+        """Preprocess one image, blocking until it is ready"""
+        if self.max_workers == 0 and self._owns_executor:
+            return preprocess_image(path, self.options)
+        return self._get_executor().submit(preprocess_image, path, self.options).result()
+
+    def close(self) -> None:
+        """Shut down the pool if this preprocessor created it"""
+        with self._lock:
+            if self._owns_executor and self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def __enter__(self) -> "ImagePreprocessor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,7 +1,23 @@
 """Mailing service"""
-from typing import Optional, Any
+import hashlib
+import json
+import time
+from typing import Optional, Any, Callable, Dict, Iterable, Union
+from ..checkpoint import Checkpoint, CompletionLog, as_checkpoint
 from ..client import BshClient, BshClientFnParams
-from ..types import BshResponse
+from ..client.rate_limit import RateLimiter
+from ..client.retry import RetryPolicy
+from ..executor import executor_for
+from ..types import BshResponse, ItemResult, SendReport
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+CHECKPOINT_EVERY = 100
+
+
+def idempotency_key(campaign: str, index: int, payload: Dict[str, Any]) -> str:
+    """Stable key for one message of a campaign"""
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"))
+    return f"{campaign}:{index}:{digest.hexdigest()[:16]}"
 
 
 class MailingService:
@@ -16,8 +32,12 @@ class MailingService:
         payload: dict,
         on_success: Optional[Any] = None,
         on_error: Optional[Any] = None,
+        idempotency_key: Optional[str] = None,
     ) -> Optional[BshResponse]:
         """Send email"""
+        headers = {"Content-Type": "application/json"}
+        if idempotency_key:
+            headers[IDEMPOTENCY_HEADER] = idempotency_key
         return self.client.post(
             BshClientFnParams(
                 path=f"{self.base_endpoint}/send",
@@ -25,10 +45,77 @@ class MailingService:
                     "response_type": "json",
                     "request_format": "json",
                     "body": payload,
-                    "headers": {"Content-Type": "application/json"},
+                    "headers": headers,
                 },
                 bsh_options={"on_success": on_success, "on_error": on_error},
                 api="mailing.send",
             )
         )
 
+    def send_many(
+        self,
+        recipients: Iterable[Any],
+        render: Optional[Callable[[Any], dict]] = None,
+        campaign: str = "send",
+        concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        checkpoint: Optional[Union[str, Checkpoint]] = None,
+        checkpoint_every: int = CHECKPOINT_EVERY,
+        on_result: Optional[Callable[[ItemResult], Any]] = None,
+    ) -> SendReport:
+        """Send one email per recipient concurrently, resuming from a checkpoint
+
+        ``recipients`` is consumed lazily; ``render`` turns a recipient into
+        the send payload (recipients are payloads when omitted) and only runs
+        for messages that are actually sent. Every message carries an
+        ``Idempotency-Key`` derived from ``campaign``, its position and its
+        payload, so retries and a resumed run re-sending messages that were
+        in flight during a crash can be deduplicated. With ``checkpoint`` (a
+        path or :class:`~bshengine.checkpoint.Checkpoint`), completed
+        positions are saved every ``checkpoint_every`` sends and skipped on
+        the next run. Failed messages are reported, not raised, and retried
+        by the next run.
+        """
+        store = as_checkpoint(checkpoint)
+        state = store.load() if store else None
+        if state and state.get("campaign") not in (None, campaign):
+            raise ValueError(f"Checkpoint belongs to campaign {state['campaign']!r}, not {campaign!r}")
+        log = CompletionLog.from_state(state)
+        report = SendReport()
+        start = time.perf_counter()
+
+        def pending() -> Iterable[Any]:
+            for index, recipient in enumerate(recipients):
+                if index in log:
+                    report.skipped += 1
+                else:
+                    yield index, recipient
+
+        def deliver(item: Any) -> Optional[BshResponse]:
+            index, recipient = item
+            payload = render(recipient) if render else recipient
+            return self.send(payload, idempotency_key=idempotency_key(campaign, index, payload))
+
+        def save() -> None:
+            if store:
+                store.save({"campaign": campaign, **log.state()})
+
+        try:
+            for result in executor_for(self.client).as_completed(
+                deliver, pending(), concurrency=concurrency, retry=retry, rate_limiter=rate_limiter
+            ):
+                if result.ok:
+                    log.mark(result.item[0])
+                    report.sent += 1
+                    report.durations.append(result.duration)
+                    if report.sent % checkpoint_every == 0:
+                        save()
+                else:
+                    report.failed.append(result)
+                if on_result:
+                    on_result(result)
+        finally:
+            save()
+            report.elapsed = time.perf_counter() - start
+        return report
@@ -0,0 +1,251 @@
+"""Local read replicas of small, rarely changing entities"""
+import logging
+import threading
+from typing import Optional, Any, Callable, Dict, Iterable, List
+from ..types import BshSearch, Filter, Sort, Pagination
+from ..query.evaluator import FIRST_PAGE, evaluate
+from ..query.index import IndexedCollection
+from .entities import EntityService
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_ENTITIES = ("BshTypes", "BshSchemas", "BshRoles", "BshPolicies", "BshConfigurations")
+DEFAULT_PAGE_SIZE = 500
+
+ChangeListener = Callable[[str, List[Dict[str, Any]], List[Dict[str, Any]]], None]
+
+
+class EntityReplica:
+    """In-memory copy of an entity, indexed by key and selected fields
+
+    ``indexes`` get hash indexes (equality) and ``sorted_indexes`` sorted
+    ones (ranges and ``starts``); :meth:`search` evaluates a ``BshSearch``
+    locally through them.
+
+    :meth:`load` fetches every record; :meth:`refresh` only fetches records
+    whose ``updated_field`` is at or after the newest value seen so far.
+    Polling cannot see deletions, so ``refresh(full=True)`` reloads everything
+    and drops records that disappeared. Listeners are called with
+    ``(entity, changed, removed)`` after each sync that changed something.
+    """
+
+    def __init__(
+        self,
+        service: EntityService,
+        entity: Optional[str] = None,
+        key: str = "id",
+        updated_field: str = "updatedAt",
+        indexes: Iterable[str] = (),
+        page_size: int = DEFAULT_PAGE_SIZE,
+        sorted_indexes: Iterable[str] = (),
+    ):
+        self.service = service.uncached()
+        self.entity = entity or service.entity
+        self.key = key
+        self.updated_field = updated_field
+        self.page_size = page_size
+        self.loaded = False
+        self.watermark: Any = None
+        self.records = IndexedCollection(key=key, hash_indexes=indexes, sorted_indexes=sorted_indexes)
+        self._listeners: List[ChangeListener] = []
+        self._lock = threading.RLock()
+
+    def on_change(self, listener: ChangeListener) -> ChangeListener:
+        """Register a listener; usable as a decorator"""
+        self._listeners.append(listener)
+        return listener
+
+    def _fetch(self, filters: Optional[List[Filter]]) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        page = FIRST_PAGE
+        while True:
+            response = self.service.search(
+                BshSearch(
+                    filters=filters,
+                    sort=[Sort(field=self.updated_field, direction=1), Sort(field=self.key, direction=1)],
+                    pagination=Pagination(page=page, size=self.page_size),
+                ),
+                entity=self.entity,
+            )
+            data = response.data if response else []
+            rows.extend(data)
+            if len(data) < self.page_size:
+                return rows
+            page += 1
+
+    def _apply(self, rows: List[Dict[str, Any]], full: bool) -> None:
+        changed: List[Dict[str, Any]] = []
+        removed: List[Dict[str, Any]] = []
+        with self._lock:
+            seen = set()
+            for row in rows:
+                key = row.get(self.key)
+                seen.add(key)
+                if self.records.get(key) == row:
+                    continue
+                self.records.upsert(row)
+                changed.append(row)
+            if full:
+                for key in [k for k in self.records.keys() if k not in seen]:
+                    removed.append(self.records.remove(key))
+            for row in rows:
+                updated = row.get(self.updated_field)
+                if updated is not None and (self.watermark is None or updated > self.watermark):
+                    self.watermark = updated
+            self.loaded = True
+        if changed or removed:
+            for listener in list(self._listeners):
+                listener(self.entity, changed, removed)
+
+    def load(self) -> "EntityReplica":
+        """Fetch every record, replacing the local copy"""
+        self._apply(self._fetch(None), full=True)
+        return self
+
+    def refresh(self, full: bool = False) -> "EntityReplica":
+        """Fetch records changed since the last sync (or everything when ``full``)"""
+        if full or not self.loaded or self.watermark is None:
+            return self.load()
+        # gte rather than gt: records sharing the watermark may not all have been seen
+        since = Filter(field=self.updated_field, operator="gte", value=self.watermark)
+        self._apply(self._fetch([since]), full=False)
+        return self
+
+    def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        """Return the record with the given key"""
+        return self.records.get(key)
+
+    def find(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        """Return records whose ``field`` equals ``value``"""
+        with self._lock:
+            return self.records.find(field, value)
+
+    def find_one(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Return one record whose ``field`` equals ``value``"""
+        found = self.find(field, value)
+        return found[0] if found else None
+
+    def search(self, search: BshSearch) -> List[Dict[str, Any]]:
+        """Evaluate ``search`` against the local records"""
+        with self._lock:
+            return evaluate(search, self.records)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Return every record"""
+        return self.records.rows
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.records
+
+
+class ReplicaManager:
+    """Keep replicas of reference entities in sync
+
+    ``manager.start()`` loads every replica and polls for changes every
+    ``interval`` seconds on a daemon thread; a full reload (which also picks
+    up deletions) runs every ``full_every`` polls. Errors during polling go to
+    ``on_error``, or are logged without it, and polling continues.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        entities: Iterable[str] = REFERENCE_ENTITIES,
+        interval: float = 30.0,
+        key: str = "id",
+        keys: Optional[Dict[str, str]] = None,
+        updated_field: str = "updatedAt",
+        indexes: Optional[Dict[str, Iterable[str]]] = None,
+        sorted_indexes: Optional[Dict[str, Iterable[str]]] = None,
+        full_every: int = 20,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.engine = engine
+        self.interval = interval
+        self.full_every = full_every
+        self.on_error = on_error
+        self.replicas: Dict[str, EntityReplica] = {
+            entity: EntityReplica(
+                engine.entity(entity),
+                key=(keys or {}).get(entity, key),
+                updated_field=updated_field,
+                indexes=(indexes or {}).get(entity, ()),
+                sorted_indexes=(sorted_indexes or {}).get(entity, ()),
+            )
+            for entity in entities
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._polls = 0
+
+    def __getitem__(self, entity: str) -> EntityReplica:
+        return self.replicas[entity]
+
+    def get(self, entity: str, key: Any) -> Optional[Dict[str, Any]]:
+        """Return a record of ``entity`` by key"""
+        return self.replicas[entity].get(key)
+
+    def on_change(self, listener: ChangeListener) -> ChangeListener:
+        """Register a listener on every replica"""
+        for replica in self.replicas.values():
+            replica.on_change(listener)
+        return listener
+
+    def load(self) -> "ReplicaManager":
+        """Fully load every replica"""
+        for replica in self.replicas.values():
+            replica.load()
+        return self
+
+    def refresh(self, full: bool = False) -> "ReplicaManager":
+        """Incrementally refresh every replica
+
+        A failing replica does not stop the others from refreshing; errors
+        are then passed to ``on_error``, or the first one is raised.
+        """
+        errors: List[Exception] = []
+        for replica in self.replicas.values():
+            try:
+                replica.refresh(full=full)
+            except Exception as e:
+                errors.append(e)
+        for error in errors:
+            if not self.on_error:
+                raise error
+            self.on_error(error)
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._polls += 1
+            full = bool(self.full_every) and self._polls % self.full_every == 0
+            try:
+                self.refresh(full=full)
+            except Exception:
+                # Raised by refresh without on_error, or by on_error itself
+                logger.exception("Replica refresh failed")
+
+    def start(self) -> "ReplicaManager":
+        """Load the replicas and start polling"""
+        self.load()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="bsh-replicas", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop polling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ReplicaManager":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -1,8 +1,15 @@
 """User service"""
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Iterator
 from urllib.parse import urlencode
 from ..client import BshClient, BshClientFnParams
+from ..client.multipart import (
+    DEFAULT_CHUNK_SIZE,
+    ProgressFn,
+    UploadSource,
+    upload_options,
+)
 from ..types import BshResponse, BshSearch
+from .entities import SCAN_PAGE_SIZE, iter_pages
 
 
 class UserService:
@@ -74,22 +81,30 @@ class UserService:
 
     def update_picture(
         self,
-        file_path: str,
+        file_path: UploadSource,
         on_success: Optional[Any] = None,
         on_error: Optional[Any] = None,
+        filename: Optional[str] = None,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_progress: Optional[ProgressFn] = None,
     ) -> Optional[BshResponse]:
-        """Update user picture"""
-        import os
-        with open(file_path, "rb") as f:
-            files = {"picture": (os.path.basename(file_path), f)}
+        """Update user picture
+
+        Accepts the same sources and streaming options as ``ImageService.upload``.
+        """
+        with upload_options(
+            "picture",
+            file_path,
+            filename=filename,
+            stream=stream,
+            chunk_size=chunk_size,
+            on_progress=on_progress,
+        ) as request_options:
             return self.client.post(
                 BshClientFnParams(
                     path=f"{self.base_endpoint}/picture",
-                    options={
-                        "response_type": "json",
-                        "request_format": "form",
-                        "body": {"files": files},
-                    },
+                    options=request_options,
                     bsh_options={"on_success": on_success, "on_error": on_error},
                     api="user.updatePicture",
                 )
@@ -157,6 +172,15 @@ class UserService:
             )
         )
 
+    def scan(
+        self,
+        payload: Optional[BshSearch] = None,
+        page_size: int = SCAN_PAGE_SIZE,
+        key: str = "id",
+    ) -> Iterator[Any]:
+        """Iterate over every user matching ``payload``, one page at a time"""
+        return iter_pages(self.search, payload, page_size, key)
+
     def list(
         self,
         query_params: Optional[Dict[str, str]] = None,
@@ -0,0 +1,115 @@
+"""Reconcile a desired set of users with the server"""
+import time
+from typing import Optional, Any, Dict, Iterable, List, Tuple
+from ..client.rate_limit import RateLimiter
+from ..client.retry import RetryPolicy
+from ..executor import executor_for
+from ..types import BshSearch, UserSyncReport
+from .entities import SCAN_PAGE_SIZE
+from .user import UserService
+
+Operation = Tuple[str, Any, Dict[str, Any]]
+
+
+class UserSync:
+    """Apply only the differences between desired users and existing ones
+
+    Existing users are read with one paginated scan of ``users.search``
+    (limited to ``scope`` when given) and matched to desired users on
+    ``key``. Missing users are created with ``init``, users whose
+    ``fields`` (default: every desired field) differ are updated with the
+    existing record merged with the desired one, and with ``delete_missing``
+    users in scope that are not desired are deleted. Writes run
+    concurrently on the engine executor; a sync with nothing to change
+    costs the scan alone.
+    """
+
+    def __init__(
+        self,
+        users: UserService,
+        key: str = "email",
+        id_field: str = "id",
+        fields: Optional[Iterable[str]] = None,
+        delete_missing: bool = False,
+        concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        page_size: int = SCAN_PAGE_SIZE,
+        dry_run: bool = False,
+    ):
+        self.users = users
+        self.key = key
+        self.id_field = id_field
+        self.fields = list(fields) if fields is not None else None
+        self.delete_missing = delete_missing
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.page_size = page_size
+        self.dry_run = dry_run
+
+    def _changed(self, existing: Dict[str, Any], desired: Dict[str, Any]) -> bool:
+        fields = self.fields if self.fields is not None else desired.keys()
+        return any(existing.get(f) != desired.get(f) for f in fields if f in desired)
+
+    def plan(
+        self,
+        desired: Iterable[Dict[str, Any]],
+        scope: Optional[BshSearch] = None,
+        report: Optional[UserSyncReport] = None,
+    ) -> List[Operation]:
+        """Return the ``(action, key, payload)`` writes needed to reach ``desired``"""
+        report = report if report is not None else UserSyncReport()
+        wanted = {user[self.key]: user for user in desired}
+        existing: Dict[Any, Dict[str, Any]] = {}
+        for user in self.users.scan(scope, page_size=self.page_size, key=self.id_field):
+            existing[user.get(self.key)] = user
+        report.scanned = len(existing)
+
+        operations: List[Operation] = []
+        for key, user in wanted.items():
+            current = existing.get(key)
+            if current is None:
+                operations.append(("create", key, user))
+            elif self._changed(current, user):
+                operations.append(("update", key, {**current, **user}))
+            else:
+                report.unchanged += 1
+        if self.delete_missing:
+            for key, user in existing.items():
+                if key not in wanted:
+                    operations.append(("delete", key, user))
+        return operations
+
+    def _apply(self, operation: Operation) -> Any:
+        action, _, payload = operation
+        if action == "create":
+            return self.users.init(payload)
+        if action == "update":
+            return self.users.update(payload)
+        return self.users.delete_by_id(payload[self.id_field])
+
+    def run(self, desired: Iterable[Dict[str, Any]], scope: Optional[BshSearch] = None) -> UserSyncReport:
+        """Reconcile and return a summary; failed writes are reported, not raised"""
+        start = time.perf_counter()
+        report = UserSyncReport()
+        operations = self.plan(desired, scope, report)
+        outcome = {"create": report.created, "update": report.updated, "delete": report.deleted}
+        if self.dry_run:
+            for action, key, _ in operations:
+                outcome[action].append(key)
+        else:
+            for result in executor_for(self.users.client).as_completed(
+                self._apply,
+                operations,
+                concurrency=self.concurrency,
+                retry=self.retry,
+                rate_limiter=self.rate_limiter,
+            ):
+                action, key, _ = result.item
+                if result.ok:
+                    outcome[action].append(key)
+                else:
+                    report.failed.append(result)
+        report.elapsed = time.perf_counter() - start
+        return report
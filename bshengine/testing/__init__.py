@@ -0,0 +1,11 @@
+"""Local BSH Engine stand-in and transport for tests and benchmarks"""
+from .stub_server import StubServer, filter_from_dict, search_from_dict
+from .transport import HttpTransport, TransportResponse
+
+__all__ = [
+    "StubServer",
+    "filter_from_dict",
+    "search_from_dict",
+    "HttpTransport",
+    "TransportResponse",
+]
@@ -0,0 +1,322 @@
+"""Local stand-in for a BSH Engine HTTP server, for tests and benchmarks"""
+import csv
+import gzip
+import io
+import itertools
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from ..query.evaluator import evaluate, filter_rows
+from ..types.search import Aggregate, BshSearch, Filter, GroupBy, Pagination, Sort
+
+USERS = "BshUsers"
+
+Row = Dict[str, Any]
+Reply = Tuple[int, Any]
+
+
+def filter_from_dict(data: Dict[str, Any]) -> Filter:
+    """Build a :class:`Filter` from its JSON form"""
+    subs = data.get("filters")
+    return Filter(
+        operator=data.get("operator"),
+        field=data.get("field"),
+        value=data.get("value"),
+        type=data.get("type"),
+        filters=[filter_from_dict(f) for f in subs] if subs else None,
+    )
+
+
+def search_from_dict(data: Optional[Dict[str, Any]]) -> BshSearch:
+    """Build a :class:`BshSearch` from its JSON form (the inverse of ``to_dict``)"""
+    data = data or {}
+    group_by = data.get("groupBy")
+    pagination = data.get("pagination")
+    return BshSearch(
+        entity=data.get("entity"),
+        alias=data.get("alias"),
+        fields=data.get("fields"),
+        filters=[filter_from_dict(f) for f in data["filters"]] if data.get("filters") else None,
+        group_by=GroupBy(
+            fields=group_by.get("fields"),
+            aggregate=[Aggregate(**a) for a in group_by.get("aggregate") or []] or None,
+        ) if group_by else None,
+        sort=[Sort(s.get("field"), s.get("direction")) for s in data["sort"]] if data.get("sort") else None,
+        pagination=Pagination(pagination.get("page"), pagination.get("size")) if pagination else None,
+        from_=search_from_dict(data["from"]) if data.get("from") else None,
+    )
+
+
+class StubServer:
+    """In-memory BSH Engine serving ``/api/entities/*``, ``/api/auth/*``, ``/api/users/*`` and friends
+
+    Entities live in :attr:`tables` (users in ``BshUsers``); searches, counts
+    and deletes are evaluated locally with the SDK's query evaluator. Other
+    ``/api`` endpoints answer with an empty success envelope.
+
+    Every request waits ``latency`` seconds plus up to ``jitter`` more, fails
+    with a 503 with probability ``error_rate``, and every row read back is
+    padded with a ``padding`` field of ``payload_size`` characters. The
+    settings can be changed while the server runs. ``port=0`` picks a free
+    port; the base URL is :attr:`url`.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        payload_size: int = 0,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.payload_size = payload_size
+        self.tables: Dict[str, List[Row]] = {USERS: []}
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._address = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes: List[Tuple[str, "re.Pattern", Callable[..., Reply]]] = [
+            ("POST", re.compile(r"/api/auth/(login|register|refresh)"), self._auth),
+            ("GET", re.compile(r"/api/users/me"), self._me),
+            ("GET", re.compile(r"/api/users/count"), lambda body: self._count(USERS, None)),
+            ("POST", re.compile(r"/api/users/count"), lambda body: self._count(USERS, body)),
+            ("POST", re.compile(r"/api/users/search"), lambda body: self._search(USERS, body)),
+            ("GET", re.compile(r"/api/users/([^/]+)"), lambda body, id: self._get(USERS, id)),
+            ("PUT", re.compile(r"/api/users"), lambda body: self._update(USERS, body)),
+            ("POST", re.compile(r"/api/entities/([^/]+)/batch"), self._create),
+            ("PUT", re.compile(r"/api/entities/([^/]+)/batch"), self._update),
+            ("POST", re.compile(r"/api/entities/([^/]+)/search"), self._search),
+            ("POST", re.compile(r"/api/entities/([^/]+)/delete"), self._delete),
+            ("GET", re.compile(r"/api/entities/([^/]+)/columns"), self._columns),
+            ("GET", re.compile(r"/api/entities/([^/]+)/count"), lambda body, entity: self._count(entity, None)),
+            ("POST", re.compile(r"/api/entities/([^/]+)/count"), lambda body, entity: self._count(entity, body)),
+            ("GET", re.compile(r"/api/entities/([^/]+)/([^/]+)"), lambda body, entity, id: self._get(entity, id)),
+            ("DELETE", re.compile(r"/api/entities/([^/]+)/([^/]+)"), self._delete_by_id),
+            ("POST", re.compile(r"/api/entities/([^/]+)"), self._create),
+            ("PUT", re.compile(r"/api/entities/([^/]+)"), self._update),
+        ]
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2] if self._server else self._address
+        return f"http://{host}:{port}"
+
+    def seed(self, entity: str, rows: List[Row]) -> None:
+        """Insert ``rows`` into ``entity``, assigning ids to rows without one"""
+        self._create(rows, entity)
+
+    def start(self) -> "StubServer":
+        if self._server is not None:
+            return self
+        stub = self
+
+        class Handler(_Handler):
+            server_stub = stub
+
+        self._server = ThreadingHTTPServer(self._address, Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="bsh-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            self._thread.join()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def handle(self, method: str, path: str, body: Any) -> Reply:
+        """Answer one request: status and JSON envelope, or bytes for exports"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            with self._lock:
+                self.errors += 1
+            return 503, _envelope([], 503, "SERVICE_UNAVAILABLE", error="Injected failure")
+        url = urlsplit(path)
+        export = re.fullmatch(r"/api/entities/([^/]+)/export", url.path)
+        if export and method == "POST":
+            return 200, self._export(export.group(1), body, parse_qs(url.query).get("format", ["csv"])[0])
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(url.path)
+            if route_method == method and match:
+                try:
+                    return handler(body, *match.groups())
+                except (KeyError, TypeError, ValueError) as e:
+                    return 400, _envelope([], 400, "BAD_REQUEST", error=str(e))
+        if url.path.startswith("/api/"):
+            return 200, _envelope([])
+        return 404, _envelope([], 404, "NOT_FOUND", error=f"No route for {method} {url.path}")
+
+    def _table(self, entity: str) -> List[Row]:
+        return self.tables.setdefault(entity, [])
+
+    def _padded(self, rows: List[Row]) -> List[Row]:
+        if not self.payload_size:
+            return rows
+        padding = "x" * self.payload_size
+        return [{**row, "padding": padding} for row in rows]
+
+    def _auth(self, body: Any, action: str) -> Reply:
+        email = (body or {}).get("email", "user@stub.local")
+        if action == "register":
+            with self._lock:
+                return 200, _envelope(self._insert(USERS, [{"email": email}]))
+        token = f"stub.{next(self._ids)}"
+        return 200, _envelope([{"access": token, "refresh": token + ".refresh"}])
+
+    def _me(self, body: Any) -> Reply:
+        with self._lock:
+            users = self._table(USERS)
+            if not users:
+                self._insert(USERS, [{"email": "user@stub.local"}])
+            return 200, _envelope(self._padded(users[:1]))
+
+    def _insert(self, entity: str, rows: List[Row]) -> List[Row]:
+        table = self._table(entity)
+        created = []
+        for row in rows:
+            row = dict(row)
+            if row.get("id") is None:
+                row["id"] = next(self._ids)
+            table.append(row)
+            created.append(row)
+        return created
+
+    def _create(self, body: Any, entity: str) -> Reply:
+        rows = body if isinstance(body, list) else [body]
+        with self._lock:
+            return 200, _envelope(self._insert(entity, rows))
+
+    def _update(self, body: Any, entity: str) -> Reply:
+        rows = body if isinstance(body, list) else [body]
+        updated = []
+        with self._lock:
+            by_id = {row["id"]: row for row in self._table(entity)}
+            for row in rows:
+                current = by_id.get(row.get("id"))
+                if current is not None:
+                    current.update(row)
+                    updated.append(dict(current))
+        return 200, _envelope(updated)
+
+    def _get(self, entity: str, id: str) -> Reply:
+        with self._lock:
+            rows = [row for row in self._table(entity) if str(row.get("id")) == id]
+        if not rows:
+            return 404, _envelope([], 404, "NOT_FOUND", error=f"{entity} {id} not found")
+        return 200, _envelope(self._padded(rows))
+
+    def _search(self, body: Any, entity: str) -> Reply:
+        with self._lock:
+            rows = list(self._table(entity))
+        return 200, _envelope(self._padded(evaluate(search_from_dict(body), rows)))
+
+    def _count(self, entity: str, body: Any) -> Reply:
+        with self._lock:
+            rows = list(self._table(entity))
+        count = len(filter_rows(rows, search_from_dict(body).filters))
+        return 200, _envelope([{"count": count}])
+
+    def _delete(self, body: Any, entity: str) -> Reply:
+        with self._lock:
+            table = self._table(entity)
+            deleted = filter_rows(table, search_from_dict(body).filters)
+            gone = {id(row) for row in deleted}
+            table[:] = [row for row in table if id(row) not in gone]
+        return 200, _envelope(deleted)
+
+    def _delete_by_id(self, body: Any, entity: str, id: str) -> Reply:
+        with self._lock:
+            table = self._table(entity)
+            deleted = [row for row in table if str(row.get("id")) == id]
+            table[:] = [row for row in table if str(row.get("id")) != id]
+        return 200, _envelope(deleted)
+
+    def _columns(self, body: Any, entity: str) -> Reply:
+        with self._lock:
+            names = sorted({key for row in self._table(entity) for key in row})
+        return 200, _envelope([{"name": name} for name in names])
+
+    def _export(self, entity: str, body: Any, format: str) -> bytes:
+        search = search_from_dict(body)
+        search.pagination = None
+        with self._lock:
+            rows = self._padded(evaluate(search, list(self._table(entity))))
+        if format == "json":
+            return json.dumps(rows, default=str).encode("utf-8")
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=sorted({key for row in rows for key in row}))
+        writer.writeheader()
+        writer.writerows(rows)
+        return out.getvalue().encode("utf-8")
+
+
+def _envelope(data: List[Any], code: int = 200, status: str = "OK", error: Optional[str] = None) -> Dict[str, Any]:
+    envelope = {"data": data, "code": code, "status": status, "timestamp": int(time.time() * 1000)}
+    if error:
+        envelope["error"] = error
+    return envelope
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Decode requests for :meth:`StubServer.handle` and write its replies"""
+
+    server_stub: StubServer
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body are written separately; don't let Nagle delay the body
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _serve(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        body: Any = None
+        if raw and "json" in (self.headers.get("Content-Type") or ""):
+            body = json.loads(raw)
+        status, reply = self.server_stub.handle(self.command, self.path, body)
+        if isinstance(reply, bytes):
+            content, content_type = reply, "application/octet-stream"
+        else:
+            content, content_type = json.dumps(reply, default=str).encode("utf-8"), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _serve
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
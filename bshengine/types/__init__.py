@@ -5,13 +5,27 @@ from .search import (
     Filter,
     GroupBy,
     Aggregate,
+    AggregateResult,
+    CountEstimate,
     Sort,
     Pagination,
     LogicalOperator,
     ComparisonOperator,
     AggregateFunction,
+    Param,
+    CompiledSearch,
 )
 from .auth import AuthToken, LoginParams, AuthTokens
+from .bulk import (
+    UploadResult,
+    BulkUploadReport,
+    ItemResult,
+    BulkDeleteReport,
+    UserSyncReport,
+    SendReport,
+    JobReport,
+    LoadReport,
+)
 from .core import (
     BshUser,
     BshUserInit,
@@ -46,14 +60,26 @@ __all__ = [
     "Filter",
     "GroupBy",
     "Aggregate",
+    "AggregateResult",
+    "CountEstimate",
     "Sort",
     "Pagination",
     "LogicalOperator",
     "ComparisonOperator",
     "AggregateFunction",
+    "Param",
+    "CompiledSearch",
     "AuthToken",
     "LoginParams",
     "AuthTokens",
+    "UploadResult",
+    "BulkUploadReport",
+    "ItemResult",
+    "BulkDeleteReport",
+    "UserSyncReport",
+    "SendReport",
+    "JobReport",
+    "LoadReport",
     "BshUser",
     "BshUserInit",
     "BshEntities",
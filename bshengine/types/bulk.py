@@ -0,0 +1,198 @@
+"""Result types for bulk operations"""
+from typing import Optional, List, Any, Dict, Literal
+from dataclasses import dataclass, field
+
+UploadStatus = Literal["uploaded", "skipped", "failed"]
+
+
+@dataclass
+class UploadResult:
+    """Outcome of uploading a single file"""
+    source: str
+    status: UploadStatus
+    hash: Optional[str] = None
+    size: int = 0
+    data: Optional[Any] = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class BulkUploadReport:
+    """Summary of a bulk upload run"""
+    results: List[UploadResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def _with_status(self, status: str) -> List[UploadResult]:
+        return [r for r in self.results if r.status == status]
+
+    @property
+    def uploaded(self) -> List[UploadResult]:
+        return self._with_status("uploaded")
+
+    @property
+    def skipped(self) -> List[UploadResult]:
+        return self._with_status("skipped")
+
+    @property
+    def failed(self) -> List[UploadResult]:
+        return self._with_status("failed")
+
+    @property
+    def bytes_uploaded(self) -> int:
+        return sum(r.size for r in self.uploaded)
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_uploaded / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class ItemResult:
+    """Outcome of calling a function on one item of a fan-out"""
+    index: int
+    item: Any
+    value: Optional[Any] = None
+    error: Optional[BaseException] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkDeleteReport:
+    """Summary of a chunked bulk delete; one result per chunk of ids"""
+    results: List[ItemResult] = field(default_factory=list)
+    total: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def deleted(self) -> int:
+        return sum(len(r.item) for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> List[ItemResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def failed_ids(self) -> List[Any]:
+        return [id for r in self.failed for id in r.item]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+@dataclass
+class UserSyncReport:
+    """Reconciliation summary of a user sync; keys are the sync key values"""
+    created: List[Any] = field(default_factory=list)
+    updated: List[Any] = field(default_factory=list)
+    deleted: List[Any] = field(default_factory=list)
+    unchanged: int = 0
+    scanned: int = 0
+    failed: List[ItemResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def writes(self) -> int:
+        return len(self.created) + len(self.updated) + len(self.deleted)
+
+    def summary(self) -> dict:
+        return {
+            "scanned": self.scanned,
+            "created": len(self.created),
+            "updated": len(self.updated),
+            "deleted": len(self.deleted),
+            "unchanged": self.unchanged,
+            "failed": len(self.failed),
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+@dataclass
+class SendReport:
+    """Summary of a mass send; ``skipped`` were already sent by a previous run"""
+    sent: int = 0
+    skipped: int = 0
+    failed: List[ItemResult] = field(default_factory=list)
+    durations: List[float] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def latency(self, quantile: float = 0.5) -> float:
+        """Send latency at ``quantile`` (0-1), in seconds"""
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+@dataclass
+class JobReport:
+    """Summary of one run of a resumable job"""
+    processed: int = 0
+    skipped: int = 0
+    failed: List[ItemResult] = field(default_factory=list)
+    resumed: bool = False
+    completed: bool = False
+    checkpoints: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class LoadReport:
+    """Outcome of a load test, per ``api`` name
+
+    ``latencies`` holds one ``HdrHistogram`` per api and ``errors`` counts
+    failures by HTTP status or exception type.
+    """
+    latencies: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return sum(h.count for h in self.latencies.values())
+
+    @property
+    def failed(self) -> int:
+        return sum(sum(counts.values()) for counts in self.errors.values())
+
+    @property
+    def error_rate(self) -> float:
+        return self.failed / self.requests if self.requests else 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def summary(self, percentiles: Any = (50, 90, 99, 99.9)) -> dict:
+        """Throughput, latency percentiles in milliseconds and errors, per api"""
+        apis = {}
+        for api, histogram in sorted(self.latencies.items()):
+            apis[api] = {
+                "requests": histogram.count,
+                "per_second": round(histogram.count / self.elapsed, 2) if self.elapsed else 0.0,
+                "errors": dict(self.errors.get(api, {})),
+                "latency_ms": {
+                    f"p{p:g}": round(histogram.percentile(p) * 1000, 3) for p in percentiles
+                } if histogram.count else {},
+            }
+        return {
+            "requests": self.requests,
+            "failed": self.failed,
+            "elapsed": round(self.elapsed, 3),
+            "per_second": round(self.per_second, 2),
+            "apis": apis,
+        }
@@ -1,5 +1,6 @@
 """Search and filter types"""
-from typing import Optional, List, Union, Literal, Any
+import json
+from typing import Optional, List, Union, Literal, Any, Dict, Tuple
 from dataclasses import dataclass, field
 
 LogicalOperator = Literal["and", "or", "AND", "OR"]
@@ -16,6 +17,24 @@ ComparisonOperator = Literal[
 AggregateFunction = Literal["COUNT", "SUM", "AVG", "MIN", "MAX"]
 
 
+class Param:
+    """Placeholder for a value bound later on a compiled search"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Param({self.name!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Param) and other.name == self.name
+
+    def __hash__(self) -> int:
+        return hash((Param, self.name))
+
+
 @dataclass
 class Filter:
     """Filter criteria for search"""
@@ -55,6 +74,34 @@ class Pagination:
     size: Optional[int] = None
 
 
+@dataclass
+class AggregateResult:
+    """Columnar result of an aggregation: one list per group field and aggregate"""
+    columns: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def __getitem__(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Return the result as one dict per group"""
+        names = list(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+
+@dataclass
+class CountEstimate:
+    """Estimated count with a confidence interval; ``low == high == value`` when exact"""
+    value: int
+    low: int
+    high: int
+    exact: bool = False
+    confidence: float = 0.95
+    sampled: int = 0
+
+
 @dataclass
 class BshSearch:
     """Search query structure"""
@@ -96,6 +143,10 @@ class BshSearch:
             result["from"] = self.from_.to_dict()
         return result
 
+    def compile(self) -> "CompiledSearch":
+        """Pre-serialize this search into a template with :class:`Param` slots"""
+        return CompiledSearch(self.to_dict())
+
     def _filter_to_dict(self, f: Filter) -> dict:
         """Convert filter to dictionary"""
         result = {}
@@ -127,3 +178,138 @@ class BshSearch:
             ]
         return result
 
+
+
+def _find_params(node: Any) -> Optional[Dict[Any, Any]]:
+    """Map keys/indexes of ``node`` leading to params, or None if there are none"""
+    if isinstance(node, dict):
+        items = node.items()
+    elif isinstance(node, list):
+        items = enumerate(node)
+    else:
+        return None
+    spine: Dict[Any, Any] = {}
+    for key, value in items:
+        if isinstance(value, Param):
+            spine[key] = value
+        else:
+            sub = _find_params(value)
+            if sub:
+                spine[key] = sub
+    return spine
+
+
+def _bind(node: Any, spine: Dict[Any, Any], values: Dict[str, Any]) -> Any:
+    """Copy only the containers on the way to params, sharing everything else"""
+    copy = list(node) if isinstance(node, list) else dict(node)
+    for key, sub in spine.items():
+        if isinstance(sub, Param):
+            copy[key] = values[sub.name]
+        else:
+            copy[key] = _bind(node[key], sub, values)
+    return copy
+
+
+def _read_only(*args: Any, **kwargs: Any) -> None:
+    raise TypeError("Compiled search templates are read-only; copy the part to change")
+
+
+class _ReadOnlyDict(dict):
+    """Template dict shared by bound searches; mutating it raises TypeError"""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> Any:
+        return dict, (dict(self),)
+
+
+class _ReadOnlyList(list):
+    """Template list shared by bound searches; mutating it raises TypeError"""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self) -> Any:
+        return list, (list(self),)
+
+
+def _freeze(node: Any) -> Any:
+    if isinstance(node, dict):
+        return _ReadOnlyDict((k, _freeze(v)) for k, v in node.items())
+    if isinstance(node, list):
+        return _ReadOnlyList(_freeze(v) for v in node)
+    return node
+
+
+def _replace_params(node: Any, markers: Dict[str, str]) -> Any:
+    if isinstance(node, Param):
+        return markers.setdefault(node.name, f"__bsh_param_{len(markers)}__")
+    if isinstance(node, dict):
+        return {k: _replace_params(v, markers) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_replace_params(v, markers) for v in node]
+    return node
+
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+class CompiledSearch:
+    """A search serialized once, with :class:`Param` values bound per call
+
+    ``bind`` returns a dict that shares every part of the template not leading
+    to a parameter, so its cost depends on the number of parameters rather
+    than on the size of the filter tree. The copied containers, including
+    the top-level dict, can be changed freely; the shared parts are
+    read-only and raise ``TypeError`` when mutated, so a caller cannot
+    corrupt the template for later calls (``copy.deepcopy`` gives a fully
+    mutable copy). ``bind_json`` returns the JSON body as bytes by splicing
+    encoded values between pre-encoded fragments.
+    """
+
+    def __init__(self, template: Dict[str, Any]):
+        self.template = _freeze(template)
+        self._spine = _find_params(template) or {}
+        markers: Dict[str, str] = {}
+        text = json.dumps(_replace_params(template, markers), separators=(",", ":"))
+        self.params: Tuple[str, ...] = tuple(markers)
+        by_marker = {f'"{marker}"': name for name, marker in markers.items()}
+        self._fragments: List[bytes] = []
+        self._slots: List[str] = []
+        rest = text
+        while by_marker:
+            positions = [(rest.find(m), m) for m in by_marker if m in rest]
+            if not positions:
+                break
+            index, marker = min(positions)
+            self._fragments.append(rest[:index].encode("utf-8"))
+            self._slots.append(by_marker[marker])
+            rest = rest[index + len(marker):]
+        self._fragments.append(rest.encode("utf-8"))
+
+    def _missing(self, values: Dict[str, Any]) -> ValueError:
+        missing = [name for name in self.params if name not in values]
+        return ValueError(f"Missing values for search parameters: {', '.join(missing)}")
+
+    def bind(self, **values: Any) -> Dict[str, Any]:
+        """Return the search dict with parameters replaced by ``values``"""
+        if not self._spine:
+            return dict(self.template)
+        try:
+            return _bind(self.template, self._spine, values)
+        except KeyError:
+            raise self._missing(values) from None
+
+    def bind_json(self, **values: Any) -> bytes:
+        """Return the search as compact JSON bytes with parameters bound"""
+        encode = _ENCODER.encode
+        fragments = self._fragments
+        parts = [fragments[0]]
+        try:
+            for index, name in enumerate(self._slots, 1):
+                parts.append(encode(values[name]).encode("utf-8"))
+                parts.append(fragments[index])
+        except KeyError:
+            raise self._missing(values) from None
+        return b"".join(parts)
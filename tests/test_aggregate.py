@@ -0,0 +1,132 @@
+"""Tests for aggregation pushdown and partial merging"""
+import pytest
+from unittest.mock import Mock
+from bshengine import Aggregate, BshClient, BshResponse, BshSearch, Filter, GroupBy, Pagination, Sort
+from bshengine.query import AggregateMerger, QueryBuilder, partial_group_by
+from bshengine.query.evaluator import compile_filters, group_rows, paginate, sort_rows
+from bshengine.services import EntityService
+
+ORDERS = [
+    {"id": 1, "region": "eu", "amount": 10, "year": 2023},
+    {"id": 2, "region": "eu", "amount": 30, "year": 2024},
+    {"id": 3, "region": "us", "amount": 5, "year": 2023},
+    {"id": 4, "region": "us", "amount": None, "year": 2024},
+    {"id": 5, "region": "asia", "amount": 7, "year": 2024},
+]
+
+
+def _to_filter(data):
+    subs = [_to_filter(f) for f in data.get("filters", [])]
+    return Filter(operator=data.get("operator"), field=data.get("field"), value=data.get("value"), filters=subs or None)
+
+
+@pytest.fixture
+def mock_client():
+    """Create mock client running grouped searches over ORDERS"""
+    client = Mock(spec=BshClient)
+    client.bodies = []
+
+    def post(params):
+        body = params.options["body"]
+        client.bodies.append(body)
+        match = compile_filters([_to_filter(f) for f in body.get("filters", [])])
+        group_by = body["groupBy"]
+        rows = group_rows(
+            [r for r in ORDERS if match(r)],
+            GroupBy(fields=group_by.get("fields"), aggregate=[Aggregate(**a) for a in group_by["aggregate"]]),
+        )
+        rows = sort_rows(rows, [Sort(**s) for s in body.get("sort", [])])
+        if "pagination" in body:
+            rows = paginate(rows, Pagination(**body["pagination"]))
+        return BshResponse(data=rows, code=200, status="OK", timestamp=0)
+
+    client.post = Mock(side_effect=post)
+    return client
+
+
+def _stats_search():
+    return (
+        QueryBuilder()
+        .group_by("region")
+        .aggregate("SUM", "amount", "total")
+        .aggregate("AVG", "amount", "mean")
+        .aggregate("COUNT", "*", "n")
+        .aggregate("MAX", "amount")
+        .build()
+    )
+
+
+class TestPartialGroupBy:
+    """Test partial_group_by and AggregateMerger"""
+
+    def test_avg_split(self):
+        """Test AVG is pushed down as SUM and COUNT"""
+        partial = partial_group_by(GroupBy(fields=["a"], aggregate=[Aggregate(function="AVG", field="x")]))
+
+        assert [(a.function, a.alias) for a in partial.aggregate] == [("SUM", "avg_x__sum"), ("COUNT", "avg_x__count")]
+
+    def test_merge_partials(self):
+        """Test partials of the same group combine exactly"""
+        group_by = GroupBy(aggregate=[
+            Aggregate(function="AVG", field="x"),
+            Aggregate(function="MIN", field="x"),
+            Aggregate(function="COUNT", field="x"),
+        ])
+        merger = AggregateMerger(group_by)
+        merger.add([{"avg_x__sum": 10, "avg_x__count": 1, "min_x": 10, "count_x": 1}])
+        merger.add([{"avg_x__sum": 2, "avg_x__count": 3, "min_x": None, "count_x": 3}])
+
+        assert merger.result().rows() == [{"avg_x": 3.0, "min_x": 10, "count_x": 4}]
+
+    def test_unsupported_function(self):
+        """Test unknown aggregate functions are rejected"""
+        with pytest.raises(ValueError):
+            partial_group_by(GroupBy(aggregate=[Aggregate(function="MEDIAN", field="x")]))
+
+
+class TestEntityAggregate:
+    """Test EntityService.aggregate"""
+
+    def test_grouped_columns(self, mock_client):
+        """Test grouped results come back as columns sorted by group"""
+        result = EntityService(mock_client, "Orders").aggregate(_stats_search())
+
+        assert result["region"] == ["asia", "eu", "us"]
+        assert result["total"] == [7, 40, 5]
+        assert result["mean"] == [7.0, 20.0, 5.0]
+        assert result["n"] == [1, 2, 2]
+        assert result["max_amount"] == [7, 30, 5]
+        assert len(result) == 3
+
+    def test_only_aggregates_fetched(self, mock_client):
+        """Test every request pushes the partial aggregation down"""
+        EntityService(mock_client, "Orders").aggregate(_stats_search(), page_size=2)
+
+        assert len(mock_client.bodies) == 2
+        for body in mock_client.bodies:
+            assert "fields" not in body
+            assert {"function": "COUNT", "field": "amount", "alias": "mean__count"} in body["groupBy"]["aggregate"]
+
+    def test_partitions_merge(self, mock_client):
+        """Test partitions are queried separately and merged like a single query"""
+        service = EntityService(mock_client, "Orders")
+        partitions = [Filter(field="year", operator="eq", value=year) for year in (2023, 2024)]
+
+        merged = service.aggregate(_stats_search(), partitions=partitions)
+
+        assert len(mock_client.bodies) == 2
+        assert sorted(merged.rows(), key=lambda r: r["region"]) == service.aggregate(_stats_search()).rows()
+
+    def test_ungrouped(self, mock_client):
+        """Test an aggregation without group fields yields one row"""
+        search = BshSearch(group_by=GroupBy(aggregate=[Aggregate(function="AVG", field="amount")]))
+
+        result = EntityService(mock_client, "Orders").aggregate(search)
+
+        assert result.rows() == [{"avg_amount": 13.0}]
+        assert "pagination" not in mock_client.bodies[0]
+
+    def test_requires_group_by(self, mock_client):
+        """Test a search without aggregates is rejected"""
+        with pytest.raises(ValueError):
+            EntityService(mock_client, "Orders").aggregate(BshSearch())
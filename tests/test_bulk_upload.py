@@ -0,0 +1,114 @@
+"""Tests for bulk image uploads"""
+import json
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshResponse, BshError, RetryPolicy
+from bshengine.services import ImageService, UploadManifest
+
+
+def _response(data):
+    return BshResponse(data=[data], code=200, status="OK", timestamp=0)
+
+
+class TestUploadMany:
+    """Test ImageService.upload_many"""
+
+    @pytest.fixture
+    def files(self, tmp_path):
+        """Create a few image files, two with identical content"""
+        paths = []
+        for name, content in [("a.png", b"aaa"), ("b.png", b"bbb"), ("c.png", b"aaa")]:
+            path = tmp_path / name
+            path.write_bytes(content)
+            paths.append(str(path))
+        return paths
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock client echoing the uploaded file name"""
+        client = Mock(spec=BshClient)
+
+        def post(params):
+            if params.api == "image.upload":
+                return _response({"name": params.options["body"]["files"]["file"][0]})
+            return BshResponse(data=[], code=200, status="OK", timestamp=0)
+
+        client.post = Mock(side_effect=post)
+        return client
+
+    def test_uploads_and_dedupes_identical_content(self, mock_client, files):
+        """Test identical content is uploaded once per batch"""
+        report = ImageService(mock_client).upload_many(files, namespace="ns", concurrency=2)
+
+        assert [r.status for r in report.results] == ["uploaded", "uploaded", "skipped"]
+        assert mock_client.post.call_count == 2
+        assert report.results[2].data == report.results[0].data
+        assert report.bytes_uploaded == 6
+        assert report.files_per_second > 0
+
+    def test_rerun_with_manifest_skips_everything(self, mock_client, files, tmp_path):
+        """Test a second run with the same manifest makes no requests"""
+        manifest_path = str(tmp_path / "manifest.json")
+        service = ImageService(mock_client)
+        service.upload_many(files, namespace="ns", manifest=manifest_path)
+        mock_client.post.reset_mock()
+
+        report = service.upload_many(files, namespace="ns", manifest=manifest_path)
+
+        assert mock_client.post.call_count == 0
+        assert len(report.skipped) == 3
+        with open(manifest_path) as f:
+            assert len(json.load(f)["files"]) == 3
+
+    def test_manifest_is_namespaced(self, mock_client, files):
+        """Test content known in one namespace is uploaded to another"""
+        manifest = UploadManifest()
+        service = ImageService(mock_client)
+        service.upload_many(files[:1], namespace="a", manifest=manifest)
+
+        report = service.upload_many(files[:1], namespace="b", manifest=manifest)
+
+        assert report.results[0].status == "uploaded"
+
+    def test_remote_lookup_by_hash_field(self, mock_client, files):
+        """Test hashes known in BshFiles are skipped"""
+        manifest = UploadManifest()
+        known_hash = manifest.file_hash(files[1])[0]
+
+        def post(params):
+            if params.api == "entities.BshFiles.search":
+                assert params.options["body"]["filters"][0]["operator"] == "in"
+                return BshResponse(data=[{"sha": known_hash}], code=200, status="OK", timestamp=0)
+            return _response({})
+
+        mock_client.post.side_effect = post
+        report = ImageService(mock_client).upload_many(files[:2], manifest=manifest, hash_field="sha")
+
+        assert [r.status for r in report.results] == ["uploaded", "skipped"]
+        assert report.results[1].data == {"sha": known_hash}
+
+    def test_retries_and_failures(self, mock_client, files):
+        """Test transient errors are retried and permanent ones reported"""
+        calls = {"n": 0}
+
+        def post(params):
+            calls["n"] += 1
+            if params.options["body"]["files"]["file"][0] == "b.png":
+                raise BshError(400, "/api/images/upload")
+            if calls["n"] == 1:
+                raise BshError(503, "/api/images/upload")
+            return _response({})
+
+        mock_client.post.side_effect = post
+        report = ImageService(mock_client).upload_many(
+            files[:2], concurrency=1, retry=RetryPolicy(max_attempts=3, backoff=0)
+        )
+
+        uploaded, failed = report.results
+        assert uploaded.status == "uploaded" and uploaded.attempts == 2
+        assert failed.status == "failed" and isinstance(failed.error, BshError)
+
+    def test_missing_file_is_reported(self, mock_client, tmp_path):
+        """Test unreadable paths fail without stopping the batch"""
+        report = ImageService(mock_client).upload_many([str(tmp_path / "nope.png")])
+        assert report.failed[0].error is not None
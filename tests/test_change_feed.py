@@ -0,0 +1,154 @@
+"""Tests for change feeds"""
+import logging
+import time
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshResponse, Filter, Pagination, Sort
+from bshengine.query.evaluator import compile_filters, paginate, sort_rows
+from bshengine.services import ChangeFeed, EntityService
+
+
+def _to_filter(data):
+    subs = [_to_filter(f) for f in data.get("filters", [])]
+    return Filter(operator=data.get("operator"), field=data.get("field"), value=data.get("value"), filters=subs or None)
+
+
+class FakeServer:
+    """Serve searches of several entities from in-memory tables"""
+
+    def __init__(self):
+        self.tables = {"BshEventLogs": [], "BshTriggerInstances": []}
+        self.searches = []
+
+    def post(self, params):
+        entity = params.path.split("/")[-2]
+        body = params.options["body"]
+        self.searches.append((entity, body))
+        match = compile_filters([_to_filter(f) for f in body.get("filters", [])])
+        rows = sort_rows([r for r in self.tables[entity] if match(r)], [Sort(**s) for s in body["sort"]])
+        return BshResponse(data=paginate(rows, Pagination(**body["pagination"])), code=200, status="OK", timestamp=0)
+
+
+@pytest.fixture
+def server():
+    """Create fake server with two event logs"""
+    server = FakeServer()
+    server.tables["BshEventLogs"] = [{"id": 1, "updatedAt": 10}, {"id": 2, "updatedAt": 20}]
+    return server
+
+
+@pytest.fixture
+def engine(server):
+    """Create engine stand-in whose entities talk to the fake server"""
+    client = Mock(spec=BshClient)
+    client.post = Mock(side_effect=server.post)
+    engine = Mock()
+    engine.entity = lambda name: EntityService(client, name)
+    return engine
+
+
+def _collect(feed, entity=None):
+    seen = []
+    feed.on(entity)(lambda name, rows: seen.extend((name, r["id"]) for r in rows))
+    return seen
+
+
+class TestChangeFeed:
+    """Test ChangeFeed class"""
+
+    def test_delivers_only_new_rows(self, engine, server):
+        """Test later polls only deliver rows at or after the watermark"""
+        feed = ChangeFeed(engine)
+        seen = _collect(feed)
+
+        assert feed.poll() == {"BshEventLogs": 2, "BshTriggerInstances": 0}
+        server.tables["BshEventLogs"].append({"id": 3, "updatedAt": 30})
+        server.tables["BshTriggerInstances"].append({"id": 9, "updatedAt": 5})
+        feed.poll()
+
+        assert seen == [("BshEventLogs", 1), ("BshEventLogs", 2), ("BshEventLogs", 3), ("BshTriggerInstances", 9)]
+        assert server.searches[-2][1]["filters"][0] == {"operator": "gte", "field": "updatedAt", "value": 20}
+
+    def test_ties_on_watermark(self, engine, server):
+        """Test a late row sharing the watermark is delivered once and earlier ones are not repeated"""
+        feed = ChangeFeed(engine, entities=["BshEventLogs"])
+        seen = _collect(feed)
+        feed.poll()
+        server.tables["BshEventLogs"].append({"id": 0, "updatedAt": 20})
+
+        feed.poll()
+        feed.poll()
+
+        assert [id for _, id in seen] == [1, 2, 0]
+        assert feed.cursors["BshEventLogs"].state() == {"watermark": 20, "seen": [0, 2]}
+
+    def test_paged_fetch(self, engine, server):
+        """Test changes spanning several pages are read with keyset pages"""
+        server.tables["BshEventLogs"] = [{"id": i, "updatedAt": i // 2} for i in range(7)]
+        feed = ChangeFeed(engine, entities=["BshEventLogs"], page_size=3)
+        seen = _collect(feed, "BshEventLogs")
+
+        feed.poll()
+
+        assert [id for _, id in seen] == list(range(7))
+        assert len(server.searches) == 3
+
+    def test_adaptive_interval(self, engine, server):
+        """Test the interval backs off while idle and shrinks when changes arrive"""
+        feed = ChangeFeed(engine, min_interval=1, max_interval=4)
+        feed.poll()
+        assert feed.interval == 1
+        for _ in range(3):
+            feed.poll()
+        assert feed.interval == 4
+        server.tables["BshEventLogs"].append({"id": 3, "updatedAt": 30})
+
+        feed.poll()
+
+        assert feed.interval == 2
+
+    def test_failed_handler_redelivers(self, engine, server):
+        """Test the watermark does not move past a page a handler rejected"""
+        errors = []
+        feed = ChangeFeed(engine, entities=["BshEventLogs"], on_error=errors.append)
+        calls = []
+
+        @feed.on("BshEventLogs")
+        def handler(entity, rows):
+            calls.append([r["id"] for r in rows])
+            if len(calls) == 1:
+                raise RuntimeError("down")
+
+        feed.poll()
+        feed.poll()
+
+        assert calls == [[1, 2], [1, 2]]
+        assert isinstance(errors[0], RuntimeError)
+
+    def test_background_errors_are_logged(self, engine, caplog):
+        """Test a failing background poll is logged when no on_error is given"""
+        feed = ChangeFeed(engine, entities=["BshEventLogs"], min_interval=0.01, max_interval=0.01)
+
+        @feed.on()
+        def handler(entity, rows):
+            raise RuntimeError("down")
+
+        with caplog.at_level(logging.ERROR, logger="bshengine.services.change_feed"):
+            with feed:
+                deadline = time.monotonic() + 1
+                while not caplog.records and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+        assert caplog.records[0].exc_info[0] is RuntimeError
+
+    def test_checkpoint_restores_watermarks(self, engine, server, tmp_path):
+        """Test a new feed continues from the saved watermarks"""
+        path = str(tmp_path / "feed.json")
+        ChangeFeed(engine, entities=["BshEventLogs"], checkpoint=path).poll()
+        server.tables["BshEventLogs"].append({"id": 3, "updatedAt": 30})
+
+        feed = ChangeFeed(engine, entities=["BshEventLogs"], checkpoint=path)
+        seen = _collect(feed)
+        feed.poll()
+
+        assert seen == [("BshEventLogs", 3)]
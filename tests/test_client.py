@@ -2,7 +2,7 @@
 import pytest
 from unittest.mock import Mock, MagicMock
 from bshengine import BshClient, BshError, BshResponse, AuthToken
-from bshengine.client import BshClientFnParams
+from bshengine.client import BshClientFnParams, RetryPolicy
 
 
 class TestBshClient:
@@ -477,3 +477,40 @@ class TestBshClient:
         headers = call_args.options.get("headers", {})
         assert "Authorization" not in headers
 
+
+
+class TestRetryPolicy:
+    """Test RetryPolicy class"""
+
+    def test_retries_retryable_status(self):
+        """Test retryable BshError statuses are retried"""
+        fn = Mock(side_effect=[BshError(503, "/x"), BshError(429, "/x"), "ok"])
+        policy = RetryPolicy(max_attempts=3, backoff=0)
+
+        assert policy.call(fn) == "ok"
+        assert fn.call_count == 3
+
+    def test_does_not_retry_client_errors(self):
+        """Test non-retryable statuses are raised immediately"""
+        fn = Mock(side_effect=BshError(400, "/x"))
+        policy = RetryPolicy(max_attempts=3, backoff=0)
+
+        with pytest.raises(BshError):
+            policy.call(fn)
+        assert fn.call_count == 1
+
+    def test_gives_up_after_max_attempts(self):
+        """Test the last error is raised once attempts are exhausted"""
+        fn = Mock(side_effect=OSError("down"))
+        retries = []
+        policy = RetryPolicy(max_attempts=2, backoff=0, on_retry=lambda e, n: retries.append(n))
+
+        with pytest.raises(OSError):
+            policy.call(fn)
+        assert fn.call_count == 2
+        assert retries == [1]
+
+    def test_delay_is_capped(self):
+        """Test exponential backoff is capped by max_backoff"""
+        policy = RetryPolicy(backoff=1, max_backoff=4, jitter=0)
+        assert [policy.delay(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 4]
@@ -0,0 +1,137 @@
+"""Tests for request/response body compression"""
+import gzip
+import json
+import pytest
+from unittest.mock import Mock
+from bshengine import BshEngine, BshClient, BshResponse
+from bshengine.client import BshClientFnParams, CompressionConfig
+from bshengine.client.compression import Codec
+
+
+def _response(payload, headers=None, encode=None):
+    body = json.dumps(payload).encode()
+    if encode:
+        body = encode(body)
+    response = Mock()
+    response.ok = True
+    response.status_code = 200
+    response.headers = headers or {}
+    response.content = body
+    response.encoding = "utf-8"
+    response.json.side_effect = AssertionError("raw json() must not be used")
+    return response
+
+
+OK = {"data": [{"id": 1}], "code": 200, "status": "OK", "timestamp": 0}
+
+
+class TestCompressionConfig:
+    """Test CompressionConfig class"""
+
+    def test_small_bodies_are_not_compressed(self):
+        """Test bodies under the threshold stay JSON"""
+        assert CompressionConfig(threshold=100).encode_body({"a": 1}) is None
+
+    def test_large_bodies_are_gzipped(self):
+        """Test bodies over the threshold are gzipped"""
+        payload = [{"name": "entity", "n": i} for i in range(200)]
+        body, headers = CompressionConfig(threshold=100).encode_body(payload)
+
+        assert headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(body)) == payload
+
+    def test_unknown_codec(self):
+        """Test unsupported codecs are rejected"""
+        with pytest.raises(ValueError):
+            CompressionConfig("brotli")
+
+    def test_incomplete_codec(self):
+        """Test a codec missing a method cannot be created"""
+        class CompressOnly(Codec):
+            name = "identity"
+
+            def compress(self, data):
+                return data
+
+        with pytest.raises(TypeError):
+            CompressOnly()
+
+    def test_zstd_roundtrip(self):
+        """Test zstd request and response coding"""
+        zstandard = pytest.importorskip("zstandard")
+        config = CompressionConfig("zstd", threshold=0)
+        body, headers = config.encode_body(OK)
+
+        assert headers["Content-Encoding"] == "zstd"
+        response = _response(OK, {"Content-Encoding": "zstd"}, zstandard.ZstdCompressor().compress)
+        assert config.decode_response(response).json() == OK
+
+    def test_already_decoded_response_passes_through(self):
+        """Test bodies the transport already decoded are not decoded twice"""
+        response = _response(OK, {"Content-Encoding": "gzip"})
+        assert CompressionConfig().decode_response(response).json() == OK
+
+    def test_unencoded_response_is_untouched(self):
+        """Test responses without Content-Encoding are returned as-is"""
+        response = _response(OK)
+        assert CompressionConfig().decode_response(response) is response
+
+
+class TestClientCompression:
+    """Test compression in the client pipeline"""
+
+    def test_engine_compresses_bulk_writes(self):
+        """Test create_many sends a compressed raw body"""
+        http_client = Mock(return_value=_response(OK, {"Content-Encoding": "gzip"}, gzip.compress))
+        engine = BshEngine("https://api.test.com", http_client, compression="gzip")
+        payload = [{"name": f"entity-{i}"} for i in range(100)]
+
+        result = engine.entity("Items").create_many(payload)
+
+        params = http_client.call_args[0][0]
+        assert params.options["request_format"] == "raw"
+        assert params.options["headers"]["Content-Encoding"] == "gzip"
+        assert "gzip" in params.options["headers"]["Accept-Encoding"]
+        assert json.loads(gzip.decompress(params.options["body"])) == payload
+        assert result.data == [{"id": 1}]
+
+    def test_small_request_only_advertises(self):
+        """Test small bodies are sent as JSON with Accept-Encoding"""
+        http_client = Mock(return_value=_response(OK))
+        client = BshClient("", http_client, compression=CompressionConfig(threshold=10000))
+
+        client.post(BshClientFnParams(
+            path="/x", options={"request_format": "json", "body": {"a": 1}}, bsh_options={},
+        ))
+
+        params = http_client.call_args[0][0]
+        assert params.options["request_format"] == "json"
+        assert params.options["body"] == {"a": 1}
+        assert "Accept-Encoding" in params.options["headers"]
+
+    def test_disabled_by_default(self, mock_client_fn):
+        """Test engines without compression leave requests unchanged"""
+        http_client = Mock(side_effect=mock_client_fn)
+        BshEngine("https://api.test.com", http_client).entity("Items").create_many([{"a": 1}])
+
+        params = http_client.call_args[0][0]
+        assert params.options["request_format"] == "json"
+        assert "Accept-Encoding" not in params.options["headers"]
+
+
+class TestSerializedBodies:
+    """Test pre-serialized JSON bodies"""
+
+    def test_bytes_body_is_sent_raw(self, mock_client_fn):
+        """Test bind_json output is sent as raw JSON"""
+        from bshengine import BshSearch, Filter, Param
+        http_client = Mock(side_effect=mock_client_fn)
+        engine = BshEngine("https://api.test.com", http_client)
+        compiled = BshSearch(filters=[Filter(field="a", operator="eq", value=Param("a"))]).compile()
+
+        engine.entity("Items").search(compiled.bind_json(a=1))
+
+        params = http_client.call_args[0][0]
+        assert params.options["request_format"] == "raw"
+        assert params.options["headers"]["Content-Type"] == "application/json"
+        assert json.loads(params.options["body"])["filters"][0]["value"] == 1
@@ -0,0 +1,161 @@
+"""Tests for approximate counts and sketches"""
+import random
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshResponse, BshSearch, Estimator, Filter
+from bshengine.query import HyperLogLog, QueryCache
+from bshengine.services import EntityService
+
+
+def _ok(data):
+    return BshResponse(data=data, code=200, status="OK", timestamp=0)
+
+
+class FakeClock:
+    """Manually advanced clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def table():
+    """Create table of 1000 rows, a quarter of them open"""
+    return [{"id": i, "status": "open" if i % 4 == 0 else "closed", "group": i % 37} for i in range(1000)]
+
+
+@pytest.fixture
+def mock_client(table):
+    """Create mock client serving counts and paged searches"""
+    client = Mock(spec=BshClient)
+    client.get = Mock(side_effect=lambda params: _ok([{"count": len(table)}]))
+
+    def post(params):
+        body = params.options["body"]
+        if params.path.endswith("/count"):
+            value = body["filters"][0]["value"]
+            return _ok([{"count": sum(r["status"] == value for r in table)}])
+        page, size = body["pagination"]["page"], body["pagination"]["size"]
+        rows = table[(page - 1) * size:page * size]
+        if "fields" in body:
+            rows = [{k: r[k] for k in body["fields"]} for r in rows]
+        return _ok(rows)
+
+    client.post = Mock(side_effect=post)
+    return client
+
+
+@pytest.fixture
+def clock():
+    """Create fake clock"""
+    return FakeClock()
+
+
+@pytest.fixture
+def estimator(mock_client, clock):
+    """Create estimator over the fake entity"""
+    return Estimator(EntityService(mock_client, "Orders"), ttl=30, clock=clock, rng=random.Random(7))
+
+
+OPEN = BshSearch(filters=[Filter(field="status", operator="eq", value="open")])
+
+
+class TestEstimator:
+    """Test Estimator class"""
+
+    def test_unfiltered_is_exact(self, estimator, mock_client):
+        """Test a search without filters uses the plain count"""
+        estimate = estimator.count()
+
+        assert estimate.exact and estimate.value == 1000
+        mock_client.post.assert_not_called()
+
+    def test_sampled_estimate(self, estimator, mock_client):
+        """Test sampled pages are extrapolated with an interval around the true count"""
+        estimate = estimator.count(OPEN)
+
+        assert not estimate.exact
+        assert estimate.sampled == 400
+        assert estimate.low <= 250 <= estimate.high
+        assert estimate.low <= estimate.value <= estimate.high
+        assert mock_client.post.call_count == 4
+        assert all("filters" not in call[0][0].options["body"] for call in mock_client.post.call_args_list)
+
+    def test_projected_search(self, estimator, mock_client):
+        """Test filters on columns outside the projection are still evaluated"""
+        estimate = estimator.count(BshSearch(fields=["id"], filters=OPEN.filters))
+
+        assert estimate.low <= 250 <= estimate.high
+        assert all("fields" not in call[0][0].options["body"] for call in mock_client.post.call_args_list)
+
+    def test_samples_bypass_query_cache(self, mock_client):
+        """Test sampled pages are not stored in the service query cache"""
+        cache = QueryCache()
+        estimator = Estimator(EntityService(mock_client, "Orders", cache=cache), rng=random.Random(7))
+
+        estimator.count(OPEN)
+
+        assert len(cache) == 0
+
+    def test_small_table_is_exact(self, mock_client):
+        """Test reading every page gives the exact count"""
+        estimator = Estimator(EntityService(mock_client, "Orders"), pages=10, page_size=100)
+
+        estimate = estimator.count(OPEN)
+
+        assert estimate.exact and estimate.value == 250
+
+    def test_ttl_cache(self, estimator, mock_client, clock):
+        """Test results are reused until the TTL expires"""
+        estimator.count(OPEN)
+        estimator.count(OPEN)
+        assert mock_client.post.call_count == 4
+
+        clock.now = 31
+        estimator.count(OPEN)
+
+        assert mock_client.post.call_count == 8
+
+    def test_refine_to_exact(self, estimator, mock_client):
+        """Test a background refine replaces the estimate with the exact count"""
+        first = estimator.count(OPEN, refine=True)
+        estimator.refine(OPEN).result()
+
+        second = estimator.count(OPEN)
+
+        assert not first.exact
+        assert second.exact and second.value == 250
+
+    def test_distinct(self, estimator, mock_client):
+        """Test distinct values are counted with a sketch over one scanned column"""
+        estimate = estimator.distinct("group")
+
+        assert abs(estimate.value - 37) <= 1
+        assert estimate.low <= 37 <= estimate.high
+        assert mock_client.post.call_args[0][0].options["body"]["fields"] == ["group"]
+        assert len(estimator.sketches) == 1
+
+
+class TestHyperLogLog:
+    """Test HyperLogLog class"""
+
+    def test_accuracy(self):
+        """Test large cardinalities are within a few standard errors"""
+        sketch = HyperLogLog().update(range(50000))
+
+        assert abs(sketch.count() - 50000) < 50000 * sketch.error * 3
+
+    def test_merge(self):
+        """Test merged sketches count the union"""
+        a = HyperLogLog(10).update(range(0, 3000))
+        b = HyperLogLog(10).update(range(2000, 5000))
+
+        assert abs(len(a.merge(b)) - 5000) < 5000 * a.error * 3
+
+    def test_precision_mismatch(self):
+        """Test sketches of different precision cannot be merged"""
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
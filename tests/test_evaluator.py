@@ -0,0 +1,159 @@
+"""Tests for the local BshSearch evaluator"""
+import pytest
+from bshengine import BshSearch, Filter, GroupBy, Aggregate, Sort, Pagination
+from bshengine.query import F
+from bshengine.query import evaluator
+from bshengine.query.evaluator import ColumnStore, evaluate
+from bshengine.query.index import IndexedCollection
+
+ROWS = [
+    {"id": 1, "name": "Alice", "age": 30, "city": "Paris", "score": 10.5, "meta": {"tier": "gold"}},
+    {"id": 2, "name": "bob", "age": 25, "city": "Lyon", "score": None, "meta": {"tier": "silver"}},
+    {"id": 3, "name": "Carol", "age": None, "city": "Paris", "score": 7.0, "meta": {}},
+    {"id": 4, "name": "Dave", "age": 41, "city": None, "score": 3.5},
+    {"id": 5, "name": "Eve_1", "age": 35, "city": "Lyon", "score": 9.0},
+]
+
+
+@pytest.fixture(params=["rows", "columns", "columns-no-numpy", "indexed"])
+def data(request, monkeypatch):
+    """Evaluate against lists, column stores (with and without NumPy) and indexes"""
+    if request.param == "rows":
+        return ROWS
+    if request.param == "indexed":
+        return IndexedCollection(
+            ROWS, key="id", hash_indexes=["city", "meta.tier"], sorted_indexes=["age", "name", "score"]
+        )
+    if request.param == "columns-no-numpy":
+        monkeypatch.setattr(evaluator, "_numpy", lambda: None)
+    return ColumnStore(ROWS)
+
+
+def _ids(filters, data):
+    return [r["id"] for r in evaluate(BshSearch(filters=filters), data)]
+
+
+class TestFilters:
+    """Test every comparison operator"""
+
+    @pytest.mark.parametrize("filters,expected", [
+        ([F.eq("city", "Paris")], [1, 3]),
+        ([F.ne("city", "Paris")], [2, 5]),
+        ([F.gt("age", 30)], [4, 5]),
+        ([F.gte("age", 30)], [1, 4, 5]),
+        ([F.lt("age", 30)], [2]),
+        ([F.lte("age", 30)], [1, 2]),
+        ([F.between("age", 25, 35)], [1, 2, 5]),
+        ([F.in_("age", [25, 41, 99])], [2, 4]),
+        ([F.nin("age", [25, 41])], [1, 5]),
+        ([F.is_null("age")], [3]),
+        ([F.not_null("score")], [1, 3, 4, 5]),
+        ([F.like("name", "%e")], [1, 4]),
+        ([F.like("name", "Eve\\_1")], []),
+        ([F.like("name", "Eve_1")], [5]),
+        ([F.ilike("name", "B%")], [2]),
+        ([F.contains("name", "ar")], [3]),
+        ([Filter(field="name", operator="icontains", value="AL")], [1]),
+        ([F.starts("name", "Ca")], [3]),
+        ([Filter(field="name", operator="ISTARTS", value="b")], [2]),
+        ([F.eq("meta.tier", "gold")], [1]),
+        ([F.gt("score", 5)], [1, 3, 5]),
+        ([F.in_("city", ["Lyon"])], [2, 5]),
+    ])
+    def test_operator(self, data, filters, expected):
+        """Test comparison operators with SQL NULL semantics"""
+        assert _ids(filters, data) == expected
+
+    def test_nested_logical(self, data):
+        """Test nested AND/OR trees"""
+        filters = [F.or_(F.and_(F.eq("city", "Paris"), F.gt("age", 20)), F.lt("score", 4))]
+        assert _ids(filters, data) == [1, 4]
+
+    def test_top_level_is_and(self, data):
+        """Test the top-level filter list is combined with AND"""
+        assert _ids([F.eq("city", "Lyon"), F.gt("age", 30)], data) == [5]
+
+    def test_typed_comparison(self, data):
+        """Test filter type coerces values"""
+        rows = [{"id": 1, "at": "2024-01-02T00:00:00Z"}, {"id": 2, "at": "2023-12-31T10:00:00Z"}]
+        filters = [Filter(field="at", operator="gte", value="2024-01-01T00:00:00+00:00", type="date")]
+        assert _ids(filters, rows) == [1]
+
+
+class TestSortAndPaginate:
+    """Test sorting, pagination and projection"""
+
+    def test_multi_key_sort_nulls_last(self):
+        """Test sorting puts NULLs last ascending"""
+        search = BshSearch(sort=[Sort(field="city", direction=1), Sort(field="age", direction=-1)])
+        assert [r["id"] for r in evaluate(search, ROWS)] == [5, 2, 3, 1, 4]
+
+    def test_desc_puts_nulls_first(self):
+        """Test sorting puts NULLs first descending"""
+        search = BshSearch(sort=[Sort(field="age", direction=-1)])
+        assert [r["id"] for r in evaluate(search, ROWS)] == [3, 4, 5, 1, 2]
+
+    def test_pagination_and_fields(self):
+        """Test pages start at 1 and fields are projected"""
+        search = BshSearch(
+            fields=["id"],
+            sort=[Sort(field="id", direction=1)],
+            pagination=Pagination(page=2, size=2),
+        )
+        assert evaluate(search, ROWS) == [{"id": 3}, {"id": 4}]
+
+
+class TestGroupBy:
+    """Test group by with aggregates"""
+
+    def test_aggregates(self, data):
+        """Test COUNT/SUM/AVG/MIN/MAX per group, ignoring NULLs"""
+        search = BshSearch(
+            group_by=GroupBy(fields=["city"], aggregate=[
+                Aggregate(function="COUNT", field="id", alias="n"),
+                Aggregate(function="COUNT", field="age", alias="n_age"),
+                Aggregate(function="SUM", field="score", alias="total"),
+                Aggregate(function="AVG", field="age", alias="avg_age"),
+                Aggregate(function="MIN", field="age"),
+                Aggregate(function="MAX", field="age"),
+            ]),
+            sort=[Sort(field="city", direction=1)],
+        )
+        result = evaluate(search, data)
+
+        assert result == [
+            {"city": "Lyon", "n": 2, "n_age": 2, "total": 9.0, "avg_age": 30.0, "min_age": 25, "max_age": 35},
+            {"city": "Paris", "n": 2, "n_age": 1, "total": 17.5, "avg_age": 30.0, "min_age": 30, "max_age": 30},
+            {"city": None, "n": 1, "n_age": 1, "total": 3.5, "avg_age": 41.0, "min_age": 41, "max_age": 41},
+        ]
+
+    def test_global_aggregate_on_empty(self):
+        """Test aggregates without group fields return one row"""
+        search = BshSearch(group_by=GroupBy(aggregate=[
+            Aggregate(function="COUNT", field="*", alias="n"),
+            Aggregate(function="SUM", field="x", alias="s"),
+        ]))
+        assert evaluate(search, []) == [{"n": 0, "s": None}]
+
+    def test_from_subquery(self):
+        """Test from_ is evaluated first"""
+        inner = BshSearch(filters=[F.eq("city", "Paris")])
+        search = BshSearch(from_=inner, group_by=GroupBy(aggregate=[Aggregate(function="COUNT", alias="n")]))
+        assert evaluate(search, ROWS) == [{"n": 2}]
+
+
+class TestColumnStore:
+    """Test ColumnStore vectorization"""
+
+    def test_numeric_columns_use_numpy(self):
+        """Test numeric filters are computed as arrays"""
+        np = pytest.importorskip("numpy")
+        store = ColumnStore(ROWS)
+        mask = store.mask(F.gt("age", 30))
+        assert isinstance(mask, np.ndarray)
+        assert mask.tolist() == [False, False, False, True, True]
+
+    def test_unknown_operator(self):
+        """Test unsupported operators are rejected"""
+        with pytest.raises(ValueError):
+            evaluate(BshSearch(filters=[Filter(field="a", operator="near", value=1)]), ROWS)
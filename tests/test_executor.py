@@ -0,0 +1,171 @@
+"""Tests for the fan-out executor and rate limiter"""
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from bshengine import BshEngine, BshError, BshExecutor, RateLimiter, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def executor():
+    """Create executor and shut it down afterwards"""
+    with BshExecutor(max_workers=4, concurrency=3) as executor:
+        yield executor
+
+
+class TestRateLimiter:
+    """Test RateLimiter class"""
+
+    def test_burst_then_refill(self):
+        """Test tokens are spent and refilled at the configured rate"""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=2, burst=2, clock=clock)
+
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        clock.now = 0.5
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+    def test_acquire_waits(self, monkeypatch):
+        """Test acquire sleeps for the missing tokens"""
+        sleeps = []
+        monkeypatch.setattr(time, "sleep", sleeps.append)
+        limiter = RateLimiter(rate=10, burst=1, clock=FakeClock())
+
+        limiter.acquire()
+        limiter.acquire()
+
+        assert sleeps == [pytest.approx(0.1)]
+
+    def test_invalid_rate(self):
+        """Test rate must be positive"""
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+
+
+class TestBshExecutor:
+    """Test BshExecutor class"""
+
+    def test_map_ordered(self, executor):
+        """Test results follow input order"""
+        results = executor.map(lambda n: time.sleep(0.01 * (5 - n)) or n * 2, range(5))
+
+        assert [r.value for r in results] == [0, 2, 4, 6, 8]
+        assert all(r.ok for r in results)
+
+    def test_as_completed(self, executor):
+        """Test results are yielded in completion order"""
+        results = list(executor.as_completed(lambda n: time.sleep(0.05 * n) or n, [3, 1, 2]))
+
+        assert [r.item for r in results] == [1, 2, 3]
+
+    def test_concurrency_limit(self, executor):
+        """Test no more than concurrency items run at once"""
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work(_):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.01)
+            with lock:
+                state["running"] -= 1
+
+        executor.map(work, range(20), concurrency=2)
+
+        assert state["peak"] <= 2
+
+    def test_errors_captured(self, executor):
+        """Test per-item errors are captured"""
+        def work(n):
+            if n == 2:
+                raise ValueError("bad")
+            return n
+
+        results = executor.map(work, range(4))
+
+        assert [r.ok for r in results] == [True, True, False, True]
+        assert str(results[2].error) == "bad"
+
+    def test_fail_fast(self, executor):
+        """Test fail_fast raises and skips items not yet started"""
+        calls = []
+
+        def work(n):
+            calls.append(n)
+            if n == 0:
+                raise ValueError("bad")
+            time.sleep(0.05)
+
+        with pytest.raises(ValueError):
+            executor.map(work, range(50), concurrency=1, fail_fast=True)
+        assert calls == [0]
+
+    def test_retry_and_rate_limit(self, executor):
+        """Test each attempt is rate limited and retryable errors retried"""
+        attempts = []
+        limiter = Mock(spec=RateLimiter)
+
+        def work(n):
+            attempts.append(n)
+            if attempts.count(n) == 1:
+                raise BshError(503, "/api/x")
+            return n
+
+        results = executor.map(
+            work, [1, 2], retry=RetryPolicy(backoff=0, jitter=0), rate_limiter=limiter
+        )
+
+        assert [r.value for r in results] == [1, 2]
+        assert limiter.acquire.call_count == 4
+
+    def test_amap(self, executor):
+        """Test async map with coroutine and plain functions"""
+        async def double(n):
+            await asyncio.sleep(0.01 * (3 - n))
+            return n * 2
+
+        async def run():
+            first = await executor.amap(double, range(3), concurrency=2)
+            second = await executor.amap(lambda n: n + 1, range(3))
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert [r.value for r in first] == [0, 2, 4]
+        assert [r.value for r in second] == [1, 2, 3]
+
+    def test_amap_fail_fast(self, executor):
+        """Test async fail_fast raises the first error"""
+        async def work(n):
+            raise KeyError(n)
+
+        with pytest.raises(KeyError):
+            asyncio.run(executor.amap(work, range(3), fail_fast=True))
+
+
+class TestEngineMap:
+    """Test BshEngine map helpers"""
+
+    def test_map_uses_executor(self):
+        """Test engine.map delegates to the configured executor"""
+        executor = BshExecutor(max_workers=2)
+        engine = BshEngine(host="http://localhost", client_fn=Mock(), executor=executor)
+
+        results = engine.map(str.upper, ["a", "b"])
+
+        assert engine.executor is executor
+        assert [r.value for r in results] == ["A", "B"]
+        executor.shutdown()
@@ -0,0 +1,101 @@
+"""Tests for client-side image preprocessing"""
+import io
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshResponse
+from bshengine.client import RetryPolicy
+from bshengine.services import ImageService, ImagePreprocessor, preprocess_image
+from bshengine.services import image_processing
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def large_png(tmp_path):
+    """Create a noisy 400x200 PNG"""
+    import random
+    path = tmp_path / "large.png"
+    image = Image.new("RGB", (400, 200))
+    image.putdata([tuple(random.randrange(256) for _ in range(3)) for _ in range(400 * 200)])
+    image.save(path, format="PNG")
+    return str(path)
+
+
+class TestPreprocessImage:
+    """Test preprocess_image function"""
+
+    def test_resizes_within_bounds(self, large_png):
+        """Test images are shrunk to fit, keeping aspect ratio"""
+        result = preprocess_image(large_png, {"width": 100})
+
+        with Image.open(io.BytesIO(result.data)) as image:
+            assert image.size == (100, 50)
+        assert result.resized
+        assert result.size < result.original_size
+
+    def test_never_upscales(self, large_png):
+        """Test small images are left alone"""
+        result = preprocess_image(large_png, {"width": 1000, "height": 1000})
+        assert not result.resized
+
+    def test_converts_format(self, large_png):
+        """Test format conversion renames the file"""
+        result = preprocess_image(large_png, {"format": "jpg", "quality": 60})
+
+        assert result.filename == "large.jpg"
+        with Image.open(io.BytesIO(result.data)) as image:
+            assert image.format == "JPEG"
+
+    def test_without_pillow_returns_original(self, large_png, monkeypatch):
+        """Test originals pass through when Pillow is missing"""
+        monkeypatch.setattr(image_processing, "pillow_available", lambda: False)
+        result = preprocess_image(large_png, {"width": 10})
+
+        with open(large_png, "rb") as f:
+            assert result.data == f.read()
+
+
+class TestUploadManyPreprocess:
+    """Test preprocessing inside ImageService.upload_many"""
+
+    def test_uploads_preprocessed_bytes(self, large_png):
+        """Test the resized bytes are what gets uploaded"""
+        client = Mock(spec=BshClient)
+        client.post = Mock(return_value=BshResponse(data=[{}], code=200, status="OK", timestamp=0))
+        options = {"width": 100, "format": "webp"}
+
+        with ImagePreprocessor(options, max_workers=0) as preprocessor:
+            report = ImageService(client).upload_many(
+                [large_png], options=options, preprocess=preprocessor
+            )
+
+        assert report.results[0].status == "uploaded"
+        params = client.post.call_args[0][0]
+        filename, content = params.options["body"]["files"]["file"]
+        assert filename == "large.webp"
+        with Image.open(io.BytesIO(content)) as image:
+            assert image.size == (100, 50)
+
+    def test_undecodable_file_not_retried(self, tmp_path):
+        """Test a file that is not an image fails once, before any upload attempt"""
+        path = tmp_path / "notes.png"
+        path.write_bytes(b"not an image")
+        client = Mock(spec=BshClient)
+        client.post = Mock(return_value=BshResponse(data=[{}], code=200, status="OK", timestamp=0))
+
+        with ImagePreprocessor({"width": 100}, max_workers=0) as preprocessor:
+            report = ImageService(client).upload_many(
+                [str(path)], preprocess=preprocessor, retry=RetryPolicy(max_attempts=3, backoff=0)
+            )
+
+        result = report.results[0]
+        assert result.status == "failed"
+        assert isinstance(result.error, OSError)
+        assert result.attempts == 0
+        client.post.assert_not_called()
+
+    def test_process_pool(self, large_png):
+        """Test preprocessing in a real process pool"""
+        with ImagePreprocessor({"height": 20}, max_workers=1) as preprocessor:
+            result = preprocessor.process(large_png)
+        assert result.resized
@@ -0,0 +1,133 @@
+"""Tests for secondary indexes over local collections"""
+import pytest
+from bshengine import BshSearch, Sort
+from bshengine.query import F, IndexedCollection, evaluate
+from bshengine.query.index import HashIndex, SortedIndex
+
+
+@pytest.fixture
+def collection():
+    """Create collection with hash and sorted indexes"""
+    return IndexedCollection(
+        [
+            {"id": "a", "status": "open", "total": 50, "code": "FR-01"},
+            {"id": "b", "status": "closed", "total": 120, "code": "DE-07"},
+            {"id": "c", "status": "open", "total": 300, "code": "FR-22"},
+            {"id": "d", "status": None, "total": None, "code": "IT-03"},
+        ],
+        key="id",
+        hash_indexes=["status"],
+        sorted_indexes=["total", "code"],
+    )
+
+
+def _ids(rows):
+    return [r["id"] for r in rows]
+
+
+class TestHashIndex:
+    """Test HashIndex class"""
+
+    def test_lookup(self):
+        """Test equality lookups and removal"""
+        index = HashIndex("status")
+        index.add(1, {"status": "open"})
+        index.add(2, {"status": "open"})
+        index.remove(1, {"status": "open"})
+
+        assert index.lookup(["open"]) == {2}
+        assert index.lookup(["closed"]) == set()
+
+    def test_unhashable_values(self):
+        """Test unhashable values are always candidates"""
+        index = HashIndex("tags")
+        index.add(1, {"tags": ["x"]})
+
+        assert index.lookup(["y"]) == {1}
+
+
+class TestSortedIndex:
+    """Test SortedIndex class"""
+
+    def test_range(self):
+        """Test inclusive and exclusive bounds"""
+        index = SortedIndex("n")
+        for key, n in enumerate([5, 1, 3, 3, None]):
+            index.add(key, {"n": n})
+
+        assert index.range(3, 5) == {0, 2, 3}
+        assert index.range(3, 5, include_low=False) == {0}
+        assert index.range(high=3, include_high=False) == {1}
+
+    def test_prefix(self):
+        """Test prefix lookups"""
+        index = SortedIndex("s")
+        for key, s in enumerate(["abc", "abd", "b", "ab"]):
+            index.add(key, {"s": s})
+
+        assert index.prefix("ab") == {0, 1, 3}
+
+    def test_mixed_types_disable_index(self):
+        """Test incomparable values make the index unusable"""
+        index = SortedIndex("v")
+        index.add(1, {"v": 1})
+        index.add(2, {"v": "x"})
+
+        assert index.range(0, 5) is None
+
+
+class TestIndexedCollection:
+    """Test IndexedCollection class"""
+
+    def test_candidates_use_indexes(self, collection):
+        """Test indexed filters narrow the candidates"""
+        candidates = collection.candidates([F.eq("status", "open"), F.gt("total", 100)])
+
+        assert _ids(candidates) == ["c"]
+        assert collection.candidates([F.like("code", "FR%")]) is None
+
+    def test_filter_matches_scan(self, collection):
+        """Test indexed filtering returns the same rows as a scan"""
+        searches = [
+            [F.eq("status", "open")],
+            [F.in_("status", ["open", "closed"])],
+            [F.between("total", 50, 120)],
+            [F.lte("total", 120), F.starts("code", "FR")],
+            [F.eq("total", None)],
+            [F.or_(F.eq("status", "closed"), F.gt("total", 200))],
+        ]
+        for filters in searches:
+            assert _ids(collection.filter(filters)) == _ids(evaluate(BshSearch(filters=filters), collection.rows))
+
+    def test_upsert_and_remove_maintain_indexes(self, collection):
+        """Test indexes follow updates and deletions"""
+        collection.upsert({"id": "a", "status": "closed", "total": 500, "code": "ES-01"})
+        collection.remove("b")
+
+        assert _ids(collection.find("status", "closed")) == ["a"]
+        assert _ids(collection.filter([F.gte("total", 300)])) == ["a", "c"]
+        assert collection.filter([F.starts("code", "DE")]) == []
+
+    def test_keeps_insertion_order(self, collection):
+        """Test results follow insertion order, updates keep their position"""
+        collection.upsert({"id": "a", "status": "open", "total": 900, "code": "FR-01"})
+
+        assert _ids(collection.filter([F.eq("status", "open")])) == ["a", "c"]
+
+    def test_add_index_later(self, collection):
+        """Test indexes added after loading are built from existing rows"""
+        collection.add_hash_index("code")
+
+        assert _ids(collection.candidates([F.eq("code", "IT-03")])) == ["d"]
+
+    def test_evaluate(self, collection):
+        """Test evaluate uses the collection"""
+        search = BshSearch(filters=[F.gte("total", 50)], sort=[Sort(field="total", direction=-1)])
+
+        assert _ids(evaluate(search, collection)) == ["c", "b", "a"]
+
+    def test_without_key(self):
+        """Test records without a key field get sequential keys"""
+        collection = IndexedCollection([{"n": 1}, {"n": 1}], sorted_indexes=["n"])
+
+        assert len(collection.filter([F.eq("n", 1)])) == 2
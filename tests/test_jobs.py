@@ -0,0 +1,124 @@
+"""Tests for resumable jobs"""
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshError, BshResponse, ImportJob, ScanJob
+from bshengine.checkpoint import FileCheckpoint, SqliteCheckpoint
+from bshengine.services import EntityService
+
+
+def _ok(data=None):
+    return BshResponse(data=data or [], code=200, status="OK", timestamp=0)
+
+
+class FakeServer:
+    """Serve paginated searches and batch creates"""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.pages = []
+        self.created = []
+        self.fail_batches = set()
+
+    def post(self, params):
+        body = params.options["body"]
+        if params.path.endswith("/search"):
+            page, size = body["pagination"]["page"], body["pagination"]["size"]
+            self.pages.append(page)
+            return _ok(self.rows[(page - 1) * size:page * size])
+        if body[0]["n"] in self.fail_batches:
+            raise BshError(500, params.path)
+        self.created.extend(r["n"] for r in body)
+        return _ok()
+
+
+@pytest.fixture
+def server():
+    """Create server holding 25 rows"""
+    return FakeServer({"id": i} for i in range(25))
+
+
+@pytest.fixture
+def service(server):
+    """Create EntityService over the fake server"""
+    client = Mock(spec=BshClient)
+    client.post = Mock(side_effect=server.post)
+    return EntityService(client, "Items")
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def checkpoint(request, tmp_path):
+    """Checkpoint stored in a JSON file or in SQLite"""
+    if request.param == "file":
+        return FileCheckpoint(str(tmp_path / "job.json"))
+    return SqliteCheckpoint(str(tmp_path / "jobs.db"), "job")
+
+
+class TestScanJob:
+    """Test ScanJob class"""
+
+    def test_scans_all_pages(self, service, server, checkpoint):
+        """Test every page is handled and the job is marked completed"""
+        handled = []
+
+        report = ScanJob(service, handled.extend, page_size=10, checkpoint=checkpoint).run()
+
+        assert [r["id"] for r in handled] == list(range(25))
+        assert report.completed and report.processed == 25
+        assert checkpoint.load() == {"cursor": 4, "processed": 25, "completed": True}
+
+    def test_resumes_after_failure(self, service, server, checkpoint):
+        """Test a restart continues after the last saved page"""
+        handled = []
+        crash = {"on": True}
+
+        def handler(rows):
+            if rows[0]["id"] == 20 and crash["on"]:
+                raise RuntimeError("crash")
+            handled.extend(rows)
+
+        with pytest.raises(RuntimeError):
+            ScanJob(service, handler, page_size=10, checkpoint=checkpoint).run()
+        assert checkpoint.load()["cursor"] == 3
+        server.pages.clear()
+        handled.clear()
+        crash["on"] = False
+
+        report = ScanJob(service, handler, page_size=10, checkpoint=checkpoint).run()
+
+        assert server.pages == [3]
+        assert [r["id"] for r in handled] == list(range(20, 25))
+        assert report.resumed and report.skipped == 20
+
+    def test_save_interval(self, service, checkpoint):
+        """Test progress is only saved every N pages and at the end"""
+        report = ScanJob(service, lambda rows: None, page_size=5, checkpoint=checkpoint, every=2).run()
+
+        assert report.checkpoints == 3
+
+
+class TestImportJob:
+    """Test ImportJob class"""
+
+    def test_imports_in_batches(self, service, server, checkpoint):
+        """Test records are created in batches"""
+        records = [{"n": i} for i in range(10)]
+
+        report = ImportJob(service, records, batch_size=3, checkpoint=checkpoint).run()
+
+        assert sorted(server.created) == list(range(10))
+        assert report.processed == 10 and report.completed
+
+    def test_resume_skips_acknowledged_batches(self, service, server, checkpoint):
+        """Test only failed batches are sent again"""
+        records = [{"n": i} for i in range(10)]
+        server.fail_batches = {3}
+
+        first = ImportJob(service, records, batch_size=3, checkpoint=checkpoint).run()
+        assert not first.completed and len(first.failed) == 1
+        server.fail_batches = set()
+        server.created.clear()
+
+        second = ImportJob(service, records, batch_size=3, checkpoint=checkpoint).run()
+
+        assert server.created == [3, 4, 5]
+        assert second.skipped == 7 and second.completed
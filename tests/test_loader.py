@@ -0,0 +1,168 @@
+"""Tests for the request-scoped DataLoader"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshEngine, BshError, BshResponse, DataLoader
+from bshengine.services import EntityService
+
+
+class FakeEngine:
+    """Engine whose entity services answer in searches from tables"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.requests = []
+        self.gate = None
+
+    def entity(self, name):
+        client = Mock(spec=BshClient)
+
+        def post(params):
+            ids = params.options["body"]["filters"][0]["value"]
+            self.requests.append((name, ids))
+            if name == "Broken":
+                raise BshError(500, "/api/entities/Broken/search")
+            rows = [self.tables[name][i] for i in ids if i in self.tables[name]]
+            if self.gate:
+                # Hold the batch in flight until the test releases it
+                fetched, release = self.gate
+                fetched.set()
+                release.wait(1)
+            return BshResponse(data=rows, code=200, status="OK", timestamp=0)
+
+        client.post = Mock(side_effect=post)
+        return EntityService(client, name)
+
+
+@pytest.fixture
+def engine():
+    """Create fake engine with users and teams"""
+    return FakeEngine({
+        "Users": {1: {"id": 1, "team": "a"}, 2: {"id": 2, "team": "b"}},
+        "Teams": {"a": {"id": "a"}, "b": {"id": "b"}},
+    })
+
+
+class TestDataLoader:
+    """Test DataLoader class"""
+
+    def test_batches_same_tick(self, engine):
+        """Test loads in one tick become one request per entity"""
+        loader = DataLoader(engine)
+
+        async def run():
+            return await asyncio.gather(
+                loader.load("Users", 1),
+                loader.load("Teams", "b"),
+                loader.load("Users", 2),
+                loader.load("Users", 3),
+            )
+
+        results = asyncio.run(run())
+
+        assert results == [{"id": 1, "team": "a"}, {"id": "b"}, {"id": 2, "team": "b"}, None]
+        assert sorted(engine.requests, key=str) == [("Teams", ["b"]), ("Users", [1, 2, 3])]
+
+    def test_full_batch_cancels_window(self, engine):
+        """Test a batch sent early on max_batch does not shorten the next batch's window"""
+        engine.tables["Users"].update({3: {"id": 3}, 4: {"id": 4}})
+        loader = DataLoader(engine, window=0.1, max_batch=2)
+
+        async def run():
+            first = [loader.load("Users", 1), loader.load("Users", 2)]
+            await asyncio.sleep(0.05)
+            third = loader.load("Users", 3)
+            await asyncio.sleep(0.08)
+            fourth = loader.load("Users", 4)
+            return await asyncio.gather(*first, third, fourth)
+
+        asyncio.run(run())
+
+        assert engine.requests == [("Users", [1, 2]), ("Users", [3, 4])]
+
+    def test_memoizes(self, engine):
+        """Test an id is fetched once per loader"""
+        loader = DataLoader(engine)
+
+        async def run():
+            first = await loader.load_many("Users", [1, 1])
+            second = await loader.load("Users", 1)
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first == [{"id": 1, "team": "a"}] * 2
+        assert second == {"id": 1, "team": "a"}
+        assert engine.requests == [("Users", [1])]
+
+    def test_resolvers_batch_nested_loads(self, engine):
+        """Test loads made by independent resolvers are batched level by level"""
+        loader = DataLoader(engine)
+
+        async def team_of(user_id):
+            user = await loader.load("Users", user_id)
+            return await loader.load("Teams", user["team"])
+
+        async def run():
+            return await asyncio.gather(team_of(1), team_of(2))
+
+        assert asyncio.run(run()) == [{"id": "a"}, {"id": "b"}]
+        assert engine.requests == [("Users", [1, 2]), ("Teams", ["a", "b"])]
+        assert loader.batches == 2
+
+    def test_errors_propagate_and_are_not_memoized(self, engine):
+        """Test a failed batch rejects its callers and can be retried"""
+        loader = DataLoader(engine)
+
+        async def run():
+            with pytest.raises(BshError):
+                await loader.load("Broken", 1)
+            with pytest.raises(BshError):
+                await loader.load("Broken", 1)
+
+        asyncio.run(run())
+
+        assert len(engine.requests) == 2
+
+    def test_clear_during_batch(self, engine):
+        """Test clearing while a batch is in flight resolves its callers and forces a refetch"""
+        fetched, release = threading.Event(), threading.Event()
+        engine.gate = (fetched, release)
+        loader = DataLoader(engine)
+
+        async def run():
+            first = loader.load("Users", 1)
+            await asyncio.get_event_loop().run_in_executor(None, fetched.wait, 1)
+            loader.clear()
+            engine.gate = None
+            engine.tables["Users"][1] = {"id": 1, "team": "new"}
+            second = loader.load("Users", 1)
+            release.set()
+            return await asyncio.wait_for(asyncio.gather(first, second), 1)
+
+        first, second = asyncio.run(run())
+
+        assert first == {"id": 1, "team": "a"}
+        assert second == {"id": 1, "team": "new"}
+        assert engine.requests == [("Users", [1]), ("Users", [1])]
+
+    def test_prime(self, engine):
+        """Test primed records are not fetched"""
+        loader = DataLoader(engine)
+
+        async def run():
+            loader.prime("Users", {"id": 1, "team": "z"})
+            return await loader.load("Users", 1)
+
+        assert asyncio.run(run()) == {"id": 1, "team": "z"}
+        assert engine.requests == []
+
+    def test_engine_loader(self):
+        """Test BshEngine creates loaders bound to itself"""
+        engine = BshEngine(host="http://localhost", client_fn=Mock())
+
+        loader = engine.loader(window=0.01)
+
+        assert loader.engine is engine
+        assert loader.window == 0.01
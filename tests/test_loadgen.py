@@ -0,0 +1,163 @@
+"""Tests for the load generator"""
+import json
+import random
+import pytest
+from bshengine import BshEngine
+from bshengine.loadgen import LoadGenerator, format_report, main, parse_mix
+from bshengine.observability import HdrHistogram
+from bshengine.testing import HttpTransport, StubServer
+
+
+@pytest.fixture
+def server():
+    """Start stub server with 20 rows"""
+    with StubServer(seed=3) as server:
+        server.seed("LoadTest", [{"name": f"row-{i}"} for i in range(20)])
+        yield server
+
+
+@pytest.fixture
+def engine(server):
+    """Create engine talking to the stub"""
+    return BshEngine(server.url, HttpTransport())
+
+
+class TestLoadGenerator:
+    """Test LoadGenerator class"""
+
+    def test_closed_loop(self, engine, server):
+        """Test a fixed number of calls is spread over the mix and recorded per api"""
+        generator = LoadGenerator(engine, "LoadTest", concurrency=4, requests=60, seed=1)
+
+        report = generator.run()
+
+        assert report.requests == 60
+        assert report.failed == 0
+        assert set(report.latencies) == {
+            "entities.LoadTest.search",
+            "entities.LoadTest.findById",
+            "entities.LoadTest.createMany",
+            "entities.LoadTest.export",
+        }
+        # One extra search warms up the ids used by find_by_id
+        assert server.requests == 61
+
+    def test_open_loop(self, engine):
+        """Test calls are started at the target rate"""
+        generator = LoadGenerator(engine, "LoadTest", mix={"search": 1}, rps=100, requests=20)
+
+        report = generator.run()
+
+        assert report.requests == 20
+        assert 0.18 <= report.elapsed < 1.0
+
+    def test_open_loop_drops_finished_calls(self, engine):
+        """Test the open loop only keeps calls that are still in flight"""
+        generator = LoadGenerator(engine, "LoadTest", mix={"search": 1}, rps=200, requests=40)
+        in_flight = []
+        measure = generator._measure
+
+        async def recording(*args):
+            in_flight.append(len(generator._pending))
+            await measure(*args)
+
+        generator._measure = recording
+        generator.run()
+
+        assert max(in_flight) < 10
+        assert not generator._pending
+
+    def test_error_breakdown(self, engine, server):
+        """Test failures are counted per api by status"""
+        server.error_rate = 1.0
+        generator = LoadGenerator(engine, "LoadTest", mix={"search": 1, "create_many": 1}, requests=10, seed=1)
+
+        report = generator.run()
+
+        assert report.error_rate == 1.0
+        assert sum(c["503"] for c in report.errors.values()) == 10
+        assert "503: " in format_report(report)
+
+    def test_find_by_id_needs_rows(self, engine):
+        """Test find_by_id on an empty entity fails before the run"""
+        generator = LoadGenerator(engine, "Empty", mix={"find_by_id": 1}, requests=1)
+
+        with pytest.raises(ValueError, match="find_by_id"):
+            generator.run()
+
+
+class TestParseMix:
+    """Test parse_mix function"""
+
+    def test_weights(self):
+        """Test weights are parsed and default to 1"""
+        assert parse_mix("search=70, export") == {"search": 70.0, "export": 1.0}
+
+    @pytest.mark.parametrize("text", ["update=1", "search=-1", "search=0"])
+    def test_invalid(self, text):
+        """Test unknown operations and unusable weights are rejected"""
+        with pytest.raises(ValueError):
+            parse_mix(text)
+
+
+class TestHdrHistogram:
+    """Test HdrHistogram class"""
+
+    def test_percentiles(self):
+        """Test percentiles stay within the configured relative error"""
+        rng = random.Random(5)
+        values = sorted(rng.expovariate(50) for _ in range(20000))
+        histogram = HdrHistogram(significant_digits=2)
+        for value in values:
+            histogram.record(value)
+
+        for p in (50, 90, 99, 99.9):
+            exact = values[int(p / 100 * len(values)) - 1]
+            assert abs(histogram.percentile(p) - exact) <= exact * 0.01 + 1e-6
+        assert histogram.percentile(100) == values[-1]
+
+    def test_merge(self):
+        """Test merged histograms combine counts and extremes"""
+        a, b = HdrHistogram(), HdrHistogram()
+        a.record(0.001)
+        b.record(0.5)
+
+        a.merge(b)
+
+        assert a.count == 2 and a.min == 0.001 and a.max == 0.5
+        with pytest.raises(ValueError):
+            a.merge(HdrHistogram(significant_digits=3))
+
+
+class TestCli:
+    """Test the command line entry point"""
+
+    def test_stub_smoke(self, capsys, tmp_path):
+        """Test a smoke run against the stub prints and saves the JSON summary"""
+        output = tmp_path / "load.json"
+
+        code = main(["--stub", "--requests", "30", "--json", "--output", str(output), "--max-error-rate", "0"])
+
+        assert code == 0
+        assert json.loads(capsys.readouterr().out)["requests"] == 30
+        assert json.loads(output.read_text())["failed"] == 0
+
+    def test_error_rate_gate(self, capsys):
+        """Test the exit status is 1 when the error rate is above the limit"""
+        code = main(
+            ["--stub", "--stub-error-rate", "1", "--mix", "search", "--requests", "5", "--max-error-rate", "0.5"]
+        )
+
+        assert code == 1
+
+    def test_find_by_id_without_rows(self, capsys):
+        """Test an unusable mix is reported without a traceback"""
+        code = main(["--stub", "--stub-rows", "0", "--mix", "find_by_id", "--requests", "1"])
+
+        assert code == 2
+        assert "find_by_id needs existing rows" in capsys.readouterr().err
+
+    def test_host_required(self):
+        """Test a target is required"""
+        with pytest.raises(SystemExit):
+            main(["--requests", "1"])
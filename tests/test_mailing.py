@@ -0,0 +1,158 @@
+"""Tests for MailingService and mass sends"""
+import json
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshError, BshResponse
+from bshengine.checkpoint import Checkpoint, CompletionLog, FileCheckpoint
+from bshengine.services import MailingService
+
+
+def _ok():
+    return BshResponse(data=[], code=200, status="OK", timestamp=0)
+
+
+@pytest.fixture
+def mock_client():
+    """Create mock client recording sent payloads"""
+    client = Mock(spec=BshClient)
+    client.sent = []
+
+    def post(params):
+        body = params.options["body"]
+        if body.get("to") == "bounce@x.io":
+            raise BshError(400, params.path)
+        client.sent.append((body["to"], params.options["headers"].get("Idempotency-Key")))
+        return _ok()
+
+    client.post = Mock(side_effect=post)
+    return client
+
+
+def _recipients(n):
+    return (f"user{i}@x.io" for i in range(n))
+
+
+def _render(address):
+    return {"to": address, "subject": "Hello", "body": f"Hi {address}"}
+
+
+class TestCompletionLog:
+    """Test CompletionLog class"""
+
+    def test_out_of_order(self):
+        """Test completed indexes collapse into a watermark"""
+        log = CompletionLog()
+        for index in (2, 0, 4, 1):
+            log.mark(index)
+
+        assert log.state() == {"done_below": 3, "done": [4]}
+        assert 4 in log and 3 not in log
+        assert 1 in CompletionLog.from_state(log.state())
+
+    def test_pinned_watermark_stays_compact(self):
+        """Test indexes done after a failing item are kept as runs"""
+        log = CompletionLog()
+        for index in range(1, 10000):
+            if index != 500:
+                log.mark(index)
+
+        assert log.state() == {"done_below": 0, "done": [[1, 500], [501, 10000]]}
+        assert len(log) == 9998
+        assert 499 in log and 500 not in log and 0 not in log
+        restored = CompletionLog.from_state(log.state())
+        restored.mark(0)
+        restored.mark(500)
+        assert restored.state() == {"done_below": 10000, "done": []}
+
+
+class TestCheckpoint:
+    """Test Checkpoint base class"""
+
+    def test_incomplete_checkpoint(self):
+        """Test a checkpoint missing a method cannot be created"""
+        class NoClear(Checkpoint):
+            def load(self):
+                return None
+
+            def save(self, state):
+                pass
+
+        with pytest.raises(TypeError):
+            NoClear()
+
+
+class TestSendMany:
+    """Test MailingService.send_many"""
+
+    def test_send_with_idempotency_key(self, mock_client):
+        """Test send passes the idempotency key header"""
+        MailingService(mock_client).send({"to": "a@x.io"}, idempotency_key="k1")
+
+        assert mock_client.sent == [("a@x.io", "k1")]
+
+    def test_sends_all(self, mock_client):
+        """Test every recipient is rendered and sent once with a stable key"""
+        report = MailingService(mock_client).send_many(_recipients(20), render=_render, campaign="spring")
+
+        assert report.sent == 20
+        assert sorted(to for to, _ in mock_client.sent) == sorted(_recipients(20))
+        keys = {key for _, key in mock_client.sent}
+        assert len(keys) == 20
+        assert all(key.startswith("spring:") for key in keys)
+        assert report.latency(0.95) >= report.latency(0.5)
+
+    def test_failures_reported(self, mock_client):
+        """Test failed sends are collected"""
+        recipients = ["a@x.io", "bounce@x.io", "b@x.io"]
+
+        report = MailingService(mock_client).send_many(recipients, render=_render)
+
+        assert report.sent == 2
+        assert report.failed[0].item == (1, "bounce@x.io")
+
+    def test_resume_from_checkpoint(self, mock_client, tmp_path):
+        """Test a resumed run skips sent messages and retries failed ones"""
+        path = str(tmp_path / "spring.json")
+        recipients = ["a@x.io", "bounce@x.io", "b@x.io"]
+        service = MailingService(mock_client)
+        service.send_many(recipients, render=_render, campaign="spring", checkpoint=path)
+        assert json.load(open(path)) == {"campaign": "spring", "done_below": 1, "done": [2]}
+
+        rendered = []
+        report = service.send_many(
+            recipients, render=lambda r: rendered.append(r) or _render(r), campaign="spring", checkpoint=path
+        )
+
+        assert report.skipped == 2
+        assert rendered == ["bounce@x.io"]
+
+    def test_crash_resumes_without_resending(self, mock_client, tmp_path):
+        """Test a crash mid-run only re-sends messages after the last checkpoint"""
+        path = str(tmp_path / "c.json")
+        calls = {"n": 0}
+
+        def flaky_render(address):
+            calls["n"] += 1
+            if calls["n"] == 8:
+                raise KeyboardInterrupt
+            return _render(address)
+
+        service = MailingService(mock_client)
+        with pytest.raises(KeyboardInterrupt):
+            service.send_many(
+                list(_recipients(10)), render=flaky_render, concurrency=1, checkpoint=path, checkpoint_every=2
+            )
+        sent_before = len(mock_client.sent)
+        report = service.send_many(list(_recipients(10)), render=_render, checkpoint=path)
+
+        assert sent_before == 7
+        assert report.skipped == 7
+        assert len(mock_client.sent) == 10
+
+    def test_campaign_mismatch(self, mock_client, tmp_path):
+        """Test a checkpoint cannot be reused by another campaign"""
+        checkpoint = FileCheckpoint(str(tmp_path / "c.json"))
+        checkpoint.save({"campaign": "a", "done_below": 0, "done": []})
+
+        with pytest.raises(ValueError):
+            MailingService(mock_client).send_many([], campaign="b", checkpoint=checkpoint)
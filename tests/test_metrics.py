@@ -0,0 +1,144 @@
+"""Tests for request metrics"""
+import socket
+import pytest
+from unittest.mock import Mock
+from bshengine import BshEngine, BshError, BshExecutor, BshSearch
+from bshengine.observability import MetricsRegistry, StatsdExporter
+from bshengine.query import QueryCache
+
+
+def _response(status=200, content=b'{"data": []}'):
+    response = Mock()
+    response.status_code = status
+    response.ok = status < 400
+    response.json.return_value = {"data": [], "code": status, "status": "OK", "timestamp": 0}
+    response.content = content
+    return response
+
+
+@pytest.fixture
+def metrics():
+    """Create empty registry"""
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def engine(metrics):
+    """Create engine recording metrics"""
+    return BshEngine("https://api.test.com", lambda params: _response(), metrics=metrics)
+
+
+class TestRequestMetrics:
+    """Test metrics recorded by the client"""
+
+    def test_request_counted_and_timed(self, engine, metrics):
+        """Test each request records its status, phases, sizes and in-flight gauge"""
+        engine.entity("Orders").search(BshSearch())
+
+        api = "entities.Orders.search"
+        assert metrics.counter("bsh_requests_total", api=api, method="POST", status=200) == 1
+        for phase in ("auth", "serialize", "transport", "parse", "total"):
+            assert metrics.histogram("bsh_request_duration_seconds", api=api, phase=phase).count == 1
+        assert metrics.histogram("bsh_request_duration_seconds", api=api, phase="queue") is None
+        assert metrics.histogram("bsh_response_size_bytes", api=api).sum == 12
+        assert metrics.histogram("bsh_request_size_bytes", api=api) is None
+        assert metrics.gauge("bsh_requests_in_flight", api=api) == 0
+
+    def test_json_body_size(self, metrics):
+        """Test dict bodies are measured when asked to"""
+        metrics.measure_json_bodies = True
+        engine = BshEngine("https://api.test.com", lambda params: _response(), metrics=metrics)
+
+        engine.entity("Orders").create({"name": "x"})
+
+        assert metrics.histogram("bsh_request_size_bytes", api="entities.Orders.create").sum == len('{"name": "x"}')
+
+    def test_errors(self, metrics):
+        """Test HTTP and transport errors are counted by status"""
+        responses = iter([_response(503), OSError("reset")])
+
+        def client_fn(params):
+            outcome = next(responses)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        engine = BshEngine("https://api.test.com", client_fn, metrics=metrics)
+        with pytest.raises(BshError):
+            engine.entity("Orders").count()
+        with pytest.raises(OSError):
+            engine.entity("Orders").count()
+
+        api = "entities.Orders.count"
+        assert metrics.counter("bsh_requests_total", api=api, method="GET", status=503) == 1
+        assert metrics.counter("bsh_requests_total", api=api, method="GET", status="error") == 1
+        assert metrics.gauge("bsh_requests_in_flight", api=api) == 0
+
+    def test_queue_time(self, engine, metrics):
+        """Test calls run on an executor record their queue time once"""
+        engine.with_executor(BshExecutor(max_workers=2, concurrency=2))
+
+        def two_searches(name):
+            engine.entity(name).search(BshSearch())
+            engine.entity(name).search(BshSearch())
+
+        engine.map(two_searches, ["A", "B", "C"])
+
+        assert metrics.histogram("bsh_request_duration_seconds", api="entities.A.search", phase="queue").count == 1
+
+    def test_cache_hits(self, metrics):
+        """Test query cache lookups are counted"""
+        engine = BshEngine(
+            "https://api.test.com", lambda params: _response(), metrics=metrics, query_cache=QueryCache()
+        )
+        search = BshSearch(fields=["id"])
+
+        engine.entity("Orders").search(search)
+        engine.entity("Orders").search(search)
+
+        assert metrics.counter("bsh_cache_misses_total", api="entities.Orders.search") == 1
+        assert metrics.counter("bsh_cache_hits_total", api="entities.Orders.search") == 1
+
+    def test_retries(self, metrics):
+        """Test the on_retry hook counts retries by status"""
+        metrics.on_retry(BshError(429, "/x"), 1)
+        metrics.on_retry(OSError(), 1)
+
+        assert metrics.counter("bsh_retries_total", reason=429) == 1
+        assert metrics.counter("bsh_retries_total", reason="OSError") == 1
+
+
+class TestExporters:
+    """Test Prometheus and StatsD output"""
+
+    def test_prometheus_text(self, metrics):
+        """Test counters, gauges and cumulative histogram buckets are rendered"""
+        metrics.inc("bsh_requests_total", api='a"b', status=200)
+        metrics.add("bsh_requests_in_flight", 2, api="a")
+        metrics.observe("bsh_request_duration_seconds", 0.003, api="a", phase="total")
+        metrics.observe("bsh_request_duration_seconds", 0.2, api="a", phase="total")
+
+        text = metrics.to_prometheus()
+
+        assert '# TYPE bsh_requests_total counter\nbsh_requests_total{api="a\\"b",status="200"} 1\n' in text
+        assert 'bsh_requests_in_flight{api="a"} 2' in text
+        assert '# TYPE bsh_request_duration_seconds histogram' in text
+        assert 'bsh_request_duration_seconds_bucket{api="a",phase="total",le="0.005"} 1' in text
+        assert 'bsh_request_duration_seconds_bucket{api="a",phase="total",le="+Inf"} 2' in text
+        assert 'bsh_request_duration_seconds_count{api="a",phase="total"} 2' in text
+
+    def test_statsd_datagrams(self):
+        """Test values are sent to the StatsD port over UDP"""
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(2)
+        exporter = StatsdExporter(port=receiver.getsockname()[1])
+        metrics = MetricsRegistry(exporters=[exporter])
+
+        metrics.inc("bsh_requests_total", api="auth.login", status=200)
+        metrics.observe("bsh_request_duration_seconds", 0.25, api="auth.login", phase="total")
+
+        assert receiver.recv(512) == b"bsh.requests_total.auth.login.200:1|c"
+        assert receiver.recv(512) == b"bsh.request_duration_seconds.auth.login.total:250.0|ms"
+        exporter.close()
+        receiver.close()
@@ -0,0 +1,144 @@
+"""Tests for streaming multipart uploads"""
+import asyncio
+import io
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshResponse
+from bshengine.client import MultipartEncoder
+from bshengine.services import ImageService, UserService
+
+
+class TestMultipartEncoder:
+    """Test MultipartEncoder class"""
+
+    def test_encodes_fields_and_files(self):
+        """Test body layout for a field and a file"""
+        encoder = MultipartEncoder(
+            fields={"namespace": "products"},
+            files={"file": ("a.png", b"PNGDATA", "image/png")},
+            boundary="xyz",
+        )
+        body = b"".join(encoder)
+
+        assert body == (
+            b'--xyz\r\nContent-Disposition: form-data; name="namespace"\r\n\r\n'
+            b"products\r\n"
+            b'--xyz\r\nContent-Disposition: form-data; name="file"; filename="a.png"\r\n'
+            b"Content-Type: image/png\r\n\r\n"
+            b"PNGDATA\r\n"
+            b"--xyz--\r\n"
+        )
+        assert encoder.len == len(body)
+        assert encoder.headers["Content-Length"] == str(len(body))
+        assert encoder.content_type == "multipart/form-data; boundary=xyz"
+
+    def test_reads_path_in_chunks(self, tmp_path):
+        """Test files are read in bounded chunks with progress"""
+        path = tmp_path / "big.bin"
+        path.write_bytes(b"x" * 10000)
+        progress = []
+        encoder = MultipartEncoder(
+            files={"file": str(path)},
+            chunk_size=1024,
+            on_progress=lambda sent, total: progress.append((sent, total)),
+        )
+
+        chunks = list(encoder)
+
+        assert max(len(c) for c in chunks) <= 1024
+        assert b'filename="big.bin"' in chunks[0]
+        assert progress[-1] == (encoder.len, encoder.len)
+
+    def test_memoryview_and_file_object(self):
+        """Test bytes-like and file object sources"""
+        encoder = MultipartEncoder(
+            files={"a": ("a", memoryview(b"abc")), "b": ("b", io.BytesIO(b"def"))},
+            boundary="b",
+        )
+        body = b"".join(encoder)
+        assert b"\r\n\r\nabc\r\n" in body
+        assert b"\r\n\r\ndef\r\n" in body
+        assert encoder.len == len(body)
+
+    def test_generator_has_unknown_length(self):
+        """Test iterables are streamed without a Content-Length"""
+        encoder = MultipartEncoder(files={"file": ("g", (b"ab" for _ in range(3)))})
+        assert encoder.len is None
+        assert "Content-Length" not in encoder.headers
+        assert b"ababab" in b"".join(encoder)
+
+    def test_read_interface(self):
+        """Test file-like read returns the same body"""
+        encoder = MultipartEncoder(files={"file": ("f", b"0123456789")}, boundary="q")
+        expected = b"".join(MultipartEncoder(files={"file": ("f", b"0123456789")}, boundary="q"))
+        parts = []
+        while True:
+            chunk = encoder.read(7)
+            if not chunk:
+                break
+            parts.append(chunk)
+        assert b"".join(parts) == expected
+
+    def test_async_iteration(self):
+        """Test async byte iterators are consumed with async for"""
+        async def source():
+            yield b"as"
+            yield b"ync"
+
+        async def collect(encoder):
+            return b"".join([chunk async for chunk in encoder])
+
+        encoder = MultipartEncoder(files={"file": ("f", source())})
+        with pytest.raises(TypeError):
+            list(MultipartEncoder(files={"file": ("f", source())}))
+        assert b"async" in asyncio.run(collect(encoder))
+
+    def test_invalid_chunk_size(self):
+        """Test chunk_size must be positive"""
+        with pytest.raises(ValueError):
+            MultipartEncoder(chunk_size=0)
+
+
+class TestUploads:
+    """Test upload services with streaming"""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock client"""
+        client = Mock(spec=BshClient)
+        client.post = Mock(return_value=BshResponse(data=[], code=200, status="OK", timestamp=0))
+        return client
+
+    def test_image_upload_form(self, mock_client, tmp_path):
+        """Test default upload keeps the form request format"""
+        path = tmp_path / "a.png"
+        path.write_bytes(b"img")
+
+        ImageService(mock_client).upload(str(path), namespace="ns")
+
+        params = mock_client.post.call_args[0][0]
+        assert params.options["request_format"] == "form"
+        assert params.options["body"]["files"]["file"][0] == "a.png"
+        assert params.options["body"]["data"] == {"namespace": "ns"}
+        assert params.api == "image.upload"
+
+    def test_image_upload_stream(self, mock_client):
+        """Test streamed upload sends a multipart encoder"""
+        ImageService(mock_client).upload(b"img", namespace="ns", filename="a.png", stream=True)
+
+        params = mock_client.post.call_args[0][0]
+        assert params.options["request_format"] == "raw"
+        encoder = params.options["body"]
+        assert isinstance(encoder, MultipartEncoder)
+        assert params.options["headers"]["Content-Type"] == encoder.content_type
+        body = b"".join(encoder)
+        assert b'filename="a.png"' in body
+        assert b'name="namespace"\r\n\r\nns' in body
+
+    def test_update_picture_generator_streams(self, mock_client):
+        """Test iterators are always streamed"""
+        UserService(mock_client).update_picture(iter([b"p"]), filename="me.jpg")
+
+        params = mock_client.post.call_args[0][0]
+        assert params.options["request_format"] == "raw"
+        assert params.api == "user.updatePicture"
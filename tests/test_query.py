@@ -0,0 +1,133 @@
+"""Tests for the query builder and filter normalization"""
+import pytest
+from bshengine import BshSearch, Filter, Pagination
+from bshengine.query import F, QueryBuilder, canonical_key, normalize_filters
+
+
+def _dicts(filters):
+    return BshSearch(filters=filters).to_dict().get("filters", [])
+
+
+class TestNormalizeFilters:
+    """Test normalize_filters function"""
+
+    def test_flattens_nested_ands(self):
+        """Test AND of AND is flattened into the top-level list"""
+        result = normalize_filters([
+            F.and_(F.eq("a", 1), F.and_(F.eq("b", 2), F.eq("c", 3))),
+        ])
+        assert [f["field"] for f in _dicts(result)] == ["a", "b", "c"]
+
+    def test_flattens_nested_ors(self):
+        """Test OR of OR becomes a single OR"""
+        result = normalize_filters([F.or_(F.like("a", "x%"), F.or_(F.like("b", "y%"), F.like("c", "z%")))])
+        assert len(result) == 1
+        assert result[0].operator == "or"
+        assert len(result[0].filters) == 3
+
+    def test_dedupes_predicates(self):
+        """Test duplicate predicates are removed"""
+        result = normalize_filters([F.eq("a", 1), F.eq("a", 1), F.and_(F.eq("a", 1))])
+        assert _dicts(result) == [{"operator": "eq", "field": "a", "value": 1}]
+
+    def test_single_value_in(self):
+        """Test in/nin with one value become eq/ne"""
+        result = normalize_filters([F.in_("a", [5, 5]), F.nin("b", ["x"])])
+        assert {(f.operator, f.field, f.value) for f in result} == {("eq", "a", 5), ("ne", "b", "x")}
+
+    def test_dedupes_in_values(self):
+        """Test in values are deduplicated and sorted"""
+        result = normalize_filters([F.in_("a", [3, 1, 3, 2])])
+        assert result[0].value == [1, 2, 3]
+
+    def test_merges_ranges_into_between(self):
+        """Test inclusive bounds on one field merge into between"""
+        result = normalize_filters([F.gte("age", 10), F.gte("age", 18), F.lte("age", 65), F.lte("age", 99)])
+        assert _dicts(result) == [{"operator": "between", "field": "age", "value": [18, 65]}]
+
+    def test_merges_strict_ranges(self):
+        """Test strict bounds stay separate but tightened"""
+        result = normalize_filters([F.gt("x", 1), F.gte("x", 1), F.lt("x", 9), F.between("x", 0, 5)])
+        assert {(f.operator, f.value) for f in result} == {("gt", 1), ("lte", 5)}
+
+    def test_or_of_equalities_becomes_in(self):
+        """Test eq alternatives on one field fold into in"""
+        result = normalize_filters([F.or_(F.eq("s", "b"), F.eq("s", "a"), F.in_("s", ["c", "a"]))])
+        assert _dicts(result) == [{"operator": "in", "field": "s", "value": ["a", "b", "c"]}]
+
+    def test_drops_tautologies(self):
+        """Test always-true filters disappear"""
+        result = normalize_filters([
+            F.eq("a", 1),
+            F.and_(),
+            F.nin("b", []),
+            F.or_(F.eq("c", 1), F.and_()),
+            F.or_(F.is_null("d"), F.not_null("d")),
+            F.between("e", None, None),
+        ])
+        assert _dicts(result) == [{"operator": "eq", "field": "a", "value": 1}]
+
+    def test_lowercases_operators(self):
+        """Test operators are canonicalized to lower case"""
+        result = normalize_filters([Filter(field="a", operator="EQ", value=1)])
+        assert result[0].operator == "eq"
+
+    def test_does_not_mutate_input(self):
+        """Test input filters are left untouched"""
+        original = F.in_("a", [2, 1, 2])
+        normalize_filters([original])
+        assert original.value == [2, 1, 2]
+
+
+class TestCanonicalKey:
+    """Test canonical_key function"""
+
+    def test_equivalent_searches_share_key(self):
+        """Test filter order and nesting do not change the key"""
+        first = BshSearch(filters=[F.eq("a", 1), F.and_(F.gte("b", 2), F.lte("b", 3))])
+        second = BshSearch(filters=[F.between("b", 2, 3), F.eq("a", 1), F.eq("a", 1)])
+        assert canonical_key(first, "E") == canonical_key(second, "E")
+
+    def test_different_pages_differ(self):
+        """Test pagination is part of the key"""
+        first = BshSearch(pagination=Pagination(page=1, size=10))
+        second = BshSearch(pagination=Pagination(page=2, size=10))
+        assert canonical_key(first) != canonical_key(second)
+
+
+class TestQueryBuilder:
+    """Test QueryBuilder class"""
+
+    def test_build(self):
+        """Test fluent building of a full search"""
+        search = (
+            QueryBuilder("Orders")
+            .select("id", "total")
+            .eq("status", "open")
+            .gte("total", 100)
+            .lte("total", 500)
+            .any(F.eq("channel", "web"), F.eq("channel", "app"))
+            .sort("createdAt", -1)
+            .page(1, 50)
+            .build()
+        )
+        data = search.to_dict()
+
+        assert data["entity"] == "Orders"
+        assert data["fields"] == ["id", "total"]
+        assert {"operator": "between", "field": "total", "value": [100, 500]} in data["filters"]
+        assert {"operator": "in", "field": "channel", "value": ["app", "web"]} in data["filters"]
+        assert data["sort"] == [{"field": "createdAt", "direction": -1}]
+        assert data["pagination"] == {"page": 1, "size": 50}
+
+    def test_build_without_normalization(self):
+        """Test raw trees can be kept"""
+        search = QueryBuilder().in_("a", [1]).build(normalize=False)
+        assert search.filters[0].operator == "in"
+
+    def test_group_by_and_aggregate(self):
+        """Test group by with aggregates"""
+        search = QueryBuilder("Sales").group_by("region").aggregate("sum", "amount", "total").build()
+        data = search.to_dict()["groupBy"]
+        assert data["fields"] == ["region"]
+        assert data["aggregate"] == [{"function": "SUM", "field": "amount", "alias": "total"}]
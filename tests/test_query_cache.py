@@ -0,0 +1,195 @@
+"""Tests for the semantic query cache"""
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshEngine, BshResponse, BshSearch, Pagination, Sort
+from bshengine.query import F, QueryCache
+from bshengine.services import EntityService
+
+ROWS = [
+    {"id": 1, "status": "open", "total": 50},
+    {"id": 2, "status": "closed", "total": 120},
+    {"id": 3, "status": "open", "total": 300},
+    {"id": 4, "status": "open", "total": 80},
+]
+
+
+def _response(rows, code=200, total=None):
+    pagination = {"total": total} if total is not None else None
+    return BshResponse(data=list(rows), timestamp=0, code=code, status="OK", pagination=pagination)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestQueryCache:
+    """Test QueryCache class"""
+
+    def test_exact_hit(self):
+        """Test an equivalent search is a hit"""
+        cache = QueryCache()
+        cache.put("Orders", BshSearch(filters=[F.eq("status", "open"), F.gt("total", 10)]), _response(ROWS[:1]))
+
+        result = cache.get("Orders", BshSearch(filters=[F.gt("total", 10), F.eq("status", "open")]))
+
+        assert result.data == ROWS[:1]
+        assert cache.hits == 1
+
+    def test_miss_other_entity(self):
+        """Test entries are scoped by entity"""
+        cache = QueryCache()
+        cache.put("Orders", BshSearch(), _response(ROWS))
+
+        assert cache.get("Invoices", BshSearch()) is None
+        assert cache.misses == 1
+
+    def test_subsumed_stricter_filter(self):
+        """Test a stricter search is answered from a complete result"""
+        cache = QueryCache()
+        open_rows = [ROWS[0], ROWS[2], ROWS[3]]
+        cache.put("Orders", BshSearch(filters=[F.eq("status", "open")]), _response(open_rows, total=3))
+
+        result = cache.get("Orders", BshSearch(
+            filters=[F.eq("status", "open"), F.gte("total", 80)],
+            sort=[Sort(field="total", direction=-1)],
+        ))
+
+        assert [r["id"] for r in result.data] == [3, 4]
+        assert cache.subsumed == 1
+
+    def test_subsumed_page(self):
+        """Test a page is sliced from a complete result"""
+        cache = QueryCache()
+        cache.put("Orders", BshSearch(pagination=Pagination(page=1, size=10)), _response(ROWS))
+
+        result = cache.get("Orders", BshSearch(pagination=Pagination(page=2, size=3)))
+
+        assert [r["id"] for r in result.data] == [4]
+
+    def test_incomplete_page_not_subsumed(self):
+        """Test a full page is only used for exact hits"""
+        cache = QueryCache()
+        cache.put("Orders", BshSearch(pagination=Pagination(page=1, size=4)), _response(ROWS))
+
+        assert cache.get("Orders", BshSearch(filters=[F.eq("status", "open")])) is None
+
+    def test_unpaginated_needs_total(self):
+        """Test an unpaginated result is only complete when the response reports its total"""
+        cache = QueryCache()
+        cache.put("Orders", BshSearch(), _response(ROWS[:2]))
+        assert cache.get("Orders", BshSearch(filters=[F.eq("status", "open")])) is None
+
+        cache.put("Orders", BshSearch(), _response(ROWS[:2], total=4))
+        assert cache.get("Orders", BshSearch(filters=[F.eq("status", "open")])) is None
+
+        cache.put("Orders", BshSearch(), _response(ROWS, total=4))
+        assert [r["id"] for r in cache.get("Orders", BshSearch(filters=[F.eq("status", "open")])).data] == [1, 3, 4]
+
+    def test_projection_must_cover_fields(self):
+        """Test projected results only answer searches on their fields"""
+        cache = QueryCache()
+        cache.put(
+            "Orders",
+            BshSearch(fields=["id", "status"], pagination=Pagination(page=1, size=10)),
+            _response([{"id": 1, "status": "open"}]),
+        )
+
+        assert cache.get("Orders", BshSearch(fields=["id"], filters=[F.eq("status", "open")])) is not None
+        assert cache.get("Orders", BshSearch(filters=[F.eq("status", "open")])) is None
+        assert cache.get("Orders", BshSearch(fields=["id"], filters=[F.gt("total", 1)])) is None
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL"""
+        clock = FakeClock()
+        cache = QueryCache(ttl=10, ttl_by_entity={"Fast": 1}, clock=clock)
+        cache.put("Orders", BshSearch(), _response(ROWS))
+        cache.put("Fast", BshSearch(), _response(ROWS))
+
+        clock.now = 5
+        assert cache.get("Orders", BshSearch()) is not None
+        assert cache.get("Fast", BshSearch()) is None
+        clock.now = 11
+        assert cache.get("Orders", BshSearch()) is None
+
+    def test_errors_not_cached(self):
+        """Test failed responses are ignored"""
+        cache = QueryCache()
+        cache.put("Orders", BshSearch(), _response([], code=500))
+        cache.put("Orders", BshSearch(filters=[F.eq("id", 1)]), None)
+
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted"""
+        cache = QueryCache(max_entries=2, subsumption=False)
+        for i in range(3):
+            cache.put("Orders", BshSearch(filters=[F.eq("id", i)]), _response([]))
+
+        assert len(cache) == 2
+        assert cache.get("Orders", BshSearch(filters=[F.eq("id", 0)])) is None
+
+    def test_cached_data_is_copied(self):
+        """Test callers cannot mutate cached rows lists"""
+        cache = QueryCache()
+        cache.put("Orders", BshSearch(), _response(ROWS))
+        cache.get("Orders", BshSearch()).data.clear()
+
+        assert len(cache.get("Orders", BshSearch()).data) == 4
+
+
+class TestEntityServiceCache:
+    """Test EntityService with a query cache"""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock client"""
+        client = Mock(spec=BshClient)
+        client.post = Mock(return_value=_response(ROWS, total=len(ROWS)))
+        client.put = Mock(return_value=_response([]))
+        return client
+
+    @pytest.fixture
+    def service(self, mock_client):
+        """Create EntityService with a cache"""
+        return EntityService(mock_client, "Orders", cache=QueryCache())
+
+    def test_search_uses_cache(self, service, mock_client):
+        """Test repeated and stricter searches skip the client"""
+        service.search(BshSearch())
+        result = service.search(BshSearch(filters=[F.eq("status", "closed")]))
+
+        assert mock_client.post.call_count == 1
+        assert [r["id"] for r in result.data] == [2]
+
+    def test_search_on_success(self, service, mock_client):
+        """Test callback searches populate and read the cache"""
+        def post(params):
+            params.bsh_options["on_success"](_response(ROWS))
+        mock_client.post.side_effect = post
+        received = []
+
+        service.search(BshSearch(), on_success=received.append)
+        service.search(BshSearch(), on_success=received.append)
+
+        assert mock_client.post.call_count == 1
+        assert len(received) == 2
+
+    def test_write_invalidates(self, service, mock_client):
+        """Test writes drop cached results of the entity"""
+        service.search(BshSearch())
+        service.update({"id": 1, "status": "closed"})
+        service.search(BshSearch())
+
+        assert mock_client.post.call_count == 2
+
+    def test_engine_shares_cache(self):
+        """Test BshEngine passes its cache to entity services"""
+        cache = QueryCache()
+        engine = BshEngine(host="http://localhost", client_fn=Mock(), query_cache=cache)
+
+        assert engine.entities.cache is cache
+        assert engine.entity("Orders").cache is cache
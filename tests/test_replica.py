@@ -0,0 +1,177 @@
+"""Tests for entity replicas"""
+import logging
+import time
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshEngine, BshResponse, BshSearch
+from bshengine.query import F, QueryCache
+from bshengine.services import EntityService, EntityReplica, ReplicaManager
+
+
+class FakeServer:
+    """Serve searches from an in-memory table, honouring gte and pagination"""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.searches = []
+
+    def post(self, params):
+        search = params.options["body"]
+        self.searches.append(search)
+        rows = sorted(self.rows, key=lambda r: (r["updatedAt"], r["id"]))
+        for f in search.get("filters") or []:
+            rows = [r for r in rows if r[f["field"]] >= f["value"]]
+        page, size = search["pagination"]["page"], search["pagination"]["size"]
+        data = rows[(page - 1) * size:page * size]
+        return BshResponse(data=data, timestamp=0, code=200, status="OK")
+
+
+@pytest.fixture
+def server():
+    """Create fake server with three roles"""
+    return FakeServer([
+        {"id": 1, "name": "admin", "updatedAt": 10},
+        {"id": 2, "name": "user", "updatedAt": 20},
+        {"id": 3, "name": "guest", "updatedAt": 20},
+    ])
+
+
+@pytest.fixture
+def service(server):
+    """Create EntityService backed by the fake server"""
+    client = Mock(spec=BshClient)
+    client.post = Mock(side_effect=server.post)
+    return EntityService(client, "BshRoles")
+
+
+class TestEntityReplica:
+    """Test EntityReplica class"""
+
+    def test_load_pages(self, service, server):
+        """Test load fetches every page"""
+        replica = EntityReplica(service, page_size=2).load()
+
+        assert len(replica) == 3
+        assert len(server.searches) == 2
+        assert replica.watermark == 20
+        assert replica.get(2)["name"] == "user"
+
+    def test_find_with_index(self, service):
+        """Test indexed and unindexed lookups"""
+        replica = EntityReplica(service, indexes=["name"]).load()
+
+        assert replica.find_one("name", "guest")["id"] == 3
+        assert [r["id"] for r in replica.find("updatedAt", 20)] == [2, 3]
+        assert replica.find("name", "missing") == []
+
+    def test_incremental_refresh(self, service, server):
+        """Test refresh only fetches changed records and updates indexes"""
+        replica = EntityReplica(service, indexes=["name"]).load()
+        changes = []
+        replica.on_change(lambda entity, changed, removed: changes.append((entity, changed, removed)))
+        server.rows[0] = {"id": 1, "name": "root", "updatedAt": 30}
+
+        replica.refresh()
+
+        assert server.searches[-1]["filters"] == [{"operator": "gte", "field": "updatedAt", "value": 20}]
+        assert changes == [("BshRoles", [{"id": 1, "name": "root", "updatedAt": 30}], [])]
+        assert replica.find("name", "admin") == []
+        assert replica.find_one("name", "root")["id"] == 1
+        assert replica.watermark == 30
+
+    def test_refresh_without_changes(self, service):
+        """Test re-fetched records sharing the watermark do not notify"""
+        replica = EntityReplica(service).load()
+        listener = Mock()
+        replica.on_change(listener)
+
+        replica.refresh()
+
+        listener.assert_not_called()
+
+    def test_full_refresh_removes(self, service, server):
+        """Test a full refresh drops deleted records"""
+        replica = EntityReplica(service, indexes=["name"]).load()
+        listener = Mock()
+        replica.on_change(listener)
+        del server.rows[2]
+
+        replica.refresh(full=True)
+
+        assert 3 not in replica
+        assert replica.find("name", "guest") == []
+        listener.assert_called_once_with("BshRoles", [], [{"id": 3, "name": "guest", "updatedAt": 20}])
+
+    def test_search_uses_sorted_index(self, service):
+        """Test local searches run against the indexed records"""
+        replica = EntityReplica(service, sorted_indexes=["name"]).load()
+
+        assert replica.records.candidates([F.starts("name", "g")]) == [replica.get(3)]
+        assert [r["id"] for r in replica.search(BshSearch(filters=[F.starts("name", "g")]))] == [3]
+
+    def test_bypasses_query_cache(self, service, server):
+        """Test replicas never read from the query cache"""
+        cached = EntityService(service.client, "BshRoles", cache=QueryCache())
+        replica = EntityReplica(cached).load()
+        replica.refresh()
+
+        assert len(server.searches) == 2
+
+
+class TestReplicaManager:
+    """Test ReplicaManager class"""
+
+    def test_load_and_get(self, server):
+        """Test manager replicas are built from engine entity services"""
+        engine = BshEngine(host="http://localhost", client_fn=Mock())
+        engine.entity = lambda name: EntityService(Mock(post=Mock(side_effect=server.post)), name)
+
+        manager = ReplicaManager(engine, entities=["BshRoles"], keys={"BshRoles": "id"}).load()
+
+        assert manager.get("BshRoles", 1)["name"] == "admin"
+        assert len(manager["BshRoles"]) == 3
+
+    def test_refresh_reports_errors(self):
+        """Test polling errors go to on_error"""
+        engine = Mock()
+        engine.entity.return_value = Mock(spec=EntityService, cache=None, entity="BshRoles")
+        engine.entity.return_value.uncached.return_value = engine.entity.return_value
+        engine.entity.return_value.search.side_effect = RuntimeError("down")
+        errors = []
+
+        ReplicaManager(engine, entities=["BshRoles"], on_error=errors.append).refresh()
+
+        assert [str(e) for e in errors] == ["down"]
+
+    def test_failing_replica_does_not_block_others(self, server):
+        """Test every replica is refreshed before the first error is raised"""
+        engine = Mock()
+
+        def entity(name):
+            post = Mock(side_effect=RuntimeError("down") if name == "Broken" else server.post)
+            return EntityService(Mock(post=post), name)
+
+        engine.entity = entity
+        manager = ReplicaManager(engine, entities=["Broken", "BshRoles"])
+        server.rows.append({"id": 4, "name": "auditor", "updatedAt": 30})
+
+        with pytest.raises(RuntimeError):
+            manager.refresh()
+
+        assert manager.get("BshRoles", 4)["name"] == "auditor"
+
+    def test_background_errors_are_logged(self, server, caplog):
+        """Test a failing background refresh is logged when no on_error is given"""
+        post = Mock(side_effect=server.post)
+        engine = Mock()
+        engine.entity = lambda name: EntityService(Mock(post=post), name)
+        manager = ReplicaManager(engine, entities=["BshRoles"], interval=0.01)
+
+        with caplog.at_level(logging.ERROR, logger="bshengine.services.replica"):
+            with manager:
+                post.side_effect = RuntimeError("down")
+                deadline = time.monotonic() + 1
+                while not caplog.records and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+        assert caplog.records[0].exc_info[0] is RuntimeError
@@ -2,7 +2,9 @@
 import pytest
 from unittest.mock import Mock, MagicMock
 from bshengine.services import EntityService
-from bshengine import BshClient, BshResponse, BshSearch, Filter, Pagination
+from bshengine.services.entities import chunk_ids
+from bshengine.query import QueryCache
+from bshengine import BshClient, BshError, BshResponse, BshSearch, Filter, Pagination, Sort
 
 
 class TestEntityService:
@@ -278,3 +280,220 @@ class TestEntityService:
         call_args = mock_client.download.call_args[0][0]
         assert "filename=custom-export.json" in call_args.path
 
+    def test_uncached(self, entity_service, mock_client):
+        """Test uncached drops the query cache but keeps client and entity"""
+        cached = EntityService(mock_client, "TestEntity", cache=QueryCache())
+
+        uncached = cached.uncached()
+
+        assert uncached.cache is None
+        assert (uncached.client, uncached.entity) == (mock_client, "TestEntity")
+        assert entity_service.uncached() is entity_service
+
+
+
+class TestFindByIds:
+    """Test EntityService.find_by_ids"""
+
+    @pytest.fixture
+    def mock_client(self):
+        """Create mock client answering in searches from a table"""
+        table = {i: {"id": i, "name": f"item-{i}"} for i in range(100) if i % 10}
+        client = Mock(spec=BshClient)
+
+        def post(params):
+            ids = params.options["body"]["filters"][0]["value"]
+            rows = [table[i] for i in reversed(ids) if i in table]
+            return BshResponse(data=rows, code=200, status="OK", timestamp=0)
+
+        client.post = Mock(side_effect=post)
+        return client
+
+    def test_single_chunk(self, mock_client):
+        """Test ids are fetched with one in search, in input order"""
+        service = EntityService(mock_client, "TestEntity")
+
+        result = service.find_by_ids([3, 1, 2, 10, 1])
+
+        assert mock_client.post.call_count == 1
+        body = mock_client.post.call_args[0][0].options["body"]
+        assert body["filters"] == [{"operator": "in", "field": "id", "value": [3, 1, 2, 10]}]
+        assert [r["id"] for r in result.data] == [3, 1, 2]
+        assert result.meta == {"missing": [10]}
+
+    def test_splits_chunks(self, mock_client):
+        """Test large id lists are split and reassembled"""
+        service = EntityService(mock_client, "TestEntity")
+        ids = list(range(99, -1, -1))
+
+        result = service.find_by_ids(ids, chunk_size=30)
+
+        assert mock_client.post.call_count == 4
+        assert [r["id"] for r in result.data] == [i for i in ids if i % 10]
+        assert result.meta["missing"] == [90, 80, 70, 60, 50, 40, 30, 20, 10, 0]
+
+    def test_chunk_ids_by_bytes(self):
+        """Test chunks respect the body size limit"""
+        chunks = list(chunk_ids(["a" * 10] * 5, max_count=100, max_bytes=30))
+
+        assert [len(c) for c in chunks] == [2, 2, 1]
+
+    def test_uses_cache(self, mock_client):
+        """Test cached records are not requested again"""
+        service = EntityService(mock_client, "TestEntity", cache=QueryCache())
+        service.find_by_ids([1, 2])
+
+        result = service.find_by_ids([2, 3, 1])
+
+        second = mock_client.post.call_args[0][0].options["body"]
+        assert second["filters"][0] == {"operator": "in", "field": "id", "value": [3]}
+        assert [r["id"] for r in result.data] == [2, 3, 1]
+
+
+class TestScanAndDeleteMany:
+    """Test EntityService.scan and delete_many"""
+
+    @pytest.fixture
+    def table(self):
+        """Create table of ten rows"""
+        return {i: {"id": i, "kind": "old" if i < 7 else "new"} for i in range(10)}
+
+    @pytest.fixture
+    def mock_client(self, table):
+        """Create mock client serving searches and in-deletes from the table"""
+        client = Mock(spec=BshClient)
+
+        def post(params):
+            body = params.options["body"]
+            if params.path.endswith("/search"):
+                rows = sorted(table.values(), key=lambda r: r["id"])
+                for f in body.get("filters", []):
+                    rows = [r for r in rows if r[f["field"]] == f["value"]]
+                page, size = body["pagination"]["page"], body["pagination"]["size"]
+                rows = rows[(page - 1) * size:page * size]
+                if "fields" in body:
+                    rows = [{k: r[k] for k in body["fields"]} for r in rows]
+                return BshResponse(data=rows, code=200, status="OK", timestamp=0)
+            ids = body["filters"][0]["value"]
+            if 8 in ids:
+                raise BshError(500, params.path)
+            for id in ids:
+                table.pop(id, None)
+            return BshResponse(data=[], code=200, status="OK", timestamp=0)
+
+        client.post = Mock(side_effect=post)
+        return client
+
+    def test_scan_pages(self, mock_client):
+        """Test scan reads every page with a stable sort"""
+        service = EntityService(mock_client, "TestEntity")
+
+        rows = list(service.scan(page_size=4))
+
+        assert [r["id"] for r in rows] == list(range(10))
+        assert mock_client.post.call_count == 3
+        assert mock_client.post.call_args[0][0].options["body"]["sort"] == [{"field": "id", "direction": 1}]
+
+    def test_delete_many_ids(self, mock_client, table):
+        """Test ids are deleted in chunks with progress and failures reported"""
+        service = EntityService(mock_client, "TestEntity")
+        progress = []
+
+        report = service.delete_many(
+            [0, 1, 2, 7, 8, 9], chunk_size=2, on_progress=lambda done, total: progress.append((done, total))
+        )
+
+        assert report.total == 6
+        assert report.deleted == 4
+        assert report.failed_ids == [8, 9]
+        assert isinstance(report.failed[0].error, BshError)
+        assert sorted(table) == [3, 4, 5, 6, 8, 9]
+        assert sorted(progress) == [(2, 6), (4, 6), (6, 6)]
+
+    def test_delete_many_search(self, mock_client, table):
+        """Test a search delete collects ids before deleting"""
+        service = EntityService(mock_client, "TestEntity")
+
+        report = service.delete_many(
+            BshSearch(filters=[Filter(field="kind", operator="eq", value="old")]), chunk_size=3
+        )
+
+        assert report.ok
+        assert report.deleted == 7
+        assert sorted(table) == [7, 8, 9]
+
+
+def _to_filter(data):
+    subs = [_to_filter(f) for f in data.get("filters", [])]
+    return Filter(operator=data.get("operator"), field=data.get("field"), value=data.get("value"), filters=subs or None)
+
+
+class TestKeysetScan:
+    """Test EntityService keyset scan mode"""
+
+    @pytest.fixture
+    def table(self):
+        """Create table of rows with duplicate sort values"""
+        return [{"id": i, "rank": i // 3} for i in range(11)]
+
+    @pytest.fixture
+    def mock_client(self, table):
+        """Create mock client evaluating searches against the table"""
+        from bshengine.query.evaluator import compile_filters, paginate, sort_rows
+        client = Mock(spec=BshClient)
+        client.bodies = []
+
+        def post(params):
+            body = params.options["body"]
+            client.bodies.append(body)
+            match = compile_filters([_to_filter(f) for f in body.get("filters", [])])
+            rows = sort_rows([r for r in table if match(r)], [Sort(**s) for s in body["sort"]])
+            rows = paginate(rows, Pagination(**body["pagination"]))
+            return BshResponse(data=rows, code=200, status="OK", timestamp=0)
+
+        client.post = Mock(side_effect=post)
+        return client
+
+    def test_seeks_instead_of_paging(self, mock_client):
+        """Test every page is the first page after the last key seen"""
+        rows = list(EntityService(mock_client, "TestEntity").scan(page_size=4, mode="keyset"))
+
+        assert [r["id"] for r in rows] == list(range(11))
+        assert [b["pagination"]["page"] for b in mock_client.bodies] == [1, 1, 1]
+        assert mock_client.bodies[1]["filters"] == [{"operator": "gt", "field": "id", "value": 3}]
+
+    def test_multi_field_sort(self, mock_client):
+        """Test ties on the sort field are broken by the key"""
+        search = BshSearch(sort=[Sort(field="rank", direction=-1)])
+        service = EntityService(mock_client, "TestEntity")
+
+        rows = list(service.scan(search, page_size=2, mode="keyset"))
+
+        assert [r["id"] for r in rows] == sorted(range(11), key=lambda i: (-(i // 3), i))
+        assert mock_client.bodies[0]["sort"] == [{"field": "rank", "direction": -1}, {"field": "id", "direction": 1}]
+
+    @pytest.mark.parametrize("fields", ["rank", " rank, id", ["rank"]])
+    def test_projection_keeps_sort_fields(self, mock_client, fields):
+        """Test the sort and key fields are added to a list or comma-separated projection"""
+        search = BshSearch(fields=fields, sort=[Sort(field="rank", direction=1)])
+
+        list(EntityService(mock_client, "TestEntity").scan(search, page_size=4, mode="keyset"))
+
+        assert mock_client.bodies[0]["fields"] == ["rank", "id"]
+
+    def test_resume_from_cursor(self, mock_client, table):
+        """Test a saved cursor resumes after the last row and survives inserts before it"""
+        service = EntityService(mock_client, "TestEntity")
+        pages = service.pages(page_size=4, mode="keyset")
+        _, cursor = next(pages)
+        table.insert(0, {"id": -1, "rank": -1})
+
+        rest = [r["id"] for rows, _ in service.pages(page_size=4, cursor=cursor, mode="keyset") for r in rows]
+
+        assert cursor == [3]
+        assert rest == list(range(4, 11))
+
+    def test_unknown_mode(self, mock_client):
+        """Test unknown modes are rejected"""
+        with pytest.raises(ValueError):
+            list(EntityService(mock_client, "TestEntity").scan(mode="offset"))
@@ -0,0 +1,120 @@
+"""Tests for the local stub server and transport"""
+import time
+import pytest
+from bshengine import BshEngine, BshError, BshSearch, Filter, Sort, Pagination
+from bshengine.testing import HttpTransport, StubServer, search_from_dict
+
+
+@pytest.fixture
+def server():
+    """Start stub server with five orders"""
+    with StubServer() as server:
+        server.seed("Orders", [{"name": f"o{i}", "status": "open" if i % 2 else "closed"} for i in range(5)])
+        yield server
+
+
+@pytest.fixture
+def engine(server):
+    """Create engine talking to the stub over HTTP"""
+    transport = HttpTransport()
+    yield BshEngine(server.url, transport)
+    transport.close()
+
+
+OPEN = BshSearch(filters=[Filter(field="status", operator="eq", value="open")])
+
+
+class TestStubServer:
+    """Test StubServer class"""
+
+    def test_entities(self, engine):
+        """Test create, read, search, count, update and delete round trips"""
+        orders = engine.entity("Orders")
+
+        created = orders.create({"name": "new", "status": "open"}).data[0]
+        orders.update({"id": created["id"], "status": "closed"})
+
+        assert orders.find_by_id(str(created["id"])).data[0]["status"] == "closed"
+        assert orders.count().data == [{"count": 6}]
+        assert orders.count_filtered(OPEN).data == [{"count": 2}]
+        page = orders.search(BshSearch(sort=[Sort("name", -1)], pagination=Pagination(1, 2), fields=["name"]))
+        assert page.data == [{"name": "o4"}, {"name": "o3"}]
+        orders.delete_by_id(str(created["id"]))
+        assert orders.count().data == [{"count": 5}]
+
+    def test_scan_keyset(self, engine):
+        """Test keyset scans read every row through the evaluator"""
+        rows = list(engine.entity("Orders").scan(BshSearch(), page_size=2, mode="keyset"))
+
+        assert [row["name"] for row in rows] == ["o0", "o1", "o2", "o3", "o4"]
+
+    def test_export(self, engine):
+        """Test exports download the matching rows as CSV"""
+        blobs = []
+
+        engine.entity("Orders").export(OPEN, on_download=blobs.append)
+
+        assert blobs[0].decode().splitlines() == ["id,name,status", "2,o1,open", "4,o3,open"]
+
+    def test_auth_and_users(self, engine):
+        """Test login returns tokens and users are served from BshUsers"""
+        tokens = engine.auth.login({"email": "a@b.c", "password": "x"}).data[0]
+
+        assert set(tokens) == {"access", "refresh"}
+        assert engine.user.me().data[0]["email"] == "user@stub.local"
+        assert engine.user.count().data == [{"count": 1}]
+
+    def test_unknown_routes(self, server, engine):
+        """Test other API endpoints succeed and non-API paths are not found"""
+        assert engine.settings.load().data == []
+
+        with pytest.raises(BshError) as error:
+            engine.entity("Orders").find_by_id("999")
+        assert error.value.status == 404
+        assert server.handle("GET", "/health", None)[0] == 404
+
+
+class TestInjection:
+    """Test latency, error and payload-size injection"""
+
+    def test_error_rate(self, server, engine):
+        """Test failures are injected as 503 responses"""
+        server.error_rate = 1.0
+
+        with pytest.raises(BshError) as error:
+            engine.entity("Orders").count()
+
+        assert error.value.status == 503
+        assert server.errors == 1
+
+    def test_latency(self, server, engine):
+        """Test each request waits for the configured latency"""
+        server.latency = 0.05
+        start = time.perf_counter()
+
+        engine.entity("Orders").count()
+
+        assert time.perf_counter() - start >= 0.05
+
+    def test_payload_size(self, server, engine):
+        """Test rows read back are padded to grow the payload"""
+        server.payload_size = 100
+
+        row = engine.entity("Orders").find_by_id("1").data[0]
+
+        assert row["padding"] == "x" * 100
+
+
+class TestSearchFromDict:
+    """Test search_from_dict function"""
+
+    def test_round_trip(self):
+        """Test to_dict output converts back to an equal search"""
+        search = BshSearch(
+            fields=["a"],
+            filters=[Filter(operator="or", filters=[Filter(field="a", operator="gt", value=1)])],
+            sort=[Sort("a", 1)],
+            pagination=Pagination(2, 10),
+        )
+
+        assert search_from_dict(search.to_dict()) == search
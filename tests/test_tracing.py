@@ -0,0 +1,145 @@
+"""Tests for tracing spans"""
+import sys
+import types
+from contextlib import contextmanager
+import pytest
+from unittest.mock import Mock
+from bshengine import BshEngine, BshError, BshSearch
+from bshengine.client import RetryPolicy
+from bshengine.observability import NOOP_TRACER, InMemoryTracer, OpenTelemetryTracer
+from bshengine.observability.tracing import NOOP_SPAN
+
+
+def _response(status=200):
+    response = Mock()
+    response.status_code = status
+    response.ok = status < 400
+    response.json.return_value = {"data": [], "code": status, "status": "OK", "timestamp": 0}
+    return response
+
+
+@pytest.fixture
+def sent():
+    """Collect params passed to the transport"""
+    return []
+
+
+@pytest.fixture
+def tracer():
+    """Create in-memory tracer"""
+    return InMemoryTracer()
+
+
+@pytest.fixture
+def engine(sent, tracer):
+    """Create engine tracing into memory"""
+    def client_fn(params):
+        sent.append(params)
+        return _response()
+    return BshEngine("https://api.test.com", client_fn, tracer=tracer)
+
+
+class TestTracing:
+    """Test spans recorded around SDK calls"""
+
+    def test_disabled_is_noop(self, sent):
+        """Test the default tracer reuses one span and sends no trace headers"""
+        engine = BshEngine("https://api.test.com", lambda params: sent.append(params) or _response())
+
+        engine.entity("Orders").search(BshSearch())
+
+        assert NOOP_TRACER.span("x") is NOOP_SPAN
+        assert "traceparent" not in sent[0].options["headers"]
+
+    def test_call_span_and_children(self, engine, tracer, sent):
+        """Test a call span named after the api with one child per pipeline step"""
+        engine.entity("Orders").search(BshSearch())
+
+        root = tracer.find("entities.Orders.search")[0]
+        children = [span.name for span in tracer.children(root)]
+        assert children == ["auth", "pre_interceptors", "transport", "decode"]
+        assert root.parent_id is None
+        assert root.attributes["http.status_code"] == 200
+        assert root.attributes["http.url"] == "https://api.test.com/api/entities/Orders/search"
+        transport = tracer.find("transport")[0]
+        assert sent[0].options["headers"]["traceparent"] == transport.traceparent
+        assert transport.trace_id == root.trace_id
+
+    def test_post_interceptors_span(self, engine, tracer):
+        """Test post-interceptors get a span when configured"""
+        engine.post_interceptor(lambda response, params: response)
+
+        engine.entity("Orders").count()
+
+        assert len(tracer.find("post_interceptors")) == 1
+
+    def test_error_recorded(self, tracer):
+        """Test a failed call records the error on its span"""
+        engine = BshEngine("https://api.test.com", lambda params: _response(503), tracer=tracer)
+
+        with pytest.raises(BshError):
+            engine.entity("Orders").count()
+
+        root = tracer.find("entities.Orders.count")[0]
+        assert isinstance(root.error, BshError)
+        assert root.attributes["http.status_code"] == 503
+
+    def test_nested_under_user_span(self, engine, tracer):
+        """Test calls made inside an outer span share its trace"""
+        with tracer.span("report") as outer:
+            engine.entity("Orders").count()
+            engine.entity("Invoices").count()
+
+        roots = tracer.children(outer)
+        assert [span.name for span in roots] == ["entities.Orders.count", "entities.Invoices.count"]
+        assert all(span.trace_id == outer.trace_id for span in roots)
+
+    def test_retry_spans(self, tracer):
+        """Test retries are recorded as spans through the RetryPolicy hook"""
+        responses = iter([_response(503), _response(200)])
+        engine = BshEngine("https://api.test.com", lambda params: next(responses), tracer=tracer)
+        policy = RetryPolicy(backoff=0, jitter=0, on_retry=tracer.on_retry)
+
+        with tracer.span("job"):
+            policy.call(engine.entity("Orders").count)
+
+        retry = tracer.find("retry")[0]
+        assert retry.attributes["retry.attempt"] == 1
+        assert isinstance(retry.error, BshError)
+        assert len(tracer.find("entities.Orders.count")) == 2
+
+
+class TestOpenTelemetryTracer:
+    """Test the OpenTelemetry adapter"""
+
+    def test_missing_package(self, monkeypatch):
+        """Test a clear error when opentelemetry is not installed"""
+        monkeypatch.setitem(sys.modules, "opentelemetry", None)
+
+        with pytest.raises(ImportError, match="bshengine-sdk\\[otel\\]"):
+            OpenTelemetryTracer()
+
+    def test_adapter(self, monkeypatch, sent):
+        """Test spans and header injection go through the OpenTelemetry API"""
+        started = []
+        otel_span = Mock()
+
+        @contextmanager
+        def start_as_current_span(name):
+            started.append(name)
+            yield otel_span
+
+        package = types.ModuleType("opentelemetry")
+        package.trace = types.SimpleNamespace(
+            get_tracer=lambda name: types.SimpleNamespace(start_as_current_span=start_as_current_span)
+        )
+        package.propagate = types.SimpleNamespace(inject=lambda headers: headers.update(traceparent="00-otel"))
+        monkeypatch.setitem(sys.modules, "opentelemetry", package)
+        engine = BshEngine("https://api.test.com", lambda params: sent.append(params) or _response())
+        engine.with_tracer(OpenTelemetryTracer())
+
+        engine.entity("Orders").count()
+
+        assert started == ["entities.Orders.count", "auth", "pre_interceptors", "transport", "decode"]
+        assert sent[0].options["headers"]["traceparent"] == "00-otel"
+        otel_span.set_attribute.assert_any_call("http.status_code", 200)
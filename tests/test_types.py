@@ -1,6 +1,8 @@
 """Tests for type definitions"""
 import pytest
-from bshengine import BshResponse, BshError, is_ok, BshSearch, Filter, Pagination, Sort, GroupBy, Aggregate
+import copy
+import json
+from bshengine import BshResponse, BshError, is_ok, BshSearch, Filter, Pagination, Sort, GroupBy, Aggregate, Param
 
 
 class TestBshResponse:
@@ -204,3 +206,86 @@ class TestBshSearch:
         assert "from" in result
         assert result["from"]["entity"] == "InnerEntity"
 
+
+
+class TestCompiledSearch:
+    """Test compiled search templates"""
+
+    @pytest.fixture
+    def search(self):
+        """Search with params at several depths"""
+        return BshSearch(
+            entity="Products",
+            filters=[
+                Filter(field="name", operator="eq", value=Param("name")),
+                Filter(
+                    operator="or",
+                    filters=[
+                        Filter(field="status", operator="in", value=Param("statuses")),
+                        Filter(field="owner", operator="eq", value=Param("name")),
+                        Filter(field="archived", operator="eq", value=False),
+                    ],
+                ),
+            ],
+            pagination=Pagination(page=Param("page"), size=20),
+        )
+
+    def test_bind_matches_to_dict(self, search):
+        """Test binding gives the same dict as serializing concrete values"""
+        compiled = search.compile()
+        bound = compiled.bind(name="x", statuses=["a", "b"], page=2)
+
+        search.filters[0].value = "x"
+        search.filters[1].filters[0].value = ["a", "b"]
+        search.filters[1].filters[1].value = "x"
+        search.pagination.page = 2
+        assert bound == search.to_dict()
+        assert compiled.params == ("name", "statuses", "page")
+
+    def test_bind_shares_static_parts(self, search):
+        """Test containers without params are shared, not copied"""
+        compiled = search.compile()
+        first = compiled.bind(name="a", statuses=[], page=1)
+        second = compiled.bind(name="b", statuses=[], page=2)
+
+        assert first["filters"][1]["filters"][2] is second["filters"][1]["filters"][2]
+        assert first["filters"][0]["value"] == "a"
+        assert compiled.template["filters"][0]["value"] == Param("name")
+
+    def test_bound_search_cannot_corrupt_template(self, search):
+        """Test bound searches can be changed at the top level but not through shared parts"""
+        compiled = search.compile()
+        first = compiled.bind(name="a", statuses=[], page=1)
+
+        first["pagination"] = {"page": 9, "size": 1}
+        with pytest.raises(TypeError):
+            first["filters"][1]["filters"][2]["value"] = True
+        copied = copy.deepcopy(first)
+        copied["filters"][1]["filters"][2]["value"] = True
+
+        second = compiled.bind(name="b", statuses=[], page=2)
+        assert second["pagination"] == {"page": 2, "size": 20}
+        assert second["filters"][1]["filters"][2]["value"] is False
+        assert json.loads(compiled.bind_json(name="b", statuses=[], page=2)) == second
+
+    def test_bind_json(self, search):
+        """Test JSON bytes match the bound dict"""
+        compiled = search.compile()
+        values = {"name": 'quote"d', "statuses": ["a"], "page": 3}
+        assert json.loads(compiled.bind_json(**values)) == compiled.bind(**values)
+
+    def test_missing_values(self, search):
+        """Test unbound params are reported"""
+        compiled = search.compile()
+        with pytest.raises(ValueError, match="statuses"):
+            compiled.bind(name="x", page=1)
+        with pytest.raises(ValueError, match="page"):
+            compiled.bind_json(name="x", statuses=[])
+
+    def test_without_params(self):
+        """Test searches without params compile to their dict"""
+        compiled = BshSearch(entity="E").compile()
+        assert compiled.bind() == {"entity": "E"}
+        compiled.bind()["entity"] = "F"
+        assert compiled.bind() == {"entity": "E"}
+        assert compiled.bind_json() == b'{"entity":"E"}'
@@ -0,0 +1,97 @@
+"""Tests for the user sync pipeline"""
+import pytest
+from unittest.mock import Mock
+from bshengine import BshClient, BshError, BshResponse, BshSearch, Filter
+from bshengine.services import UserService, UserSync
+
+
+def _ok(data=None):
+    return BshResponse(data=data or [], code=200, status="OK", timestamp=0)
+
+
+@pytest.fixture
+def users():
+    """Create UserService over a mock client holding three users"""
+    table = [
+        {"id": 1, "email": "a@x.io", "name": "A", "role": "admin"},
+        {"id": 2, "email": "b@x.io", "name": "B", "role": "user"},
+        {"id": 3, "email": "c@x.io", "name": "C", "role": "user"},
+    ]
+    client = Mock(spec=BshClient)
+
+    def post(params):
+        if params.path.endswith("/search"):
+            pagination = params.options["body"]["pagination"]
+            page, size = pagination["page"], pagination["size"]
+            return _ok(table[(page - 1) * size:page * size])
+        if params.options["body"]["email"] == "bad@x.io":
+            raise BshError(400, params.path)
+        return _ok()
+
+    client.post = Mock(side_effect=post)
+    client.put = Mock(return_value=_ok())
+    client.delete = Mock(return_value=_ok())
+    return UserService(client)
+
+
+DESIRED = [
+    {"email": "a@x.io", "name": "A", "role": "admin"},
+    {"email": "b@x.io", "name": "B", "role": "admin"},
+    {"email": "d@x.io", "name": "D", "role": "user"},
+]
+
+
+class TestUserSync:
+    """Test UserSync class"""
+
+    def test_applies_only_changes(self, users):
+        """Test users are created or updated only when they differ"""
+        report = UserSync(users, page_size=2).run(DESIRED)
+
+        assert report.created == ["d@x.io"]
+        assert report.updated == ["b@x.io"]
+        assert report.unchanged == 1
+        assert report.scanned == 3
+        update = users.client.put.call_args[0][0].options["body"]
+        assert update == {"id": 2, "email": "b@x.io", "name": "B", "role": "admin"}
+        assert users.client.post.call_args_list[-1][0][0].path == "/api/users/init"
+
+    def test_resync_is_one_scan(self, users):
+        """Test a sync without differences only scans"""
+        report = UserSync(users).run([{"email": "c@x.io", "role": "user"}])
+
+        assert report.writes == 0
+        assert users.client.post.call_count == 1
+        users.client.put.assert_not_called()
+
+    def test_delete_missing(self, users):
+        """Test users absent from the desired set are deleted when asked"""
+        report = UserSync(users, delete_missing=True).run(DESIRED)
+
+        assert report.deleted == ["c@x.io"]
+        assert users.client.delete.call_args[0][0].path == "/api/users/3"
+
+    def test_compared_fields(self, users):
+        """Test only the configured fields are compared"""
+        report = UserSync(users, fields=["name"]).run(DESIRED[:2])
+
+        assert report.updated == []
+        assert report.unchanged == 2
+
+    def test_failures_reported(self, users):
+        """Test failed writes are collected in the report"""
+        report = UserSync(users).run([{"email": "bad@x.io"}])
+
+        assert report.created == []
+        assert isinstance(report.failed[0].error, BshError)
+        assert report.summary()["failed"] == 1
+
+    def test_dry_run_and_scope(self, users):
+        """Test dry runs plan without writing and scope filters the scan"""
+        scope = BshSearch(filters=[Filter(field="role", operator="eq", value="user")])
+
+        report = UserSync(users, dry_run=True).run(DESIRED, scope=scope)
+
+        assert report.created == ["d@x.io"]
+        users.client.put.assert_not_called()
+        assert users.client.post.call_args[0][0].options["body"]["filters"][0]["field"] == "role"